@@ -0,0 +1,540 @@
+# Archivo: bench.py
+#
+# Benchmark de los solucionadores de Sudoku clásico (v1) y Sudoku Killer.
+#
+# Recorre un corpus de tableros agrupados por dificultad (carpeta `corpus/`) y mide, para cada
+# estrategia registrada en `STRATEGIES`, el tiempo de cada tablero. Hay estrategias que solo propagan
+# (por ejemplo "classic.resolver" o "killer.propagate") y otras que resuelven por completo
+# ("classic.backtracking", "classic.dlx", "killer.solver"); "classic.dlx_unique" y "killer.count" cuentan
+# soluciones hasta 2 para comprobar la unicidad. Por cada estrategia y dificultad se informa:
+#   - tableros por segundo, latencia p50/p99/media (en milisegundos) y tableros resueltos,
+#   - el pico de memoria de Python por tablero (con `tracemalloc`, en una pasada aparte para no
+#     alterar los tiempos).
+#
+# Solo se mide el trabajo del solucionador: la carga del tablero se hace antes de iniciar el reloj.
+# Los resultados se guardan como JSON para compararlos con una línea base (`baseline.json`); con
+# --baseline el programa termina con código 1 si alguna métrica empeora más que la tolerancia.
+# Cada informe mide también una carga fija de calibración (`calibrate`): los tiempos se comparan en
+# proporción a ella, de modo que una línea base tomada en otra máquina sigue sirviendo.
+#
+# Formatos del corpus:
+#   - classic.txt: una línea por tablero con 81 caracteres (orden A1, B1, ..., I9; '.' = vacío) y su dificultad.
+#   - killer.ndjson: un tablero JSON por línea con "id", "difficulty" y "cages" (formato de output.json).
+#
+# Uso:
+#   python bench.py                                   # Todas las estrategias, imprime la tabla
+#   python bench.py --suite killer --repeats 5 -o resultados.json
+#   python bench.py --baseline baseline.json          # Falla si hay regresiones
+#   python bench.py --save-baseline baseline.json     # Actualiza la línea base (solo las estrategias medidas)
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SUDOKU_DIR = os.path.dirname(BENCH_DIR)
+CORPUS_DIR = os.path.join(BENCH_DIR, "corpus")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# Los módulos del solucionador Killer se importan entre sí por nombre (ej. `from bitboard import ...`)
+sys.path.insert(0, os.path.join(SUDOKU_DIR, "killer"))
+from sudoku import KillerSudokuSolver  # noqa: E402
+
+
+def load_module(name, path):
+    """
+    Importa un módulo desde su ruta con un nombre propio.
+
+    Se usa para el `sudoku.py` de v1, que tiene el mismo nombre que el del solucionador Killer.
+
+    Args:
+        name (str): El nombre con el que se registra el módulo.
+        path (str): La ruta al archivo .py.
+
+    Returns:
+        module: El módulo importado.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+sys.path.append(os.path.join(SUDOKU_DIR, "v1"))  # Módulos auxiliares de v1 (ej. `dlx`)
+sudoku_v1 = load_module("sudoku_v1", os.path.join(SUDOKU_DIR, "v1", "sudoku.py"))
+
+
+def load_classic(path):
+    """
+    Lee un corpus de tableros clásicos.
+
+    Args:
+        path (str): La ruta al archivo (ver el formato de classic.txt).
+
+    Returns:
+        list: Tuplas (id, dificultad, tablero) con el tablero como cadena de 81 caracteres.
+    """
+    puzzles = []
+    with open(path, 'r') as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            board, difficulty = line.split()[:2]
+            puzzles.append((f"classic-{number}", difficulty, board))
+    return puzzles
+
+
+def load_killer(path):
+    """
+    Lee un corpus de tableros Killer en formato NDJSON.
+
+    Args:
+        path (str): La ruta al archivo (ver el formato de killer.ndjson).
+
+    Returns:
+        list: Tuplas (id, dificultad, datos) con los datos como {"cages": [...]}.
+    """
+    puzzles = []
+    with open(path, 'r') as f:
+        for number, line in enumerate(f, start=1):
+            if line.strip():
+                data = json.loads(line)
+                puzzles.append((data.get("id", f"killer-{number}"), data.get("difficulty", "unknown"), data))
+    return puzzles
+
+
+# Estrategias a medir. Cada una recibe un tablero del corpus, hace la preparación que no se mide
+# y devuelve una función sin argumentos que ejecuta el trabajo medido y devuelve si el tablero quedó resuelto.
+
+def classic_board(board, motor="backtracking"):
+    """Crea un `Sudoku` de v1 con el tablero cargado desde su cadena de 81 caracteres."""
+    tabla = sudoku_v1.Sudoku(motor)
+    tabla.establecerDesdeCadena(board)
+    return tabla
+
+
+def classic_solved(tabla):
+    """Indica si todas las celdas de un `Sudoku` de v1 tienen un único valor."""
+    return all(len(dominio) == 1 for dominio in tabla.tab_dom.values())
+
+
+def classic_resolver(board):
+    tabla = classic_board(board)
+
+    def run():
+        tabla.resolver()
+        return classic_solved(tabla)
+    return run
+
+
+def classic_backtracking(board):
+    tabla = classic_board(board)
+
+    def run():
+        tabla.resolver()
+        return tabla.backtracking()
+    return run
+
+
+def classic_dlx(board):
+    tabla = classic_board(board, "dlx")
+
+    def run():
+        return tabla.solucionar()
+    return run
+
+
+def classic_dlx_unique(board):
+    tabla = classic_board(board, "dlx")
+
+    def run():
+        return tabla.contarSoluciones(2) == 1  # "Resuelto" = solución única
+    return run
+
+
+_killer_solver = None  # Instancia reutilizada para todos los tableros Killer, como en batch.py
+
+
+def killer_solver(data):
+    """Carga el tablero en la instancia compartida de `KillerSudokuSolver` y la devuelve."""
+    global _killer_solver
+    if _killer_solver is None:
+        _killer_solver = KillerSudokuSolver()
+    _killer_solver.load_puzzle(data)
+    return _killer_solver
+
+
+def killer_apply_rules(data):
+    solver = killer_solver(data)
+
+    def run():
+        solver.outsiders()
+        while solver.apply_rules():
+            pass
+        return solver.board.is_solved()
+    return run
+
+
+def killer_propagate(data):
+    solver = killer_solver(data)
+
+    def run():
+        solver.outsiders()
+        return solver.propagate() and solver.board.is_solved()
+    return run
+
+
+def killer_full(data):
+    solver = killer_solver(data)
+
+    def run():
+        return solver.solver()
+    return run
+
+
+def killer_count(data):
+    solver = killer_solver(data)
+
+    def run():
+        return solver.count_solutions(2) > 0
+    return run
+
+
+# nombre -> (suite, preparación)
+STRATEGIES = {
+    "classic.resolver": ("classic", classic_resolver),
+    "classic.backtracking": ("classic", classic_backtracking),
+    "classic.dlx": ("classic", classic_dlx),
+    "classic.dlx_unique": ("classic", classic_dlx_unique),
+    "killer.apply_rules": ("killer", killer_apply_rules),
+    "killer.propagate": ("killer", killer_propagate),
+    "killer.solver": ("killer", killer_full),
+    "killer.count": ("killer", killer_count),
+}
+
+SUITES = {
+    "classic": lambda: load_classic(os.path.join(CORPUS_DIR, "classic.txt")),
+    "killer": lambda: load_killer(os.path.join(CORPUS_DIR, "killer.ndjson")),
+}
+
+
+def percentile(values, fraction):
+    """
+    Calcula un percentil por el método del rango más cercano.
+
+    Args:
+        values (list): Los valores ya ordenados.
+        fraction (float): El percentil como fracción (ej. 0.99).
+
+    Returns:
+        float: El valor del percentil (0.0 si la lista está vacía).
+    """
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[rank]
+
+
+def summarize(latencies, solved, peak_bytes):
+    """
+    Resume las mediciones de un grupo de tableros.
+
+    Args:
+        latencies (list): Los tiempos de cada ejecución, en segundos.
+        solved (int): La cantidad de ejecuciones que terminaron con el tablero resuelto.
+        peak_bytes (int): El mayor pico de memoria medido en el grupo.
+
+    Returns:
+        dict: Las métricas del grupo.
+    """
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "runs": len(latencies),
+        "solved": solved,
+        "puzzles_per_sec": round(len(latencies) / total, 3) if total else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+        "mean_ms": round(total / len(latencies) * 1000, 4) if latencies else 0.0,
+        "peak_kb": round(peak_bytes / 1024, 1),
+    }
+
+
+def bench_strategy(prepare, puzzles, repeats=3, memory=True):
+    """
+    Mide una estrategia sobre un corpus.
+
+    Antes de medir se hace una pasada sin tomar tiempos para llenar las tablas memorizadas (ej. las de
+    `cage_table`). Luego cada tablero se ejecuta `repeats` veces (preparándolo de nuevo cada vez) y se
+    toma el tiempo de cada ejecución por separado, con el recolector de basura desactivado (como hace
+    `timeit`). El pico de memoria se mide en una pasada adicional
+    con `tracemalloc`.
+
+    Args:
+        prepare (callable): La preparación de la estrategia (ver `STRATEGIES`).
+        puzzles (list): Tuplas (id, dificultad, tablero) del corpus.
+        repeats (int, optional): Ejecuciones por tablero. Defaults to 3.
+        memory (bool, optional): Si es True, mide el pico de memoria. Defaults to True.
+
+    Returns:
+        dict: Las métricas por dificultad y para el corpus completo ("all").
+    """
+    for _, _, puzzle in puzzles:  # Calentamiento
+        prepare(puzzle)()
+
+    groups = {}  # dificultad -> [latencias, resueltos, pico de memoria]
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _, difficulty, puzzle in puzzles:
+            group = groups.setdefault(difficulty, [[], 0, 0])
+            for _ in range(repeats):
+                run = prepare(puzzle)
+                start_time = time.perf_counter()
+                solved = run()
+                group[0].append(time.perf_counter() - start_time)
+                group[1] += bool(solved)
+            gc.collect(0)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    if memory:
+        tracemalloc.start()
+        try:
+            for _, difficulty, puzzle in puzzles:
+                run = prepare(puzzle)
+                tracemalloc.reset_peak()
+                baseline_bytes = tracemalloc.get_traced_memory()[0]
+                run()
+                peak = tracemalloc.get_traced_memory()[1] - baseline_bytes
+                groups[difficulty][2] = max(groups[difficulty][2], peak)
+        finally:
+            tracemalloc.stop()
+
+    results = {}
+    for difficulty in sorted(groups, key=lambda name: (DIFFICULTIES + (name,)).index(name)):
+        latencies, solved, peak = groups[difficulty]
+        results[difficulty] = summarize(latencies, solved, peak)
+    all_latencies = [latency for latencies, _, _ in groups.values() for latency in latencies]
+    results["all"] = summarize(all_latencies, sum(group[1] for group in groups.values()),
+                               max((group[2] for group in groups.values()), default=0))
+    return results
+
+
+def calibrate(rounds=10):
+    """
+    Mide una carga fija de Python puro (operaciones con enteros, listas y diccionarios, como las de
+    los solucionadores) que sirve de unidad para comparar tiempos medidos en máquinas distintas.
+
+    Args:
+        rounds (int, optional): Ejecuciones de la carga. Defaults to 10.
+
+    Returns:
+        float: El menor tiempo de las ejecuciones, en milisegundos.
+    """
+    def work():
+        counts = {}
+        masks = []
+        for i in range(20000):
+            mask = (i * 2654435761) & 0x1FF
+            counts[mask] = counts.get(mask, 0) + bin(mask).count("1")
+            masks.append(mask & ~(mask >> 1))
+        return len(counts) + sum(masks)
+
+    work()
+    best = float("inf")
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        work()
+        best = min(best, time.perf_counter() - start_time)
+    return round(best * 1000, 4)
+
+
+def run_benchmarks(strategies=None, suites=None, repeats=3, memory=True, log=False):
+    """
+    Ejecuta las estrategias indicadas sobre sus corpus.
+
+    Args:
+        strategies (list, optional): Los nombres de las estrategias. Por defecto, todas.
+        suites (list, optional): Las suites a incluir ("classic", "killer"). Por defecto, todas.
+        repeats (int, optional): Ejecuciones por tablero. Defaults to 3.
+        memory (bool, optional): Si es True, mide el pico de memoria. Defaults to True.
+        log (bool, optional): Si es True, imprime el progreso. Defaults to False.
+
+    Returns:
+        dict: El informe con "meta" (entorno, parámetros y "calibration_ms", ver `calibrate`) y "results"
+              (estrategia -> dificultad -> métricas).
+    """
+    corpora = {}
+    results = {}
+    calibration = calibrate()
+    for name in strategies or STRATEGIES:
+        suite, prepare = STRATEGIES[name]
+        if suites and suite not in suites:
+            continue
+        calibration = min(calibration, calibrate())  # Entre estrategias, para no depender de un único momento
+        if suite not in corpora:
+            corpora[suite] = SUITES[suite]()
+        if log:
+            print(f"Midiendo {name} ({len(corpora[suite])} tableros x {repeats})...", file=sys.stderr)
+        results[name] = bench_strategy(prepare, corpora[suite], repeats, memory)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "repeats": repeats,
+            "calibration_ms": calibration,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+# Métricas comparadas con la línea base: nombre -> True si un valor mayor es peor
+COMPARED_METRICS = {"p50_ms": True, "p99_ms": True, "puzzles_per_sec": False, "peak_kb": True}
+# Métricas que dependen de la velocidad de la máquina (se escalan con la calibración)
+TIMED_METRICS = {"p50_ms", "p99_ms", "puzzles_per_sec"}
+# Diferencia absoluta mínima para considerar una regresión (evita falsas alarmas en valores muy pequeños)
+MIN_DELTA = {"p50_ms": 0.5, "p99_ms": 1.0, "puzzles_per_sec": 0.0, "peak_kb": 64.0}
+
+
+def entry_meta(baseline, name):
+    """Devuelve la "meta" con la que se midió la estrategia `name` de una línea base o un informe."""
+    return baseline.get("strategy_meta", {}).get(name) or baseline.get("meta", {})
+
+
+def compare(report, baseline, tolerance=0.25):
+    """
+    Compara un informe con una línea base y devuelve las regresiones.
+
+    Solo se comparan las estrategias y dificultades presentes en ambos informes. Los tiempos de la
+    línea base se llevan primero a la escala de la máquina actual con la proporción entre las
+    calibraciones de ambos (ver `calibrate`; si falta alguna, se comparan tal cual). Una métrica es una
+    regresión si empeora más que `tolerance` (como fracción del valor de la línea base) y más que el
+    mínimo absoluto de `MIN_DELTA`. Un tablero
+    que la línea base resolvía y el informe no, también cuenta como regresión.
+
+    Args:
+        report (dict): El informe actual (ver `run_benchmarks`).
+        baseline (dict): El informe de la línea base.
+        tolerance (float, optional): El empeoramiento relativo permitido. Defaults to 0.25.
+
+    Returns:
+        list: Mensajes que describen cada regresión (vacía si no hay ninguna).
+    """
+    regressions = []
+    for name, groups in report["results"].items():
+        base_groups = baseline.get("results", {}).get(name)
+        if base_groups is None:
+            continue
+        base_calibration = entry_meta(baseline, name).get("calibration_ms")
+        calibration = report["meta"].get("calibration_ms")
+        scale = calibration / base_calibration if calibration and base_calibration else 1.0
+        for difficulty, metrics in groups.items():
+            base = base_groups.get(difficulty)
+            if base is None:
+                continue
+            if metrics["solved"] * base["runs"] < base["solved"] * metrics["runs"]:
+                regressions.append(f"{name}/{difficulty}: resueltos {metrics['solved']}/{metrics['runs']}, "
+                                   f"línea base {base['solved']}/{base['runs']}")
+            for metric, higher_is_worse in COMPARED_METRICS.items():
+                old, new = base.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+                if metric in TIMED_METRICS:
+                    old = round(old * scale if higher_is_worse else old / scale, 4)
+                delta = new - old if higher_is_worse else old - new
+                change = delta / old
+                if change > tolerance and delta > MIN_DELTA[metric]:
+                    regressions.append(f"{name}/{difficulty}: {metric} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def save_baseline(report, path):
+    """
+    Guarda un informe como línea base.
+
+    Si el archivo ya existe, solo se reemplazan las estrategias medidas en `report`; las demás
+    se conservan, de modo que se puede actualizar la línea base de una estrategia a la vez. Cada
+    estrategia guarda la "meta" de la medición que la produjo (en "strategy_meta"), así que las que se
+    conservan no quedan con los parámetros de la medición nueva.
+
+    Args:
+        report (dict): El informe (ver `run_benchmarks`).
+        path (str): La ruta del archivo JSON.
+    """
+    baseline = {"strategy_meta": {}, "results": {}}
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            previous = json.load(f)
+        for name, groups in previous.get("results", {}).items():
+            baseline["strategy_meta"][name] = entry_meta(previous, name)
+            baseline["results"][name] = groups
+    for name, groups in report["results"].items():
+        baseline["strategy_meta"][name] = report["meta"]
+        baseline["results"][name] = groups
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+
+
+def format_report(report):
+    """
+    Da formato de tabla a un informe.
+
+    Returns:
+        str: Una línea por estrategia y dificultad.
+    """
+    lines = [f"{'estrategia':<22} {'grupo':<7} {'resueltos':>9} {'tab/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'pico KB':>9}"]
+    for name, groups in report["results"].items():
+        for difficulty, m in groups.items():
+            lines.append(f"{name:<22} {difficulty:<7} {m['solved']:>4}/{m['runs']:<4} {m['puzzles_per_sec']:>10.1f} "
+                         f"{m['p50_ms']:>10.3f} {m['p99_ms']:>10.3f} {m['peak_kb']:>9.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los solucionadores de Sudoku clásico y Killer.")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="Suite a medir (se puede repetir). Por defecto, todas.")
+    parser.add_argument("--strategy", action="append", choices=sorted(STRATEGIES), help="Estrategia a medir (se puede repetir). Por defecto, todas.")
+    parser.add_argument("-r", "--repeats", type=int, default=3, help="Ejecuciones por tablero. Por defecto 3.")
+    parser.add_argument("--no-memory", action="store_true", help="No medir el pico de memoria.")
+    parser.add_argument("-o", "--output", help="Archivo JSON donde guardar el informe.")
+    parser.add_argument("--baseline", help="Informe JSON de la línea base con el que comparar.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Empeoramiento relativo permitido frente a la línea base. Por defecto 0.25.")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Guardar el informe como nueva línea base.")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.strategy, args.suite, args.repeats, not args.no_memory, log=True)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        save_baseline(report, args.save_baseline)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegresiones frente a {args.baseline}:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nSin regresiones frente a {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""
+Formato binario compacto para corpus de tableros (y soluciones) de Sudoku clásico y Killer.
+
+Un archivo tiene una cabecera de 16 bytes seguida de registros de tamaño fijo, de modo que el
+registro `i` empieza en `HEADER_SIZE + i * record_size` y se puede leer sin recorrer los anteriores:
+
+- Cabecera: `MAGIC` (4 bytes), versión (1), tipo (1: `CLASSIC` o `KILLER`), tamaño de registro
+  (2, little-endian), cantidad de registros (4, little-endian), casillas de suma (1) y 3 bytes de relleno.
+- Registro clásico (81 bytes): el dígito de cada celda (0 = vacía), en el mismo orden que la cadena
+  de 81 caracteres de la que sale (`Sudoku.establecerDesdeCadena` en v1, `solution_string` en Killer).
+  Sirve tanto para tableros como para soluciones.
+- Registro Killer (81 + `cage_slots` bytes): el número de jaula de cada celda en el orden de
+  `geometry.CELLS` (`NO_CAGE` si la celda no tiene jaula), seguido de la suma de cada jaula
+  (0 en las casillas que sobran). Las jaulas se numeran en el orden de la lista de entrada.
+  `cage_slots` es a lo sumo `MAX_CAGE_SLOTS` (64), así que un registro ocupa como mucho 145 bytes;
+  `write_puzzles` lo ajusta a la mayor cantidad de jaulas cuando recibe la lista completa (el corpus
+  de `benchmark` tiene hasta 49, registros de 130 bytes). Los tableros con más jaulas se rechazan.
+
+`PuzzleWriter` escribe los registros a medida que llegan y completa la cantidad en la cabecera al
+cerrar. `PuzzleFile` abre el archivo con `mmap` y devuelve cada registro como un `memoryview` sin
+copiar datos; `decode` lo convierte al formato habitual (cadena o {"cages": [...]}) solo cuando hace falta.
+"""
+
+import mmap
+import struct
+
+from geometry import CELLS, CELL_INDEX
+
+MAGIC = b"SDKB"
+VERSION = 1
+CLASSIC = 0
+KILLER = 1
+EXTENSION = ".sdkb"
+
+HEADER = struct.Struct("<4sBBHIB3x")
+HEADER_SIZE = HEADER.size
+NO_CAGE = 0xFF  # Número de jaula de las celdas sin jaula
+MAX_CAGE_SLOTS = 64  # Más jaulas dejarían al menos 47 de una sola celda: casi un clásico con pistas
+
+# Traducción entre los caracteres de una cadena de 81 caracteres y los bytes de un registro clásico
+_ENCODE_DIGITS = bytes(ord(char) - ord("0") if "1" <= char <= "9" else 0 for char in map(chr, range(256)))
+_DECODE_DIGITS = b"." + b"123456789" + b"." * 246
+
+
+def encode_classic(board):
+    """
+    Codifica un tablero clásico (o una solución) como registro de 81 bytes.
+
+    Args:
+        board (str): El tablero como cadena de 81 caracteres; lo que no es un dígito del 1 al 9 es una celda vacía.
+
+    Returns:
+        bytes: El registro.
+    """
+    board = board.strip()
+    if len(board) != len(CELLS):
+        raise ValueError(f"Se esperaban {len(CELLS)} caracteres y se recibieron {len(board)}")
+    return board.encode("ascii", "replace").translate(_ENCODE_DIGITS)
+
+
+def decode_classic(record):
+    """
+    Convierte un registro clásico en la cadena de 81 caracteres ('.' para las celdas vacías).
+
+    Args:
+        record (bytes | memoryview): El registro.
+
+    Returns:
+        str: El tablero.
+    """
+    return bytes(record).translate(_DECODE_DIGITS).decode("ascii")
+
+
+def encode_killer(cages, cage_slots=MAX_CAGE_SLOTS):
+    """
+    Codifica un tablero Killer como registro de 81 + `cage_slots` bytes.
+
+    Args:
+        cages (list): Las jaulas con el formato del archivo JSON ({"id", "cells", "sum"}).
+        cage_slots (int, optional): Casillas de suma del registro. Defaults to MAX_CAGE_SLOTS.
+
+    Returns:
+        bytes: El registro.
+    """
+    if len(cages) > cage_slots:
+        raise ValueError(f"El tablero tiene {len(cages)} jaulas y el registro admite {cage_slots}")
+    record = bytearray([NO_CAGE]) * len(CELLS) + bytearray(cage_slots)
+    for number, cage in enumerate(cages):
+        cage_sum = cage['sum']
+        if not 1 <= cage_sum <= 45:
+            raise ValueError(f"Suma de jaula fuera de rango: {cage_sum}")
+        record[len(CELLS) + number] = cage_sum
+        for cell in cage['cells']:
+            index = CELL_INDEX[cell]
+            if record[index] != NO_CAGE:
+                raise ValueError(f"La celda {cell} aparece en más de una jaula")
+            record[index] = number
+    return bytes(record)
+
+
+def killer_cages(record):
+    """
+    Devuelve las jaulas de un registro Killer con las celdas como índices enteros.
+
+    Args:
+        record (bytes | memoryview): El registro.
+
+    Returns:
+        list: Pares (celdas, suma), con las celdas como lista ordenada de índices (ver `geometry.CELLS`).
+    """
+    sums = record[len(CELLS):]
+    cells = [[] for _ in range(len(sums))]
+    for index, number in enumerate(record[:len(CELLS)]):
+        if number != NO_CAGE:
+            cells[number].append(index)
+    return [(cage_cells, sums[number]) for number, cage_cells in enumerate(cells) if cage_cells]
+
+
+def decode_killer(record):
+    """
+    Convierte un registro Killer en los datos de un tablero con el formato del archivo JSON.
+
+    Args:
+        record (bytes | memoryview): El registro.
+
+    Returns:
+        dict: El tablero como {"cages": [{"id", "cells", "sum"}, ...]}, con ids 0, 1, 2...
+    """
+    return {"cages": [{"id": number, "cells": [CELLS[index] for index in cells], "sum": cage_sum}
+                      for number, (cells, cage_sum) in enumerate(killer_cages(record))]}
+
+
+class PuzzleWriter:
+    """
+    Escribe un archivo de registros a medida que llegan los tableros.
+
+    Se usa como administrador de contexto; la cantidad de registros se escribe en la cabecera al cerrar.
+    """
+
+    def __init__(self, path, kind, cage_slots=MAX_CAGE_SLOTS):
+        """
+        Args:
+            path (str): La ruta del archivo a crear.
+            kind (int): `CLASSIC` o `KILLER`.
+            cage_slots (int, optional): Casillas de suma de cada registro Killer. Con la cantidad
+                                        máxima de jaulas del corpus el registro queda más chico.
+                                        Defaults to MAX_CAGE_SLOTS.
+        """
+        if kind not in (CLASSIC, KILLER):
+            raise ValueError(f"Tipo de archivo desconocido: {kind}")
+        if not 1 <= cage_slots <= MAX_CAGE_SLOTS:
+            raise ValueError(f"Casillas de suma fuera de rango: {cage_slots}")
+        self.kind = kind
+        self.cage_slots = cage_slots if kind == KILLER else 0
+        self.record_size = len(CELLS) + self.cage_slots
+        self.count = 0
+        self.file = open(path, 'wb')
+        self.file.write(self.header())
+
+    def header(self):
+        return HEADER.pack(MAGIC, VERSION, self.kind, self.record_size, self.count, self.cage_slots)
+
+    def write(self, puzzle):
+        """
+        Agrega un registro.
+
+        Args:
+            puzzle: Para `CLASSIC`, la cadena de 81 caracteres; para `KILLER`, el tablero ({"cages": [...]}).
+        """
+        if self.kind == CLASSIC:
+            record = encode_classic(puzzle)
+        else:
+            record = encode_killer(puzzle['cages'], self.cage_slots)
+        self.file.write(record)
+        self.count += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self.file.write(self.header())
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_puzzles(path, kind, puzzles, cage_slots=None):
+    """
+    Escribe una secuencia de tableros en un archivo de registros.
+
+    Args:
+        path (str): La ruta del archivo a crear.
+        kind (int): `CLASSIC` o `KILLER`.
+        puzzles (iterable): Los tableros (ver `PuzzleWriter.write`).
+        cage_slots (int, optional): Casillas de suma de los registros Killer. Si es None y `puzzles`
+                                    es una lista o tupla, se usa la mayor cantidad de jaulas (hasta MAX_CAGE_SLOTS);
+                                    si no, MAX_CAGE_SLOTS.
+
+    Returns:
+        int: La cantidad de registros escritos.
+    """
+    if cage_slots is None:
+        if kind == KILLER and isinstance(puzzles, (list, tuple)) and puzzles:
+            cage_slots = min(max(len(puzzle['cages']) for puzzle in puzzles), MAX_CAGE_SLOTS)  # Si hay más, `write` lo rechaza
+        else:
+            cage_slots = MAX_CAGE_SLOTS
+    with PuzzleWriter(path, kind, cage_slots) as writer:
+        for puzzle in puzzles:
+            writer.write(puzzle)
+    return writer.count
+
+
+class PuzzleFile:
+    """
+    Lectura por índice de un archivo de registros mapeado en memoria.
+
+    `file[i]` devuelve el registro `i` como `memoryview` de solo lectura sobre el `mmap`, sin copiar
+    datos; las vistas dejan de ser válidas al cerrar el archivo (hay que liberarlas antes). `decode(i)`
+    devuelve el tablero en el formato habitual. Los procesos de un lote pueden abrir el mismo archivo
+    y leer cada uno su parte con `shard`.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): La ruta del archivo.
+        """
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self.mmap) < HEADER_SIZE:
+                raise ValueError(f"{path}: archivo demasiado corto")
+            magic, version, self.kind, self.record_size, self.count, self.cage_slots = HEADER.unpack_from(self.mmap)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path}: no es un archivo {EXTENSION} de la versión {VERSION}")
+            if len(self.mmap) != HEADER_SIZE + self.count * self.record_size:
+                raise ValueError(f"{path}: el tamaño no coincide con la cabecera ({self.count} registros)")
+        except ValueError:
+            self.mmap.close()
+            raise
+        self.view = memoryview(self.mmap)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"Registro fuera de rango: {index}")
+        start = HEADER_SIZE + index * self.record_size
+        return self.view[start:start + self.record_size]
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def decode(self, index):
+        """
+        Devuelve el tablero `index` en el formato habitual.
+
+        Returns:
+            str | dict: La cadena de 81 caracteres (`CLASSIC`) o {"cages": [...]} (`KILLER`).
+        """
+        record = self[index]
+        return decode_classic(record) if self.kind == CLASSIC else decode_killer(record)
+
+    def shard(self, number, total):
+        """
+        Devuelve los índices de la parte `number` (0 a total - 1) de un reparto en `total` partes contiguas.
+
+        Returns:
+            range: Los índices de los registros de esa parte.
+        """
+        if not 0 <= number < total:
+            raise ValueError(f"Parte fuera de rango: {number} de {total}")
+        size, extra = divmod(self.count, total)
+        start = number * size + min(number, extra)
+        return range(start, start + size + (number < extra))
+
+    def close(self):
+        self.view.release()
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,146 @@
+"""
+Geometría de la cuadrícula de 9x9 compartida por el Sudoku clásico (v1) y el Sudoku Killer.
+
+Todas las tablas se calculan una sola vez al importar el módulo. Cada celda tiene un índice entero
+(0-80) y un nombre de letra y número (ej. "A1"); el índice de la celda con letra `l` (0-8) y número
+`n` (1-9) es `l * 9 + (n - 1)`, el mismo orden que usa `KillerSudokuSolver.cells`.
+
+Las 27 unidades (restricciones de "todos distintos") siguen el orden de `KillerSudokuSolver.restricciones`:
+- 0-8: las celdas con la misma letra (A..I),
+- 9-17: las celdas con el mismo número (1..9),
+- 18-26: los bloques 3x3, recorriendo primero los grupos de letras (ABC, DEF, GHI) y dentro de cada
+  uno los grupos de números (123, 456, 789).
+
+Para las jaulas del Killer, que dependen de cada tablero, `cage_index` construye el índice
+celda -> jaula en una sola pasada. El catálogo de regiones de la técnica "outsiders"
+(`adjacent_regions`) se calcula la primera vez que se pide y queda memorizado para todo el proceso.
+"""
+
+from functools import lru_cache
+from itertools import combinations
+
+LETTERS = "ABCDEFGHI"
+NUMBERS = "123456789"
+
+# Nombre de cada celda según su índice, e índice de cada celda según su nombre
+CELLS = tuple(f"{letter}{number}" for letter in LETTERS for number in NUMBERS)
+CELL_INDEX = {cell: index for index, cell in enumerate(CELLS)}
+
+# Unidades como tuplas ordenadas de índices de celda
+LETTER_UNITS = tuple(tuple(letter * 9 + number for number in range(9)) for letter in range(9))
+NUMBER_UNITS = tuple(tuple(letter * 9 + number for letter in range(9)) for number in range(9))
+BOX_UNITS = tuple(
+    tuple(sorted(letter * 9 + number
+                 for letter in range(box_letter * 3, box_letter * 3 + 3)
+                 for number in range(box_number * 3, box_number * 3 + 3)))
+    for box_letter in range(3) for box_number in range(3)
+)
+UNITS = LETTER_UNITS + NUMBER_UNITS + BOX_UNITS
+
+# Unidades de cada celda: (letra, número, bloque) como índices en UNITS
+CELL_UNITS = tuple(
+    (index // 9, 9 + index % 9, 18 + index // 27 * 3 + index % 9 // 3)
+    for index in range(len(CELLS))
+)
+# [letra, número] de cada celda, como índices en UNITS
+CELL_LINES = tuple(units[:2] for units in CELL_UNITS)
+
+# Vecinas de cada celda: las demás celdas de su letra y su número, las de su bloque y todas juntas
+LINE_PEERS = tuple(
+    tuple(sorted((set(UNITS[units[0]]) | set(UNITS[units[1]])) - {index}))
+    for index, units in enumerate(CELL_UNITS)
+)
+BOX_PEERS = tuple(tuple(cell for cell in UNITS[units[2]] if cell != index) for index, units in enumerate(CELL_UNITS))
+PEERS = tuple(tuple(sorted(set(LINE_PEERS[index]) | set(BOX_PEERS[index]))) for index in range(len(CELLS)))
+
+
+def _box_lines():
+    # Intersecciones entre bloques y letras/números: (intersección, resto del bloque, resto de la línea)
+    box_lines = []
+    unit_box_lines = [[] for _ in UNITS]
+    for box_index in range(18, 27):
+        box = set(UNITS[box_index])
+        for line_index in range(18):
+            line = set(UNITS[line_index])
+            intersection = box & line
+            if intersection:
+                box_line = (tuple(sorted(intersection)), tuple(sorted(box - line)), tuple(sorted(line - box)))
+                box_lines.append(box_line)
+                unit_box_lines[box_index].append(box_line)
+                unit_box_lines[line_index].append(box_line)
+    return tuple(box_lines), tuple(tuple(lines) for lines in unit_box_lines)
+
+
+# Todas las intersecciones bloque-línea, y las de cada unidad
+BOX_LINES, UNIT_BOX_LINES = _box_lines()
+
+
+def cage_index(cages, offset=0):
+    """
+    Construye el índice celda -> jaula de un tablero en una sola pasada.
+
+    Args:
+        cages (iterable): Las celdas de cada jaula, como índices enteros.
+        offset (int, optional): Número de la primera jaula (ej. 27 si las jaulas siguen a las
+                                27 unidades en una misma lista). Defaults to 0.
+
+    Returns:
+        list: El número de jaula de cada celda (None para las celdas sin jaula).
+    """
+    cell_cage = [None] * len(CELLS)
+    for number, cage in enumerate(cages, start=offset):
+        for cell in cage:
+            cell_cage[cell] = number
+    return cell_cage
+
+
+def blocks_adjacent(block1, block2):
+    """
+    Indica si dos bloques 3x3 (0-8, en el orden de BOX_UNITS) son vecinos, incluso en diagonal.
+
+    Args:
+        block1 (int): El primer bloque.
+        block2 (int): El segundo bloque.
+
+    Returns:
+        bool: True si los bloques son distintos y se tocan.
+    """
+    row_diff = abs(block1 // 3 - block2 // 3)
+    col_diff = abs(block1 % 3 - block2 % 3)
+    return row_diff <= 1 and col_diff <= 1 and row_diff + col_diff != 0
+
+
+@lru_cache(maxsize=None)
+def adjacent_regions():
+    """
+    Devuelve el catálogo de regiones de la técnica "outsiders", calculado una vez por proceso.
+
+    Una región es la unión de `n` unidades completas, por lo que sus celdas suman 45 * n:
+    - `n` letras consecutivas o `n` números consecutivos (n de 1 a 9),
+    - cada bloque 3x3 por separado,
+    - grupos de `n` bloques en los que cada bloque toca (incluso en diagonal) a otro del grupo.
+
+    Las regiones repetidas (ej. las letras A-C y los bloques 0, 1 y 2) se incluyen una sola vez.
+
+    Returns:
+        tuple: Tuplas (n, celdas, máscara, unidades) con las celdas como `frozenset` de índices, la
+               máscara como entero de 81 bits (bit `i` encendido si la celda `i` pertenece a la región)
+               y los índices en UNITS de las unidades que forman la región.
+    """
+    regions = []
+    for offset in (0, 9):  # Letras y números consecutivos
+        for size in range(1, 10):
+            for start in range(10 - size):
+                regions.append((size, tuple(range(offset + start, offset + start + size))))
+    for block in range(9):
+        regions.append((1, (18 + block,)))
+    for size in range(2, 10):
+        for blocks in combinations(range(9), size):
+            if all(any(blocks_adjacent(block, other) for other in blocks if other != block) for block in blocks):
+                regions.append((size, tuple(18 + block for block in blocks)))
+
+    catalogue = {}
+    for size, units in regions:
+        cells = frozenset(cell for unit in units for cell in UNITS[unit])
+        catalogue.setdefault(cells, (size, cells, sum(1 << cell for cell in cells), units))
+    return tuple(catalogue.values())
@@ -0,0 +1,291 @@
+# Archivo: batch.py
+#
+# Resolución por lotes de tableros de Sudoku Killer.
+#
+# Lee muchos tableros desde un archivo (o desde todos los archivos de una carpeta), los resuelve
+# uno por uno con una única instancia de `KillerSudokuSolver` y escribe una línea JSON por tablero
+# con el estado, la solución y el tiempo empleado. Las estructuras de la cuadrícula y las tablas de
+# combinaciones de jaulas se construyen una sola vez para todo el lote.
+#
+# Formatos de entrada admitidos:
+#   - .txt: el formato de `input.txt` (id:celdas:suma por línea); los tableros se separan con una línea vacía.
+#   - .json: un tablero con el formato de `output.json` ({"cages": [...]}).
+#   - .jsonl / .ndjson: un tablero JSON por línea, con un "id" opcional.
+#   - .sdkb: registros Killer del formato binario de `compact`, leídos con mmap.
+#
+# Con --workers N el lote se reparte en bloques de tableros entre N procesos (`solve_puzzles_parallel`);
+# cada proceso reutiliza su propia instancia del solver.
+#
+# Uso:
+#   python batch.py tableros.txt -o resultados.ndjson
+#   python batch.py carpeta_de_tableros/
+#   python batch.py tableros.ndjson --workers 32 --chunk-size 64 --unordered
+#   python batch.py tableros.ndjson --count 2     (comprueba que cada tablero tenga solución única)
+#   python batch.py tableros.ndjson --cache 10000 --cache-file soluciones.db
+#   python batch.py tableros.ndjson --time-limit 0.5 --node-limit 100000   (los rezagados quedan como "timeout")
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Módulos compartidos con v1 (`solution_cache`)
+
+from sudoku import KillerSudokuSolver
+from convert_to_json import iter_puzzles
+from verify_json import check_puzzle
+from solution_cache import SolutionCache, DEFAULT_SIZE
+
+
+def solve_puzzle(solver, puzzle_id, data, verify=True, count_limit=0, cache=None, limits=None):
+    """
+    Carga un tablero en `solver`, lo resuelve y arma el resultado.
+
+    Args:
+        solver (KillerSudokuSolver): La instancia reutilizada para todo el lote.
+        puzzle_id: El identificador del tablero.
+        data (dict): Los datos del tablero ({"cages": [...]}).
+        verify (bool, optional): Si es True, verifica la estructura antes de resolver. Defaults to True.
+        count_limit (int, optional): Si es mayor que 0, cuenta las soluciones hasta ese límite con
+                                     `count_solutions` en lugar de detenerse en la primera. Defaults to 0.
+        cache (SolutionCache, optional): Caché de soluciones por forma canónica; no se usa al contar
+                                         soluciones. Defaults to None.
+        limits (dict, optional): Límites de `KillerSudokuSolver.solver` y `count_solutions` ("time_limit",
+                                 "node_limit", "pass_limit"). Defaults to None.
+
+    Returns:
+        dict: El resultado con las claves "id", "status" ("solved", "unsolved", "timeout", "invalid" o
+              "error"), "solution" (81 caracteres en el orden A1, A2, ..., I9, o None), "nodes", "time" y,
+              si corresponde, "solutions" (con `count_limit`; al agotarse un límite, las encontradas hasta
+              entonces), "cached" (con `cache`), "partial" y "fixed" (el tablero con las celdas fijadas al
+              agotarse un límite) y "message".
+    """
+    start_time = time.perf_counter()
+    result = {"id": puzzle_id, "status": "error", "solution": None, "nodes": 0}
+    try:
+        if verify:
+            is_valid, message = check_puzzle(data['cages'])
+            if not is_valid:
+                result.update(status="invalid", message=message)
+                return result
+        if cache is not None and not count_limit:
+            misses = cache.stats["misses"]
+            try:
+                solution = cache.solve_killer(data['cages'], lambda cages: solve_cages(solver, cages, limits))
+            except TimeoutError:
+                solution = None
+            result["cached"] = cache.stats["misses"] == misses
+            result["status"] = "solved" if solution is not None else "unsolved"
+            result["solution"] = solution
+            if not result["cached"]:
+                result["nodes"] = solver.search_stats["nodes"]
+                if solver.timed_out:
+                    result.update(status="timeout", partial=solver.solution_string(), fixed=solver.search_stats["fixed"])
+            return result
+        solver.load_puzzle(data)
+        if count_limit:
+            result["solutions"] = solver.count_solutions(count_limit, **(limits or {}))
+            solved = result["solutions"] > 0
+        else:
+            solved = solver.solver(**(limits or {}))
+        result["status"] = "solved" if solved else "unsolved"
+        result["nodes"] = solver.search_stats["nodes"]
+        if solved:
+            result["solution"] = solver.solution_string()
+        if solver.timed_out:
+            result.update(status="timeout", partial=solver.solution_string(), fixed=solver.search_stats["fixed"])
+    except Exception as e:  # Un tablero con errores no detiene el lote
+        result["message"] = f"{type(e).__name__}: {e}"
+    finally:
+        result["time"] = round(time.perf_counter() - start_time, 6)
+    return result
+
+
+def solve_cages(solver, cages, limits=None):
+    """Resuelve las jaulas con `solver` y devuelve la solución (81 caracteres) o None."""
+    solver.load_puzzle(cages)
+    if solver.solver(**(limits or {})):
+        return solver.solution_string()
+    if solver.timed_out:
+        raise TimeoutError("se agotó el presupuesto de la búsqueda")  # No se guarda en la caché como "sin solución"
+    return None
+
+
+def solve_puzzles(puzzles, verify=True, solver=None, count_limit=0, cache=None, limits=None):
+    """
+    Resuelve una secuencia de tableros con una única instancia de `KillerSudokuSolver`.
+
+    Args:
+        puzzles (iterable): Pares (id_tablero, datos), por ejemplo los de `iter_puzzles`.
+        verify (bool, optional): Si es True, verifica la estructura de cada tablero. Defaults to True.
+        solver (KillerSudokuSolver, optional): La instancia a reutilizar. Si es None, se crea una.
+        count_limit (int, optional): Límite de soluciones a contar (0 = solo resolver). Defaults to 0.
+        cache (SolutionCache, optional): Caché de soluciones compartida por todo el lote. Defaults to None.
+        limits (dict, optional): Límites de la búsqueda de cada tablero (ver `solve_puzzle`). Defaults to None.
+
+    Yields:
+        dict: El resultado de cada tablero (ver `solve_puzzle`), en el orden de entrada.
+    """
+    if solver is None:
+        solver = KillerSudokuSolver()
+    for puzzle_id, data in puzzles:
+        yield solve_puzzle(solver, puzzle_id, data, verify, count_limit, cache, limits)
+
+
+def chunked(iterable, size):
+    """
+    Agrupa un iterable en listas de a lo sumo `size` elementos, sin consumirlo por completo.
+
+    Yields:
+        list: Cada bloque de elementos.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+_worker_solver = None  # Instancia del solver de cada proceso del pool
+
+
+def init_worker():
+    """Crea la instancia del solver que cada proceso del pool reutiliza para todos sus bloques."""
+    global _worker_solver
+    _worker_solver = KillerSudokuSolver()
+
+
+def solve_chunk(chunk, verify=True, count_limit=0, limits=None):
+    """
+    Resuelve un bloque de tableros dentro de un proceso del pool.
+
+    Args:
+        chunk (list): Pares (id_tablero, datos).
+        verify (bool, optional): Si es True, verifica la estructura de cada tablero. Defaults to True.
+        count_limit (int, optional): Límite de soluciones a contar (0 = solo resolver). Defaults to 0.
+        limits (dict, optional): Límites de la búsqueda de cada tablero (ver `solve_puzzle`). Defaults to None.
+
+    Returns:
+        list: Los resultados de los tableros del bloque, en el mismo orden.
+    """
+    return [solve_puzzle(_worker_solver, puzzle_id, data, verify, count_limit, limits=limits) for puzzle_id, data in chunk]
+
+
+def solve_puzzles_parallel(puzzles, workers=None, chunk_size=16, ordered=True, verify=True, count_limit=0, limits=None):
+    """
+    Resuelve una secuencia de tableros repartiéndola entre varios procesos.
+
+    Los tableros se envían en bloques de `chunk_size` para amortizar el costo de comunicación entre
+    procesos. Solo se mantienen en curso unos pocos bloques por proceso, así que la entrada se
+    consume a medida que se necesita. Un tablero que falla produce un resultado con estado "error"
+    (ver `solve_puzzle`); si un proceso del pool muere, los tableros de los bloques que estaban en
+    curso se informan también como "error" y el lote continúa con un pool nuevo.
+
+    Args:
+        puzzles (iterable): Pares (id_tablero, datos), por ejemplo los de `iter_puzzles`.
+        workers (int, optional): Cantidad de procesos. Por defecto, la cantidad de núcleos.
+        chunk_size (int, optional): Tableros por bloque. Defaults to 16.
+        ordered (bool, optional): Si es True, los resultados salen en el orden de entrada; si es False,
+                                  a medida que terminan. Defaults to True.
+        verify (bool, optional): Si es True, verifica la estructura de cada tablero. Defaults to True.
+        count_limit (int, optional): Límite de soluciones a contar (0 = solo resolver). Defaults to 0.
+        limits (dict, optional): Límites de la búsqueda de cada tablero (ver `solve_puzzle`). Defaults to None.
+
+    Yields:
+        dict: El resultado de cada tablero (ver `solve_puzzle`).
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = chunked(puzzles, chunk_size)
+    pending = deque()  # Pares (futuro, bloque) en orden de envío
+    max_pending = 2 * workers  # Bloques en curso como máximo
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+
+    def collect(future, chunk):
+        try:
+            return future.result()
+        except Exception as e:  # El proceso que resolvía el bloque murió
+            return [{"id": puzzle_id, "status": "error", "solution": None, "nodes": 0, "time": 0.0,
+                     "message": f"{type(e).__name__}: {e}"} for puzzle_id, _ in chunk]
+
+    try:
+        exhausted = False
+        while pending or not exhausted:
+            # Mantiene el pool ocupado sin leer toda la entrada
+            while not exhausted and len(pending) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                try:
+                    pending.append((executor.submit(solve_chunk, chunk, verify, count_limit, limits), chunk))
+                except RuntimeError:  # El pool quedó inutilizable: se reemplaza por uno nuevo
+                    executor.shutdown(cancel_futures=True)
+                    executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+                    pending.append((executor.submit(solve_chunk, chunk, verify, count_limit, limits), chunk))
+            if not pending:
+                break
+
+            if ordered:
+                future, chunk = pending.popleft()
+                yield from collect(future, chunk)
+            else:
+                done, _ = wait([future for future, _ in pending], return_when=FIRST_COMPLETED)
+                for item in [item for item in pending if item[0] in done]:
+                    pending.remove(item)
+                    yield from collect(*item)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve por lotes tableros de Sudoku Killer.")
+    parser.add_argument("path", help="Archivo (.txt, .json, .jsonl, .ndjson, .sdkb) o carpeta con tableros.")
+    parser.add_argument("-o", "--output", help="Archivo NDJSON de salida (por defecto, la salida estándar).")
+    parser.add_argument("--no-verify", action="store_true", help="No verificar la estructura de los tableros.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Cantidad de procesos (0 = todos los núcleos). Por defecto 1.")
+    parser.add_argument("--chunk-size", type=int, default=16, help="Tableros por bloque enviado a cada proceso. Por defecto 16.")
+    parser.add_argument("--count", type=int, default=0, metavar="LIMITE",
+                        help="Contar las soluciones de cada tablero hasta LIMITE (ej. 2 para comprobar que sea única).")
+    parser.add_argument("--time-limit", type=float, metavar="SEGUNDOS", help="Tiempo máximo por tablero; los que lo superan quedan con estado \"timeout\".")
+    parser.add_argument("--node-limit", type=int, help="Nodos de búsqueda máximos por tablero.")
+    parser.add_argument("--pass-limit", type=int, help="Restricciones que la propagación puede procesar por tablero.")
+    parser.add_argument("--cache", type=int, default=0, metavar="TAMAÑO",
+                        help="Reutilizar soluciones de tableros repetidos o equivalentes por simetría (TAMAÑO = soluciones en memoria; solo con un proceso).")
+    parser.add_argument("--cache-file", help="Archivo donde guardar también la caché de soluciones, para reutilizarla entre ejecuciones.")
+    parser.add_argument("--unordered", action="store_true", help="Escribir los resultados a medida que terminan, sin respetar el orden de entrada.")
+    args = parser.parse_args(argv)
+    if (args.cache or args.cache_file) and args.workers != 1:
+        parser.error("--cache y --cache-file solo se pueden usar con un proceso (--workers 1)")
+
+    puzzles = iter_puzzles(args.path)
+    limits = {"time_limit": args.time_limit, "node_limit": args.node_limit, "pass_limit": args.pass_limit}
+    cache = None
+    if args.cache or args.cache_file:
+        cache = SolutionCache(args.cache or DEFAULT_SIZE, args.cache_file)
+    if args.workers == 1:
+        results = solve_puzzles(puzzles, verify=not args.no_verify, count_limit=args.count, cache=cache, limits=limits)
+    else:
+        results = solve_puzzles_parallel(puzzles, workers=args.workers or None, chunk_size=args.chunk_size,
+                                         ordered=not args.unordered, verify=not args.no_verify, count_limit=args.count,
+                                         limits=limits)
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for result in results:
+            output.write(json.dumps(result) + "\n")  # Una línea JSON por tablero
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if cache is not None:
+            print(f"Caché: {cache.stats}", file=sys.stderr)
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
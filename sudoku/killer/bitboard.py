@@ -0,0 +1,376 @@
+"""
+Representación compacta del tablero de Sudoku Killer basada en máscaras de bits.
+
+Cada uno de los 81 dominios se guarda como un entero de 9 bits dentro de un `array`
+plano: el bit (d - 1) está encendido si el dígito d sigue siendo posible en la celda.
+Las operaciones de conjuntos (intersección, diferencia, tamaño, etc.) se reducen a
+operaciones con enteros y a consultas en tablas precalculadas.
+
+Además se incluyen vistas de compatibilidad (`VarsValuesView`, `CellView`, `DomainView`)
+que exponen el tablero con la forma clásica `{celda: [id_jaula, suma_jaula, dominio]}`,
+de modo que el código que usaba `vars_values` con conjuntos sigue funcionando.
+"""
+
+from array import array
+from collections.abc import Mapping, MutableSet
+
+FULL_MASK = 0x1FF  # Máscara con los nueve dígitos (1-9) posibles
+
+# BIT[d] es la máscara del dígito d (BIT[0] = 0 para simplificar los accesos)
+BIT = (0,) + tuple(1 << (digit - 1) for digit in range(1, 10))
+
+# Tablas precalculadas para las 512 máscaras posibles
+POPCOUNT = tuple(bin(mask).count("1") for mask in range(FULL_MASK + 1))  # Cantidad de dígitos en la máscara
+MASK_DIGITS = tuple(
+    tuple(digit for digit in range(1, 10) if mask & BIT[digit]) for mask in range(FULL_MASK + 1)
+)  # Dígitos presentes en la máscara, en orden ascendente
+LOWEST_DIGIT = tuple(digits[0] if digits else 0 for digits in MASK_DIGITS)  # Menor dígito de la máscara (0 si está vacía)
+
+
+def mask_from_digits(digits):
+    """
+    Convierte un iterable de dígitos (1-9) en su máscara de bits.
+
+    Args:
+        digits (iterable): Los dígitos a incluir en la máscara.
+
+    Returns:
+        int: La máscara de 9 bits correspondiente.
+    """
+    mask = 0
+    for digit in digits:
+        mask |= BIT[digit]
+    return mask
+
+
+def digits_from_mask(mask):
+    """
+    Convierte una máscara de bits en un conjunto de dígitos.
+
+    Args:
+        mask (int): La máscara de 9 bits.
+
+    Returns:
+        set: Los dígitos presentes en la máscara.
+    """
+    return set(MASK_DIGITS[mask])
+
+
+def is_single(mask):
+    """
+    Indica si una máscara contiene exactamente un dígito.
+
+    Args:
+        mask (int): La máscara de 9 bits.
+
+    Returns:
+        bool: True si la máscara tiene un único bit encendido.
+    """
+    return mask != 0 and not mask & (mask - 1)
+
+
+class BitBoard:
+    """
+    Motor de dominios del tablero: 81 máscaras de 9 bits en un `array` plano.
+
+    Todas las escrituras de dominios pasan por `set`, `remove` o `intersect`, que devuelven
+    si el dominio realmente cambió. Cada cambio se anota en un registro de deshacer (`trail`)
+    con el índice de la celda y su máscara anterior, y aumenta el contador `changes`:
+    - Para saber si una estrategia modificó algo basta comparar `changes` antes y después.
+    - Para volver atrás una rama de búsqueda basta con `undo(mark())`, sin copiar el tablero.
+
+    Además se acumulan los candidatos eliminados (`eliminated`) y las celdas que quedaron con un
+    único valor (`fixed`); las estadísticas por estrategia (ver `stats.StrategyStats`) se obtienen
+    comparando estos contadores antes y después de cada estrategia. `undo` no los descuenta.
+    """
+
+    __slots__ = ("domains", "trail", "changes", "eliminated", "fixed")
+
+    def __init__(self, size=81):
+        """
+        Inicializa el tablero con todos los dígitos posibles en cada celda.
+
+        Args:
+            size (int, optional): Cantidad de celdas del tablero (máximo 128). Defaults to 81.
+        """
+        self.domains = array("H", [FULL_MASK]) * size  # Un entero sin signo de 16 bits por celda
+        self.trail = array("H")  # Cambios registrados como (máscara_anterior << 7) | índice
+        self.changes = 0  # Contador de escrituras que modificaron algún dominio
+        self.eliminated = 0  # Candidatos eliminados en total
+        self.fixed = 0  # Veces que una celda quedó con un único valor
+
+    def reset(self):
+        """Vuelve a poner todos los dígitos en todas las celdas y vacía el registro de deshacer."""
+        self.domains[:] = array("H", [FULL_MASK]) * len(self.domains)
+        del self.trail[:]
+
+    def get(self, index):
+        """Devuelve la máscara del dominio de la celda `index`."""
+        return self.domains[index]
+
+    def set(self, index, mask):
+        """
+        Reemplaza el dominio de una celda.
+
+        Args:
+            index (int): El índice de la celda (0-80).
+            mask (int): La nueva máscara del dominio.
+
+        Returns:
+            bool: True si el dominio cambió, False en caso contrario.
+        """
+        old = self.domains[index]
+        if old == mask:
+            return False
+        self.trail.append(old << 7 | index)  # Anota el dominio anterior para poder deshacer
+        self.changes += 1
+        self.domains[index] = mask
+        self.eliminated += POPCOUNT[old] - POPCOUNT[mask]
+        if POPCOUNT[mask] == 1 and POPCOUNT[old] != 1:
+            self.fixed += 1
+        return True
+
+    def remove(self, index, mask):
+        """
+        Elimina del dominio de una celda los dígitos presentes en `mask`.
+
+        Returns:
+            bool: True si el dominio cambió, False en caso contrario.
+        """
+        old = self.domains[index]
+        if not old & mask:
+            return False
+        self.trail.append(old << 7 | index)
+        self.changes += 1
+        new = old & ~mask
+        self.domains[index] = new
+        self.eliminated += POPCOUNT[old] - POPCOUNT[new]
+        if POPCOUNT[new] == 1:
+            self.fixed += 1
+        return True
+
+    def intersect(self, index, mask):
+        """
+        Restringe el dominio de una celda a los dígitos presentes en `mask`.
+
+        Returns:
+            bool: True si el dominio cambió, False en caso contrario.
+        """
+        old = self.domains[index]
+        if not old & ~mask:
+            return False
+        self.trail.append(old << 7 | index)
+        self.changes += 1
+        new = old & mask
+        self.domains[index] = new
+        self.eliminated += POPCOUNT[old] - POPCOUNT[new]
+        if POPCOUNT[new] == 1:
+            self.fixed += 1
+        return True
+
+    def touch(self, index):
+        """
+        Anota una celda en el registro sin cambiar su dominio.
+
+        Sirve para que `KillerSudokuSolver.propagate(mark)` vuelva a revisar las restricciones de una
+        celda cuyas restricciones cambiaron aunque su dominio no (ej. al activar su jaula). `undo`
+        restaura la misma máscara, y `changes` y los contadores no se modifican.
+
+        Args:
+            index (int): El índice de la celda (0-80).
+        """
+        self.trail.append(self.domains[index] << 7 | index)
+
+    def count(self, index):
+        """Devuelve la cantidad de dígitos posibles en la celda `index`."""
+        return POPCOUNT[self.domains[index]]
+
+    def value(self, index):
+        """Devuelve el dígito asignado a la celda si su dominio es único, o 0 en caso contrario."""
+        mask = self.domains[index]
+        return LOWEST_DIGIT[mask] if is_single(mask) else 0
+
+    def is_solved(self):
+        """Indica si todas las celdas tienen exactamente un dígito posible."""
+        return all(POPCOUNT[mask] == 1 for mask in self.domains)
+
+    def mark(self):
+        """
+        Devuelve una marca de la posición actual del registro de deshacer.
+
+        Returns:
+            int: La marca, para usarla después con `undo`.
+        """
+        return len(self.trail)
+
+    def undo(self, mark):
+        """
+        Deshace todos los cambios posteriores a `mark`, en orden inverso.
+
+        Solo se recorren los dominios que realmente cambiaron desde la marca.
+
+        Args:
+            mark (int): Una marca obtenida con `mark`.
+        """
+        trail = self.trail
+        domains = self.domains
+        while len(trail) > mark:
+            entry = trail.pop()
+            domains[entry & 0x7F] = entry >> 7  # Restaura la máscara anterior de la celda
+
+
+class DomainView(MutableSet):
+    """
+    Vista de conjunto sobre el dominio de una celda de un `BitBoard`.
+
+    Se comporta como el `set` que antes se guardaba en `vars_values[celda][2]`:
+    las lecturas y modificaciones se traducen directamente a la máscara de la celda.
+    """
+
+    __slots__ = ("_board", "_index")
+
+    def __init__(self, board, index):
+        self._board = board
+        self._index = index
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)  # Los operadores (&, |, -, ^) devuelven conjuntos normales
+
+    def __contains__(self, value):
+        if not isinstance(value, int) or not 1 <= value <= 9:
+            return False
+        return bool(self._board.domains[self._index] & BIT[value])
+
+    def __iter__(self):
+        return iter(MASK_DIGITS[self._board.domains[self._index]])
+
+    def __len__(self):
+        return POPCOUNT[self._board.domains[self._index]]
+
+    def __repr__(self):
+        return repr(set(self))
+
+    @property
+    def mask(self):
+        """La máscara de bits del dominio."""
+        return self._board.domains[self._index]
+
+    def add(self, value):
+        self._board.set(self._index, self._board.domains[self._index] | BIT[value])
+
+    def discard(self, value):
+        if isinstance(value, int) and 1 <= value <= 9:
+            self._board.remove(self._index, BIT[value])
+
+    def copy(self):
+        return set(self)
+
+    def update(self, *others):
+        for other in others:
+            self._board.set(self._index, self._board.domains[self._index] | mask_from_digits(other))
+
+    def difference_update(self, *others):
+        for other in others:
+            self._board.remove(self._index, mask_from_digits(other))
+
+    def intersection_update(self, *others):
+        for other in others:
+            self._board.intersect(self._index, mask_from_digits(other))
+
+    def union(self, *others):
+        return set(self).union(*others)
+
+    def intersection(self, *others):
+        return set(self).intersection(*others)
+
+    def difference(self, *others):
+        return set(self).difference(*others)
+
+
+class CellView:
+    """
+    Vista de la lista `[id_jaula, suma_jaula, dominio]` de una celda.
+    """
+
+    __slots__ = ("_owner", "_index")
+
+    def __init__(self, owner, index):
+        self._owner = owner
+        self._index = index
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, position):
+        position = range(3)[position]  # Normaliza índices negativos y valida el rango
+        if position == 0:
+            return self._owner.cage_ids[self._index]
+        if position == 1:
+            return self._owner.cage_sums[self._index]
+        return DomainView(self._owner.board, self._index)
+
+    def __setitem__(self, position, value):
+        position = range(3)[position]
+        if position == 0:
+            self._owner.cage_ids[self._index] = value
+        elif position == 1:
+            self._owner.cage_sums[self._index] = value
+        else:
+            self._owner.board.set(self._index, mask_from_digits(value))
+
+    def __iter__(self):
+        return iter((self[0], self[1], self[2]))
+
+    def __eq__(self, other):
+        if isinstance(other, (CellView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class VarsValuesView(Mapping):
+    """
+    Vista de diccionario `{celda: [id_jaula, suma_jaula, dominio]}` sobre un `BitBoard`.
+
+    Mantiene la interfaz histórica de `KillerSudokuSolver.vars_values` sin duplicar el estado:
+    los dominios viven en `board` y la información de jaulas en `cage_ids` y `cage_sums`.
+    """
+
+    def __init__(self, board, cells, cell_index, cage_ids, cage_sums):
+        """
+        Args:
+            board (BitBoard): El tablero con los dominios.
+            cells (list): Los nombres de las celdas en orden de índice (ej. ["A1", "A2", ...]).
+            cell_index (dict): Mapa de nombre de celda a índice.
+            cage_ids (list): El ID de jaula de cada celda, por índice.
+            cage_sums (list): La suma de jaula de cada celda, por índice.
+        """
+        self.board = board
+        self.cells = cells
+        self.cell_index = cell_index
+        self.cage_ids = cage_ids
+        self.cage_sums = cage_sums
+
+    def __getitem__(self, cell):
+        return CellView(self, self.cell_index[cell])
+
+    def __setitem__(self, cell, value):
+        cage_id, cage_sum, domain = value
+        index = self.cell_index[cell]
+        self.cage_ids[index] = cage_id
+        self.cage_sums[index] = cage_sum
+        self.board.set(index, mask_from_digits(domain))
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __repr__(self):
+        return repr({cell: list(self[cell]) for cell in self.cells})
@@ -0,0 +1,147 @@
+"""
+Tabla precalculada de combinaciones de dígitos para las jaulas del Sudoku Killer.
+
+Una jaula de `n` celdas con suma `s` solo puede contener conjuntos de `n` dígitos distintos
+(1-9) que sumen `s`. Como solo existen 511 conjuntos no vacíos de dígitos, todos se
+clasifican una única vez al importar el módulo, indexados por (tamaño, suma), y se guardan
+como máscaras de bits (ver `bitboard`).
+
+A partir de esa tabla, reducir una jaula es filtrar una lista pequeña de máscaras con las
+máscaras de los dominios de sus celdas, en lugar de enumerar `itertools.product` sobre ellos.
+Los resultados que dependen de los dominios se memorizan con `functools.lru_cache`.
+"""
+
+from functools import lru_cache
+
+from bitboard import FULL_MASK, BIT, POPCOUNT, MASK_DIGITS
+
+# Suma de los dígitos de cada máscara
+MASK_SUM = tuple(sum(digits) for digits in MASK_DIGITS)
+
+# COMBINATIONS[(tamaño, suma)] -> tupla de máscaras con `tamaño` dígitos distintos que suman `suma`
+COMBINATIONS = {}
+for _mask in range(1, FULL_MASK + 1):
+    COMBINATIONS.setdefault((POPCOUNT[_mask], MASK_SUM[_mask]), []).append(_mask)
+COMBINATIONS = {key: tuple(masks) for key, masks in COMBINATIONS.items()}
+del _mask
+
+
+@lru_cache(maxsize=None)
+def cage_combinations(size, total, allowed=FULL_MASK):
+    """
+    Devuelve las combinaciones válidas de una jaula que solo usan dígitos de `allowed`.
+
+    Args:
+        size (int): La cantidad de celdas de la jaula.
+        total (int): La suma objetivo de la jaula.
+        allowed (int, optional): Máscara de dígitos permitidos. Defaults to FULL_MASK.
+
+    Returns:
+        tuple: Las máscaras de las combinaciones válidas.
+    """
+    return tuple(combo for combo in COMBINATIONS.get((size, total), ()) if not combo & ~allowed)
+
+
+@lru_cache(maxsize=None)
+def cage_union(size, total):
+    """
+    Devuelve la unión de todas las combinaciones de una jaula (su dominio inicial).
+
+    Args:
+        size (int): La cantidad de celdas de la jaula.
+        total (int): La suma objetivo de la jaula.
+
+    Returns:
+        int: La máscara con todos los dígitos que aparecen en alguna combinación.
+    """
+    union = 0
+    for combo in cage_combinations(size, total):
+        union |= combo
+    return union
+
+
+@lru_cache(maxsize=None)
+def outsider_mask(length, total):
+    """
+    Devuelve los dígitos que pueden formar una secuencia de `length` dígitos que suma `total`,
+    permitiendo repeticiones (técnica de "outsiders").
+
+    Un dígito d es posible si los `length - 1` dígitos restantes pueden sumar `total - d`,
+    es decir, si `length - 1 <= total - d <= 9 * (length - 1)`.
+
+    Args:
+        length (int): La longitud de la secuencia.
+        total (int): La suma deseada de la secuencia.
+
+    Returns:
+        int: La máscara de los dígitos posibles (0 si no hay ninguna secuencia válida).
+    """
+    mask = 0
+    if length > 0:
+        for digit in range(1, 10):
+            rest = total - digit
+            if length - 1 <= rest <= 9 * (length - 1):
+                mask |= BIT[digit]
+    return mask
+
+
+# Conjuntos de máscaras representados como enteros de 512 bits: el bit `u` está encendido si la
+# máscara `u` pertenece al conjunto. HAS[d] contiene las máscaras con el dígito d y LACKS[d] las que no.
+HAS = (0,) + tuple(sum(1 << mask for mask in range(FULL_MASK + 1) if mask & BIT[digit]) for digit in range(1, 10))
+LACKS = (0,) + tuple(((1 << (FULL_MASK + 1)) - 1) ^ HAS[digit] for digit in range(1, 10))
+
+# COMBINATION_STATES[(tamaño, suma)] -> las combinaciones de la tabla como conjunto de 512 bits
+COMBINATION_STATES = {key: sum(1 << combo for combo in combos) for key, combos in COMBINATIONS.items()}
+
+
+@lru_cache(maxsize=1 << 16)
+def cage_support(masks, total):
+    """
+    Calcula, para cada celda de una jaula, los dígitos que participan en alguna solución válida.
+
+    Una solución asigna a cada celda un dígito de su dominio, sin repetir dígitos, de forma que
+    el conjunto de dígitos usados sea una de las combinaciones de la tabla para (tamaño, suma).
+    El cálculo recorre las celdas llevando los conjuntos de dígitos ya usados (a lo sumo 512
+    estados por celda, guardados como un entero de 512 bits): primero hacia adelante los estados
+    alcanzables y luego hacia atrás los que terminan en una combinación válida, anotando los
+    dígitos que sirven en cada celda. Agregar el dígito d a los estados que no lo tienen equivale
+    a desplazar el conjunto `BIT[d]` posiciones, así que cada paso es una operación entera.
+    Antes del recorrido se consultan las combinaciones que solo usan dígitos de los dominios
+    (`cage_combinations`): si no queda ninguna, la jaula no tiene solución.
+
+    Args:
+        masks (tuple): Las máscaras de los dominios de las celdas de la jaula.
+        total (int): La suma objetivo de la jaula.
+
+    Returns:
+        tuple: Una máscara de dígitos soportados por celda (todas 0 si la jaula no tiene solución).
+    """
+    size = len(masks)
+    allowed = 0
+    for mask in masks:
+        allowed |= mask
+    if not cage_combinations(size, total, allowed):  # Ninguna combinación cabe en los dominios
+        return (0,) * size
+
+    # Hacia adelante: conjuntos de dígitos usados tras asignar las primeras i celdas
+    layers = [1]  # Solo el estado vacío (máscara 0)
+    for mask in masks:
+        current = layers[-1]
+        layer = 0
+        for digit in MASK_DIGITS[mask]:
+            layer |= (current & LACKS[digit]) << BIT[digit]
+        layers.append(layer)
+
+    # Hacia atrás: estados que llevan a una combinación válida y dígitos que los conectan
+    support = [0] * size
+    good = layers[size] & COMBINATION_STATES.get((size, total), 0)
+    for i in range(size - 1, -1, -1):
+        current = layers[i]
+        previous = 0
+        for digit in MASK_DIGITS[masks[i]]:
+            back = ((good & HAS[digit]) >> BIT[digit]) & current  # Estados desde los que d lleva a `good`
+            if back:
+                support[i] |= BIT[digit]
+                previous |= back
+        good = previous
+    return tuple(support)
@@ -1,38 +1,223 @@
+# Archivo: convert_to_json.py
+#
+# Conversión de tableros de Sudoku Killer del formato de texto de `input.txt` (id:celdas:suma por
+# línea) a JSON, NDJSON o al formato binario de `compact`.
+#
+# `convert_to_json` convierte un único tablero en un archivo JSON con el formato de `output.json`.
+# `convert_puzzles` procesa archivos con muchos tableros sin cargarlos en memoria: los tableros se
+# leen uno por uno con generadores (`iter_puzzles`), se verifican con `verify_json.check_puzzle` y se
+# escriben a medida que llegan, una línea NDJSON o un registro binario por tablero. Con una salida
+# .json (un único tablero, como `output.json`) la entrada debe tener exactamente un tablero, que
+# también se verifica antes de escribirlo.
+#
+# Uso:
+#   python convert_to_json.py                                  (input.txt -> output.json)
+#   python convert_to_json.py tableros.txt -o tableros.ndjson
+#   python convert_to_json.py tableros.txt -o tableros.sdkb --cage-slots 49
+#   python convert_to_json.py tableros.ndjson --check         (solo verifica)
+
+import argparse
 import json
+import os
+import sys
+from itertools import islice
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Módulos compartidos con v1 (`compact`, `geometry`)
+
+from compact import PuzzleFile, PuzzleWriter, KILLER, MAX_CAGE_SLOTS, EXTENSION as COMPACT_EXTENSION
+from verify_json import check_puzzle
+
+PUZZLE_EXTENSIONS = (".txt", ".json", ".jsonl", ".ndjson", COMPACT_EXTENSION)  # Extensiones que se leen al recorrer una carpeta
+
+
+def parse_cage_line(line):
+    """
+    Convierte una línea con el formato `id:celdas:suma` en un diccionario de jaula.
+
+    Args:
+        line (str): La línea a convertir (ej. "0:A1,B1:9").
+
+    Returns:
+        dict: La jaula ({"id", "cells", "sum"}), o None si la línea es un comentario o está vacía.
+    """
+    line = line.strip()
+    if not line or line.startswith('//'):  # Omite las líneas vacías y los comentarios
+        return None
+    parts = line.split(':')  # Divide la línea en partes separadas por ':'
+    return {"id": int(parts[0]), "cells": parts[1].split(','), "sum": int(parts[2])}
 
-# Propósito: Esta función toma un archivo de texto que contiene información
-# sobre las jaulas de un Sudoku Killer en un formato personalizado y lo
-# convierte en un archivo JSON con una estructura más estandarizada.
 
 def convert_to_json(input_file, output_file):
-    cages = []  # Crea una lista vacía llamada cages para almacenar los datos
-                # de las jaulas extraídas. Esta lista contendrá diccionarios,
-                # cada uno representando una jaula del Sudoku Killer.
+    """
+    Convierte un tablero en formato de texto (ver `input.txt`) en un archivo JSON con el formato de `output.json`.
 
+    Args:
+        input_file (str): La ruta al archivo de texto.
+        output_file (str): La ruta al archivo JSON a crear.
+    """
     with open(input_file, 'r') as f:
-        for line in f:
-            if line.startswith('//'):  # Omite las líneas de comentarios
-                continue
-              # Si la línea comienza con //, se considera un comentario y
-              # se salta.
-            line = line.strip()
-            # Elimina cualquier espacio en blanco al inicio o al final de la línea.
-            if not line:  # Omite las líneas vacías
-                continue
-            parts = line.split(':')  # Divide la línea en partes separadas por ':'.
-            id = int(parts[0])  # Convierte la primera parte en un entero como ID.
-            cells = parts[1].split(',')  # Obtiene las celdas dividiéndolas por ','.
-            sum = int(parts[2])  # Convierte la última parte en un entero como suma.
-            cages.append({
-                "id": id,
-                "cells": cells,
-                "sum": sum
-            })
+        # Cada línea que no es comentario ni está vacía es una jaula {"id", "cells", "sum"}
+        cages = [cage for cage in map(parse_cage_line, f) if cage is not None]
     with open(output_file, 'w') as f:
         # Escribe el resultado en un archivo JSON con formato legible (indentado).
         json.dump({"cages": cages}, f, indent=2)
 
-# Ejemplo de uso
-input_file = 'input.txt'  # Reemplaza con la ruta de tu archivo de entrada.
-output_file = 'output.json'  # Reemplaza con la ruta de tu archivo de salida.
-convert_to_json(input_file, output_file)
+
+def iter_text_puzzles(lines):
+    """
+    Recorre tableros en formato de texto separados por líneas vacías.
+
+    Args:
+        lines (iterable): Las líneas del archivo.
+
+    Yields:
+        dict: Cada tablero como {"cages": [...]}.
+    """
+    cages = []
+    for line in lines:
+        if not line.strip():  # Una línea vacía cierra el tablero actual
+            if cages:
+                yield {"cages": cages}
+                cages = []
+            continue
+        cage = parse_cage_line(line)
+        if cage is not None:
+            cages.append(cage)
+    if cages:
+        yield {"cages": cages}
+
+
+def iter_puzzles(path):
+    """
+    Recorre los tableros de un archivo o de todos los archivos admitidos de una carpeta.
+
+    Los tableros se leen a medida que se piden, sin cargar el lote completo en memoria.
+
+    Args:
+        path (str): La ruta al archivo o a la carpeta.
+
+    Yields:
+        tuple: Pares (id_tablero, datos), donde datos es un diccionario {"cages": [...]}.
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            file_path = os.path.join(path, name)
+            if os.path.isfile(file_path) and name.endswith(PUZZLE_EXTENSIONS):
+                yield from iter_puzzles(file_path)
+        return
+
+    name = os.path.basename(path)
+    if name.endswith(COMPACT_EXTENSION):
+        with PuzzleFile(path) as puzzle_file:
+            if puzzle_file.kind != KILLER:
+                raise ValueError(f"{path}: no contiene tableros Killer")
+            for index in range(len(puzzle_file)):
+                yield f"{name}:{index + 1}", puzzle_file.decode(index)
+        return
+    with open(path, 'r') as f:
+        if name.endswith(".json"):
+            yield name, json.load(f)
+        elif name.endswith((".jsonl", ".ndjson")):
+            number = 0
+            for line in f:
+                if line.strip():
+                    number += 1
+                    data = json.loads(line)
+                    yield data.get("id", f"{name}:{number}"), data
+        else:
+            for number, data in enumerate(iter_text_puzzles(f), start=1):
+                yield f"{name}:{number}", data
+
+
+def check_puzzles(puzzles):
+    """
+    Verifica una secuencia de tableros a medida que se recorre.
+
+    Args:
+        puzzles (iterable): Pares (id_tablero, datos), por ejemplo los de `iter_puzzles`.
+
+    Yields:
+        tuple: (id_tablero, datos, es_válido, mensaje) por cada tablero (ver `verify_json.check_puzzle`).
+    """
+    for puzzle_id, data in puzzles:
+        is_valid, message = check_puzzle(data['cages'])
+        yield puzzle_id, data, is_valid, message
+
+
+def convert_puzzles(puzzles, output_file, cage_slots=MAX_CAGE_SLOTS, on_invalid=None):
+    """
+    Verifica y escribe una secuencia de tableros a medida que se recorre, con memoria constante.
+
+    Los tableros válidos se escriben en `output_file`: en el formato binario de `compact` si la ruta
+    termina en `.sdkb`, y si no, como NDJSON ({"id", "cages"} por línea). Los inválidos se omiten.
+
+    Args:
+        puzzles (iterable): Pares (id_tablero, datos), por ejemplo los de `iter_puzzles`.
+        output_file (str): La ruta del archivo a crear.
+        cage_slots (int, optional): Casillas de suma de los registros binarios. Defaults to MAX_CAGE_SLOTS.
+        on_invalid (callable, optional): Función que recibe (id_tablero, mensaje) por cada tablero inválido.
+
+    Returns:
+        tuple: (escritos, inválidos).
+    """
+    written = invalid = 0
+    binary = output_file.endswith(COMPACT_EXTENSION)
+    with (PuzzleWriter(output_file, KILLER, cage_slots) if binary else open(output_file, 'w')) as output:
+        for puzzle_id, data, is_valid, message in check_puzzles(puzzles):
+            if not is_valid:
+                invalid += 1
+                if on_invalid is not None:
+                    on_invalid(puzzle_id, message)
+                continue
+            if binary:
+                output.write(data)
+            else:
+                output.write(json.dumps({"id": puzzle_id, "cages": data['cages']}) + "\n")  # Una línea JSON por tablero
+            written += 1
+    return written, invalid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convierte y verifica tableros de Sudoku Killer.")
+    parser.add_argument("path", nargs="?", default="input.txt", help="Archivo (.txt, .json, .jsonl, .ndjson, .sdkb) o carpeta con tableros. Por defecto input.txt.")
+    parser.add_argument("-o", "--output", default="output.json",
+                        help="Archivo de salida: .json (un tablero, como output.json), .sdkb (binario) o NDJSON. Por defecto output.json.")
+    parser.add_argument("--cage-slots", type=int, default=MAX_CAGE_SLOTS, help=f"Casillas de suma de los registros .sdkb. Por defecto {MAX_CAGE_SLOTS}.")
+    parser.add_argument("--check", action="store_true", help="Solo verificar los tableros, sin escribir la salida.")
+    args = parser.parse_args(argv)
+
+    def report(puzzle_id, message):
+        print(f"{puzzle_id}: {message}", file=sys.stderr)
+
+    if args.check:
+        total = invalid = 0
+        for puzzle_id, _, is_valid, message in check_puzzles(iter_puzzles(args.path)):
+            total += 1
+            if not is_valid:
+                invalid += 1
+                report(puzzle_id, message)
+        print(f"{total - invalid} tableros válidos, {invalid} inválidos.")
+        return 1 if invalid else 0
+
+    if args.output.endswith(".json"):
+        puzzles = list(islice(iter_puzzles(args.path), 2))
+        if len(puzzles) != 1:
+            parser.error(f"la salida .json admite un único tablero y {args.path} tiene {'más de uno' if puzzles else 'ninguno'}"
+                         " (use una salida .ndjson o .sdkb)")
+        puzzle_id, data = puzzles[0]
+        is_valid, message = check_puzzle(data['cages'])
+        if not is_valid:
+            report(puzzle_id, message)
+            return 1
+        with open(args.output, 'w') as f:
+            json.dump({"cages": data['cages']}, f, indent=2)
+        print(f"1 tablero escrito en {args.output}.")
+        return 0
+
+    written, invalid = convert_puzzles(iter_puzzles(args.path), args.output, args.cage_slots, on_invalid=report)
+    print(f"{written} tableros escritos en {args.output}, {invalid} inválidos omitidos.")
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+# Archivo: editor.py
+#
+# Edición incremental de un tablero de Sudoku Killer con candidatos ("pencil marks") siempre al día.
+#
+# `PuzzleEditor` mantiene el estado propagado de `KillerSudokuSolver` entre ediciones en capas sobre
+# el registro de deshacer del tablero (`BitBoard.trail`):
+#   - piso: el dominio de cada celda según su jaula (`cage_table.cage_union`), sin registro;
+#   - base: outsiders y propagación completa de las jaulas de `base`;
+#   - una capa por cada edición de jaulas, con las jaulas que agregó y la marca del registro antes de ella;
+#   - una capa por cada dígito dado, en el orden en que se dieron, con la marca del registro antes de él.
+#
+# La propagación llega al mismo resultado sin importar el orden en que se agregan las jaulas y los
+# dígitos (cada estrategia solo descarta lo que también descartaría con dominios más chicos), así que
+# el estado de cada marca es el de las jaulas activas hasta ella. Con eso:
+#   - Dar un dígito solo agrega una capa y propaga desde esa celda (`propagate(mark)`).
+#   - Borrar un dígito vuelve a la marca de ese dígito y repite los que se dieron después.
+#   - Unir o dividir jaulas quita las jaulas originales y agrega las nuevas. Quitar una jaula afloja el
+#     tablero: se vuelve a la marca más reciente anterior a sus reducciones (la de su capa; el piso si
+#     está en la base) y se repiten las capas posteriores como una sola. Las
+#     jaulas nuevas se agregan como una capa encima: solo se propagan sus celdas.
+# `checkpoint` y `rollback` guardan y restauran cualquier estado anterior de la misma manera.
+#
+# Uso:
+#   python editor.py output.json A1=5 B3=2 A1=0 merge:0,1 split:4:C5,C6:11
+
+import argparse
+import sys
+import time
+
+from sudoku import KillerSudokuSolver, parse_puzzle
+from bitboard import BIT, FULL_MASK, MASK_DIGITS
+from cage_table import cage_union
+
+
+def cage_key(cage):
+    """Identidad de una jaula al comparar dos listas de jaulas: su ID, sus celdas (sin orden) y su suma."""
+    return cage['id'], frozenset(cage['cells']), cage['sum']
+
+
+class PuzzleEditor:
+    """
+    Tablero editable: dígitos dados y jaulas, con los dominios propagados después de cada edición.
+    """
+
+    def __init__(self, puzzle, solver=None):
+        """
+        Args:
+            puzzle: El tablero en cualquiera de los formatos de `sudoku.parse_puzzle`.
+            solver (KillerSudokuSolver, optional): La instancia a reutilizar. Si es None, se crea una
+                                                   (sin estadísticas por estrategia, que no hacen falta aquí).
+        """
+        if solver is None:
+            solver = KillerSudokuSolver()
+            solver.strategy_stats = None
+        self.solver = solver
+        self.cages = [dict(cage) for cage in parse_puzzle(puzzle)]
+        self.base = list(self.cages)  # Jaulas propagadas en la base
+        self.layers = []  # [jaulas, marca del registro antes de la capa, consistente hasta aquí]
+        self.givens = []  # [celda, dígito, marca del registro antes del dígito, consistente hasta aquí]
+        self.stats = {"rebases": 0, "layers": 0}  # Bases rehechas desde el piso y capas de jaulas aplicadas
+        solver.load_puzzle(self.cages)
+        self.rebase()
+
+    @property
+    def consistent(self):
+        """False si la propagación encontró una contradicción (ej. un dígito que no cabe)."""
+        if self.givens:
+            return self.givens[-1][3]
+        return self.layers[-1][2] if self.layers else self.base_consistent
+
+    def active_cages(self):
+        # Jaulas de la base y de las capas, en el orden en que están en `restricciones`
+        return self.base + [cage for cages, _, _ in self.layers for cage in cages]
+
+    def rebase(self):
+        # Rehace el piso y la base; las jaulas que no están en la base quedan sin activar
+        solver = self.solver
+        board = solver.board
+        board.undo(0)
+        solver.update_cages(self.base)
+        for cell in range(len(board.domains)):
+            unit_index = solver.cell_cage[cell]
+            board.domains[cell] = cage_union(len(solver.units[unit_index]), solver.cage_sums[cell]) if unit_index is not None else FULL_MASK
+        del board.trail[:]  # El piso no se deshace
+        solver.outsiders()
+        self.base_consistent = solver.propagate()
+        self.stats["rebases"] += 1
+
+    def push_layer(self, cages):
+        # Activa `cages` encima del estado actual y propaga solo desde sus celdas
+        solver = self.solver
+        board = solver.board
+        consistent = self.consistent
+        mark = board.mark()
+        solver.update_cages(self.active_cages() + cages)
+        for cage in cages:
+            domain = cage_union(len(cage['cells']), cage['sum'])
+            for cell in cage['cells']:
+                index = solver.cell_index[cell]
+                if not board.intersect(index, domain):
+                    board.touch(index)  # Sus restricciones cambiaron: `propagate` la tiene que revisar igual
+        solver.outsiders()  # Las reducciones de regiones que ya estaban activas no cambian nada
+        self.layers.append([cages, mark, solver.propagate(mark) and consistent])
+        self.stats["layers"] += 1
+
+    def replace_cages(self, cages):
+        # Quita las jaulas activas que no están en `cages` y agrega las nuevas (ver el comienzo del archivo).
+        # Devuelve False si no cambió ninguna.
+        keys = {cage_key(cage) for cage in cages}
+        active = {cage_key(cage) for cage in self.active_cages()}
+        added = [cage for cage in cages if cage_key(cage) not in active]
+        removed = active - keys
+        if not added and not removed:
+            return False
+        board = self.solver.board
+        if self.givens:
+            board.undo(self.givens[0][2])
+            self.givens = []
+        if any(cage_key(cage) in removed for cage in self.base):
+            # Las reducciones de la base dependen de todas sus jaulas: se rehace desde el piso. Las
+            # jaulas de las capas siguen en una capa, para que editarlas otra vez no rehaga la base.
+            kept = [cage for layer, _, _ in self.layers for cage in layer if cage_key(cage) in keys]
+            self.base = [cage for cage in self.base if cage_key(cage) in keys]
+            self.layers = []
+            self.rebase()
+            if kept:
+                self.push_layer(kept)
+        else:
+            # Vuelve a la capa más antigua con una jaula quitada y repite las jaulas de las posteriores
+            first = next((number for number, (layer, _, _) in enumerate(self.layers)
+                          if any(cage_key(cage) in removed for cage in layer)), len(self.layers))
+            kept = [cage for layer, _, _ in self.layers[first:] for cage in layer if cage_key(cage) in keys]
+            if first < len(self.layers):
+                board.undo(self.layers[first][1])
+                del self.layers[first:]
+            if kept:
+                self.push_layer(kept)
+        if added:
+            self.push_layer(added)
+        return True
+
+    def apply(self, cages, givens):
+        """
+        Lleva el tablero a las jaulas y los dígitos dados indicados, rehaciendo solo lo que difiere.
+
+        Args:
+            cages (list): Las jaulas ({"id", "cells", "sum"}).
+            givens (list): Pares (celda, dígito), con las celdas como índices, en el orden en que se dieron.
+
+        Returns:
+            bool: False si la propagación encontró una contradicción.
+        """
+        board = self.solver.board
+        keep = 0  # Capas de dígitos que siguen valiendo
+        if cages is not self.cages:
+            self.replace_cages(cages)
+            self.cages = cages
+        if self.givens:
+            while keep < min(len(self.givens), len(givens)) and tuple(self.givens[keep][:2]) == tuple(givens[keep]):
+                keep += 1
+            if keep < len(self.givens):
+                board.undo(self.givens[keep][2])
+                del self.givens[keep:]
+        for cell, digit in givens[keep:]:
+            consistent = self.consistent
+            mark = board.mark()
+            board.intersect(cell, BIT[digit])  # Un dígito fuera del dominio deja la celda vacía: contradicción
+            self.givens.append([cell, digit, mark, self.solver.propagate(mark) and consistent])
+        return self.consistent
+
+    def given_pairs(self):
+        return [(cell, digit) for cell, digit, _, _ in self.givens]
+
+    def set_cell(self, cell, digit):
+        """
+        Da el dígito de una celda (si ya tenía uno, lo reemplaza).
+
+        Args:
+            cell (str): El nombre de la celda (ej. "A1").
+            digit (int): El dígito (1-9).
+
+        Returns:
+            bool: False si la propagación encontró una contradicción.
+        """
+        if not 1 <= digit <= 9:
+            raise ValueError(f"Dígito inválido: {digit}")
+        index = self.solver.cell_index[cell]
+        return self.apply(self.cages, [pair for pair in self.given_pairs() if pair[0] != index] + [(index, digit)])
+
+    def clear_cell(self, cell):
+        """
+        Borra el dígito dado de una celda; las demás capas se conservan o se repiten.
+
+        Returns:
+            bool: False si la propagación encontró una contradicción.
+        """
+        index = self.solver.cell_index[cell]
+        return self.apply(self.cages, [pair for pair in self.given_pairs() if pair[0] != index])
+
+    def find_cage(self, cage_id):
+        for position, cage in enumerate(self.cages):
+            if cage['id'] == cage_id:
+                return position
+        raise ValueError(f"No existe la jaula {cage_id}")
+
+    def merge_cages(self, first_id, second_id):
+        """
+        Une dos jaulas en una con la suma de ambas y el ID de la primera.
+
+        Returns:
+            bool: False si la propagación encontró una contradicción.
+        """
+        first, second = self.find_cage(first_id), self.find_cage(second_id)
+        if first == second:
+            raise ValueError("No se puede unir una jaula consigo misma")
+        merged = {"id": first_id, "cells": self.cages[first]['cells'] + self.cages[second]['cells'],
+                  "sum": self.cages[first]['sum'] + self.cages[second]['sum']}
+        if len(merged['cells']) > 9:
+            raise ValueError(f"La jaula unida tendría {len(merged['cells'])} celdas")
+        cages = [merged if position == first else cage for position, cage in enumerate(self.cages) if position != second]
+        return self.apply(cages, self.given_pairs())
+
+    def split_cage(self, cage_id, cells, cage_sum, new_id=None):
+        """
+        Separa celdas de una jaula en una jaula nueva.
+
+        Args:
+            cage_id: El ID de la jaula a dividir.
+            cells (list): Las celdas que pasan a la jaula nueva (ej. ["C5", "C6"]).
+            cage_sum (int): La suma de la jaula nueva; la de la original baja en la misma cantidad.
+            new_id (optional): El ID de la jaula nueva. Por defecto, el mayor ID numérico más uno.
+
+        Returns:
+            bool: False si la propagación encontró una contradicción.
+        """
+        position = self.find_cage(cage_id)
+        cage = self.cages[position]
+        moved = set(cells)
+        if not moved or not moved < set(cage['cells']):
+            raise ValueError("Las celdas deben ser una parte propia de la jaula")
+        if not 0 < cage_sum < cage['sum']:
+            raise ValueError(f"Suma inválida para la jaula nueva: {cage_sum}")
+        if new_id is None:
+            new_id = max((other['id'] for other in self.cages if isinstance(other['id'], int)), default=-1) + 1
+        cages = list(self.cages)
+        cages[position] = {"id": cage_id, "cells": [cell for cell in cage['cells'] if cell not in moved],
+                           "sum": cage['sum'] - cage_sum}
+        cages.append({"id": new_id, "cells": [cell for cell in cage['cells'] if cell in moved], "sum": cage_sum})
+        return self.apply(cages, self.given_pairs())
+
+    def checkpoint(self):
+        """Devuelve una marca del estado actual (jaulas y dígitos dados) para volver a él con `rollback`."""
+        return self.cages, tuple(self.given_pairs())
+
+    def rollback(self, checkpoint):
+        """
+        Vuelve al estado de `checkpoint`, rehaciendo solo lo que difiere del estado actual.
+
+        Returns:
+            bool: False si la propagación encontró una contradicción.
+        """
+        cages, givens = checkpoint
+        return self.apply(cages, list(givens))
+
+    def candidates(self):
+        """
+        Devuelve los candidatos de cada celda.
+
+        Returns:
+            dict: El nombre de cada celda (ej. "A1") -> lista de dígitos posibles.
+        """
+        solver = self.solver
+        return {solver.cells[cell]: list(MASK_DIGITS[mask]) for cell, mask in enumerate(solver.board.domains)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aplica ediciones a un tablero de Sudoku Killer y muestra los candidatos.")
+    parser.add_argument("puzzle", help="Archivo con el tablero (ej. output.json).")
+    parser.add_argument("edits", nargs="*",
+                        help="Ediciones en orden: A1=5 (dar), A1=0 (borrar), merge:ID1,ID2, split:ID:CELDA,CELDA:SUMA.")
+    args = parser.parse_args(argv)
+
+    editor = PuzzleEditor(args.puzzle)
+    for edit in args.edits:
+        start_time = time.perf_counter()
+        if edit.startswith("merge:"):
+            first, second = edit[6:].split(",")
+            consistent = editor.merge_cages(int(first), int(second))
+        elif edit.startswith("split:"):
+            _, cage_id, cells, cage_sum = edit.split(":")
+            consistent = editor.split_cage(int(cage_id), cells.split(","), int(cage_sum))
+        else:
+            cell, digit = edit.split("=")
+            consistent = editor.set_cell(cell, int(digit)) if int(digit) else editor.clear_cell(cell)
+        elapsed = (time.perf_counter() - start_time) * 1000
+        print(f"{edit}: {'consistente' if consistent else 'contradicción'} ({elapsed:.2f} ms)", file=sys.stderr)
+    editor.solver.print_board()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+# Archivo: generator.py
+#
+# Generador de tableros de Sudoku Killer con solución única.
+#
+# Cada tablero se arma en cuatro pasos:
+#   1. `random_grid`: una cuadrícula completa al azar (búsqueda con máscaras de bits y MRV).
+#   2. `carve_cages`: jaulas conexas sin dígitos repetidos, con tamaños sorteados según una distribución.
+#   3. `make_unique`: mientras el tablero tenga otra solución, se parte la jaula más grande que
+#      contiene una celda en la que ambas soluciones difieren, y se vuelve a comprobar la unicidad.
+#      Partir una jaula no siempre quita soluciones (las partes dejan de tener que usar dígitos
+#      distintos entre sí), pero cada partición agrega al menos una jaula y no puede haber más de 81.
+#   4. `merge_singles`: las jaulas de una celda (que equivalen a dígitos dados) se unen a una vecina
+#      si el tablero sigue teniendo solución única.
+#
+# Para no resolver desde cero en cada cambio de jaulas se reutiliza una sola instancia de
+# `KillerSudokuSolver` (`load_puzzle` solo reconstruye lo que depende de las jaulas) y se guardan las
+# soluciones alternativas ya encontradas: una cuadrícula válida que respeta todas las jaulas nuevas
+# demuestra, sin buscar, que el tablero no es único. Solo cuando ninguna la respeta se cuenta con
+# `count_solutions(2)`.
+#
+# La dificultad se califica con `grading.Grader` (estrategias necesarias y esfuerzo de búsqueda).
+#
+# Uso:
+#   python generator.py -n 100 -o tableros.ndjson
+#   python generator.py -n 1000 --seed 7 --sizes 2:5,3:4,4:2,5:1 -o tableros.sdkb
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import deque
+
+from sudoku import KillerSudokuSolver
+from geometry import CELLS, CELL_UNITS
+from bitboard import FULL_MASK, BIT, POPCOUNT, MASK_DIGITS
+from grading import Grader
+from compact import PuzzleWriter, KILLER, EXTENSION as COMPACT_EXTENSION
+
+DEFAULT_SIZES = {1: 1, 2: 6, 3: 6, 4: 4, 5: 2}  # tamaño de jaula -> peso relativo
+MAX_POOL = 64  # Soluciones alternativas que se recuerdan por tablero
+
+# Celdas vecinas (arriba, abajo, izquierda, derecha) de cada celda
+NEIGHBOURS = tuple(
+    tuple(other for other, near in ((cell - 9, cell >= 9), (cell + 9, cell < 72),
+                                    (cell - 1, cell % 9 > 0), (cell + 1, cell % 9 < 8)) if near)
+    for cell in range(len(CELLS))
+)
+
+def parse_sizes(text):
+    """
+    Convierte una distribución de tamaños escrita como "tamaño:peso,..." (ej. "2:5,3:4,4:1").
+
+    Returns:
+        dict: tamaño -> peso.
+    """
+    sizes = {}
+    for part in text.split(','):
+        size, weight = part.split(':')
+        sizes[int(size)] = float(weight)
+    if not sizes or min(sizes) < 1 or max(sizes) > 9:
+        raise ValueError(f"Distribución de tamaños inválida: {text}")
+    return sizes
+
+
+class KillerGenerator:
+    """
+    Genera tableros de Sudoku Killer con solución única reutilizando una instancia del solver.
+    """
+
+    def __init__(self, seed=None, sizes=None, merge_singles=True):
+        """
+        Args:
+            seed (int, optional): Semilla del generador de números aleatorios.
+            sizes (dict, optional): Distribución de tamaños de jaula (tamaño -> peso). Defaults to DEFAULT_SIZES.
+            merge_singles (bool, optional): Si es True, se intenta eliminar las jaulas de una celda. Defaults to True.
+        """
+        self.rng = random.Random(seed)
+        self.sizes = dict(sizes or DEFAULT_SIZES)
+        self.merge_singles_enabled = merge_singles
+        self.solver = KillerSudokuSolver()
+        self.grader = Grader(self.solver, cache_size=0)  # Cada tablero es nuevo: la caché no serviría
+        self.stats = {"puzzles": 0, "solves": 0, "pool_hits": 0, "splits": 0, "merges": 0, "time": 0.0}
+
+    def random_grid(self):
+        """
+        Genera una cuadrícula completa al azar.
+
+        Returns:
+            str: Los 81 dígitos en el orden de `geometry.CELLS`.
+        """
+        grid = [0] * len(CELLS)
+        used = [0] * 27  # Dígitos usados en cada fila, columna y bloque
+
+        def fill():
+            best, best_free = None, FULL_MASK
+            for cell in range(len(CELLS)):
+                if grid[cell]:
+                    continue
+                letter, number, box = CELL_UNITS[cell]
+                free = FULL_MASK & ~(used[letter] | used[number] | used[box])
+                if best is None or POPCOUNT[free] < POPCOUNT[best_free]:
+                    best, best_free = cell, free
+                    if POPCOUNT[free] <= 1:
+                        break
+            if best is None:
+                return True
+            digits = list(MASK_DIGITS[best_free])
+            self.rng.shuffle(digits)
+            units = CELL_UNITS[best]
+            for digit in digits:
+                grid[best] = digit
+                for unit in units:
+                    used[unit] |= BIT[digit]
+                if fill():
+                    return True
+                for unit in units:
+                    used[unit] &= ~BIT[digit]
+            grid[best] = 0
+            return False
+
+        fill()
+        return "".join(map(str, grid))
+
+    def carve_cages(self, grid):
+        """
+        Reparte las celdas en jaulas conexas sin dígitos repetidos.
+
+        Cada jaula empieza en una celda libre al azar y crece por celdas vecinas libres hasta llegar
+        a un tamaño sorteado de `sizes` (o hasta que no pueda crecer sin repetir un dígito).
+
+        Args:
+            grid (str): La cuadrícula completa.
+
+        Returns:
+            list: Las jaulas como listas de índices de celda.
+        """
+        sizes, weights = list(self.sizes), list(self.sizes.values())
+        cage_of = [None] * len(CELLS)
+        cages = []
+        order = list(range(len(CELLS)))
+        self.rng.shuffle(order)
+        for start in order:
+            if cage_of[start] is not None:
+                continue
+            target = self.rng.choices(sizes, weights)[0]
+            cage = [start]
+            cage_of[start] = len(cages)
+            digits = BIT[int(grid[start])]
+            while len(cage) < target:
+                candidates = [other for cell in cage for other in NEIGHBOURS[cell]
+                              if cage_of[other] is None and not digits & BIT[int(grid[other])]]
+                if not candidates:
+                    break
+                other = self.rng.choice(candidates)
+                cage.append(other)
+                cage_of[other] = len(cages)
+                digits |= BIT[int(grid[other])]
+            cages.append(cage)
+        return cages
+
+    @staticmethod
+    def puzzle_data(grid, cages):
+        """
+        Arma los datos del tablero con el formato del archivo JSON.
+
+        Returns:
+            dict: {"cages": [{"id", "cells", "sum"}, ...]}.
+        """
+        return {"cages": [{"id": number, "cells": [CELLS[cell] for cell in sorted(cage)],
+                           "sum": sum(int(grid[cell]) for cell in cage)}
+                          for number, cage in enumerate(cages)]}
+
+    @staticmethod
+    def respects(candidate, grid, cages):
+        """Indica si la cuadrícula `candidate` cumple las sumas de todas las jaulas de `grid`."""
+        for cage in cages:
+            if sum(int(candidate[cell]) for cell in cage) != sum(int(grid[cell]) for cell in cage):
+                return False
+            if len({candidate[cell] for cell in cage}) != len(cage):
+                return False
+        return True
+
+    def alternative(self, grid, cages, pool):
+        """
+        Busca otra solución del tablero, primero entre las ya conocidas y si no, con el solver.
+
+        Args:
+            grid (str): La solución buscada.
+            cages (list): Las jaulas actuales.
+            pool (deque): Soluciones alternativas ya encontradas para esta cuadrícula.
+
+        Returns:
+            str: Otra solución, o None si la solución es única.
+        """
+        for candidate in pool:
+            if self.respects(candidate, grid, cages):
+                self.stats["pool_hits"] += 1
+                return candidate
+        self.stats["solves"] += 1
+        self.solver.load_puzzle(self.puzzle_data(grid, cages))
+        if self.solver.count_solutions(2, keep=2) == 1:
+            return None
+        candidate = next(solution for solution in self.solver.found_solutions if solution != grid)
+        pool.appendleft(candidate)
+        return candidate
+
+    def split(self, cages, cell):
+        """
+        Saca `cell` de su jaula; el resto de la jaula se divide en sus partes conexas.
+
+        Returns:
+            list: Las jaulas nuevas.
+        """
+        cage = next(cage for cage in cages if cell in cage)
+        rest = set(cage) - {cell}
+        parts = [[cell]]
+        while rest:
+            start = rest.pop()
+            part = [start]
+            queue = deque([start])
+            while queue:
+                for other in NEIGHBOURS[queue.popleft()]:
+                    if other in rest:
+                        rest.discard(other)
+                        part.append(other)
+                        queue.append(other)
+            parts.append(part)
+        return [other for other in cages if other is not cage] + parts
+
+    def make_unique(self, grid, cages, pool):
+        """
+        Parte jaulas hasta que `grid` sea la única solución.
+
+        Mientras exista otra solución se elige, entre las celdas en las que difiere de `grid`, la de
+        la jaula más grande, y se la saca de su jaula. Después de cada partición la unicidad se
+        comprueba de nuevo con `alternative`: partir una jaula elimina la restricción de dígitos
+        distintos entre sus partes, así que puede aparecer una solución que antes no existía.
+
+        El ciclo termina igual: la otra solución cumple las sumas, así que coincide con `grid` en las
+        jaulas de una celda y cada celda en la que difiere está en una jaula de dos o más. Cada
+        partición agrega entonces al menos una jaula, y con 81 jaulas de una celda la solución es única.
+
+        Returns:
+            list: Las jaulas finales.
+        """
+        while True:
+            other = self.alternative(grid, cages, pool)
+            if other is None:
+                return cages
+            size = {cell: len(cage) for cage in cages for cell in cage}
+            differing = [cell for cell in range(len(CELLS)) if other[cell] != grid[cell]]
+            largest = max(size[cell] for cell in differing)  # Al menos 2 (ver arriba)
+            cell = self.rng.choice([cell for cell in differing if size[cell] == largest])
+            cages = self.split(cages, cell)
+            self.stats["splits"] += 1
+
+    def merge_singles(self, grid, cages, pool):
+        """
+        Une cada jaula de una celda con una jaula vecina si la solución sigue siendo única.
+
+        Unir jaulas solo puede agregar soluciones, así que cada unión se confirma con `alternative`.
+
+        Returns:
+            list: Las jaulas finales.
+        """
+        max_size = max(self.sizes)
+        singles = [cage for cage in cages if len(cage) == 1]
+        self.rng.shuffle(singles)
+        for single in singles:
+            cell = single[0]
+            cage_of = {other: cage for cage in cages for other in cage}
+            if cage_of.get(cell) is not single:
+                continue
+            neighbours = {id(cage_of[other]): cage_of[other] for other in NEIGHBOURS[cell]}.values()
+            options = [cage for cage in neighbours
+                       if len(cage) < max_size and grid[cell] not in {grid[other] for other in cage}]
+            self.rng.shuffle(options)
+            for cage in options:
+                merged = [other for other in cages if other is not single and other is not cage] + [cage + [cell]]
+                if self.alternative(grid, merged, pool) is None:
+                    cages = merged
+                    self.stats["merges"] += 1
+                    break
+        return cages
+
+    def generate(self):
+        """
+        Genera un tablero con solución única.
+
+        Returns:
+            dict: {"cages", "solution", "difficulty", "score"} con las jaulas en el formato del archivo JSON
+                  y la dificultad calificada por `grading.Grader`.
+        """
+        start_time = time.perf_counter()
+        grid = self.random_grid()
+        pool = deque(maxlen=MAX_POOL)
+        cages = self.make_unique(grid, self.carve_cages(grid), pool)
+        if self.merge_singles_enabled:
+            cages = self.merge_singles(grid, cages, pool)
+
+        data = self.puzzle_data(grid, cages)
+        grading = self.grader.grade(data)
+        data["solution"] = grid
+        data["difficulty"] = grading["difficulty"]
+        data["score"] = grading["score"]
+        self.stats["puzzles"] += 1
+        self.stats["time"] += time.perf_counter() - start_time
+        return data
+
+
+def generate_puzzles(count, seed=None, sizes=None, merge_singles=True):
+    """
+    Genera tableros de Sudoku Killer con solución única.
+
+    Args:
+        count (int): Cantidad de tableros.
+        seed (int, optional): Semilla del generador de números aleatorios.
+        sizes (dict, optional): Distribución de tamaños de jaula (tamaño -> peso).
+        merge_singles (bool, optional): Si es True, se intenta eliminar las jaulas de una celda. Defaults to True.
+
+    Yields:
+        dict: Cada tablero (ver `KillerGenerator.generate`).
+    """
+    generator = KillerGenerator(seed, sizes, merge_singles)
+    for _ in range(count):
+        yield generator.generate()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera tableros de Sudoku Killer con solución única.")
+    parser.add_argument("-n", "--count", type=int, default=10, help="Cantidad de tableros. Por defecto 10.")
+    parser.add_argument("-o", "--output", help="Archivo de salida: NDJSON o .sdkb (por defecto, NDJSON en la salida estándar).")
+    parser.add_argument("--seed", type=int, help="Semilla del generador de números aleatorios.")
+    parser.add_argument("--sizes", type=parse_sizes, default=DEFAULT_SIZES,
+                        help="Distribución de tamaños de jaula como tamaño:peso,... (ej. 2:5,3:4,4:1).")
+    parser.add_argument("--keep-singles", action="store_true", help="No intentar eliminar las jaulas de una celda.")
+    args = parser.parse_args(argv)
+
+    generator = KillerGenerator(args.seed, args.sizes, not args.keep_singles)
+    binary = args.output is not None and args.output.endswith(COMPACT_EXTENSION)
+    if binary:
+        output = PuzzleWriter(args.output, KILLER)
+    else:
+        output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for number in range(1, args.count + 1):
+            data = generator.generate()
+            if binary:
+                output.write(data)
+            else:
+                line = {"id": f"gen-{number}", "difficulty": data["difficulty"], "score": data["score"],
+                        "cages": data["cages"], "solution": data["solution"]}
+                output.write(json.dumps(line) + "\n")  # Una línea JSON por tablero
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    stats = generator.stats
+    print(f"{stats['puzzles']} tableros en {stats['time']:.2f} s ({stats['solves']} conteos, "
+          f"{stats['pool_hits']} descartes sin buscar, {stats['splits']} divisiones, {stats['merges']} uniones)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# Archivo: grading.py
+#
+# Calificación de dificultad de tableros de Sudoku Killer según las estrategias que necesitan.
+#
+# `Grader.grade` aplica las estrategias de `KillerSudokuSolver` sobre todo el tablero en un orden fijo
+# de costo creciente (`GRADING_ORDER`): prueba la más barata y solo pasa a la siguiente si la anterior
+# no cambió nada; en cuanto una estrategia elimina algún candidato se vuelve a empezar por la más
+# barata. Así cada estrategia se usa solo cuando las más simples ya no alcanzan. Si todas se estancan
+# sin resolver el tablero, la etapa final es la búsqueda (`count_solutions(2)`), de la que se registran
+# los nodos explorados.
+#
+# El puntaje es la suma del costo de cada uso de una estrategia (`STRATEGY_COSTS`) más `SEARCH_COST`
+# por nodo de búsqueda. A diferencia del tiempo de `solver()`, no depende de la máquina ni de la carga.
+#
+# Los estados intermedios (las jaulas y los dominios cada vez que se vuelve a la estrategia más barata)
+# se guardan en una caché LRU con lo que falta para terminar desde ahí: un tablero repetido, o dos
+# tableros con las mismas jaulas que llegan al mismo estado, no vuelven a propagarse ni a buscar.
+#
+# Uso:
+#   python grading.py ../benchmark/corpus/killer.ndjson
+#   python grading.py tableros.sdkb -o calificaciones.ndjson
+
+import argparse
+import json
+import sys
+from collections import OrderedDict
+
+from sudoku import KillerSudokuSolver
+from convert_to_json import iter_puzzles
+
+# Estrategias en orden de costo creciente
+GRADING_ORDER = (
+    "obvious_singles",
+    "hidden_singles",
+    "obvious_pairs",
+    "pointing_pairs",
+    "pointing_triples",
+    "obvious_triples",
+    "outsiders",
+)
+STRATEGY_COSTS = {
+    "obvious_singles": 1,
+    "hidden_singles": 2,
+    "obvious_pairs": 4,
+    "pointing_pairs": 5,
+    "pointing_triples": 6,
+    "obvious_triples": 8,
+    "outsiders": 10,
+}
+SEARCH_COST = 25  # Costo de cada nodo de la búsqueda final
+EASY_COST = STRATEGY_COSTS["hidden_singles"]  # Estrategia más cara de un tablero "easy"
+CACHE_SIZE = 4096  # Estados intermedios que se recuerdan
+
+
+class Grader:
+    """
+    Califica tableros reutilizando una instancia de `KillerSudokuSolver` y una caché de estados.
+    """
+
+    def __init__(self, solver=None, cache_size=CACHE_SIZE):
+        """
+        Args:
+            solver (KillerSudokuSolver, optional): La instancia a reutilizar. Si es None, se crea una.
+            cache_size (int, optional): Estados intermedios a recordar (0 = sin caché). Defaults to CACHE_SIZE.
+        """
+        self.solver = solver if solver is not None else KillerSudokuSolver()
+        self.cache = OrderedDict()  # (jaulas, dominios) -> (usos restantes, nodos, soluciones)
+        self.cache_size = cache_size
+        self.cache_stats = {"hits": 0, "misses": 0}
+
+    def cage_key(self):
+        """Clave de las jaulas del tablero cargado, independiente del orden y los IDs de las jaulas."""
+        solver = self.solver
+        return tuple(sorted((unit, solver.cage_sums[unit[0]]) for unit in solver.units[27:]))
+
+    def remember(self, key, value):
+        self.cache[key] = value
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def grade(self, data):
+        """
+        Califica un tablero.
+
+        Args:
+            data: El tablero en cualquiera de los formatos de `sudoku.parse_puzzle` (ej. {"cages": [...]}).
+
+        Returns:
+            dict: "score" (puntaje), "difficulty" ("easy", "medium" o "hard"), "level" (la estrategia más
+                  cara que hizo falta, o "search"), "strategies" (usos de cada estrategia que hizo
+                  falta), "nodes" (nodos de la búsqueda final), "solutions" (0, 1 o 2, con 2 si hay
+                  más de una) y "cached" (si se reutilizó un estado de la caché).
+        """
+        solver = self.solver
+        solver.load_puzzle(data)
+        board = solver.board
+        cage_key = self.cage_key()
+        strategies = [getattr(solver, name) for name in GRADING_ORDER]
+        uses = [0] * len(GRADING_ORDER)
+        visited = []  # (clave, usos hasta ese estado) de los estados recorridos
+        remaining = None  # Resultado de la caché: (usos restantes, nodos, soluciones)
+
+        while all(board.domains) and not board.is_solved():
+            key = (cage_key, board.domains.tobytes())
+            if self.cache_size:
+                remaining = self.cache.get(key)
+                if remaining is not None:
+                    self.cache.move_to_end(key)
+                    self.cache_stats["hits"] += 1
+                    break
+                self.cache_stats["misses"] += 1
+                visited.append((key, tuple(uses)))
+            for step, strategy in enumerate(strategies):
+                changes = board.changes
+                strategy()
+                if board.changes != changes:
+                    uses[step] += 1
+                    break  # Vuelve a empezar por la estrategia más barata
+            else:
+                break  # Ninguna estrategia cambió nada: hace falta buscar
+
+        if remaining is not None:
+            extra, nodes, solutions = remaining
+            uses = [used + more for used, more in zip(uses, extra)]
+        elif not all(board.domains):
+            nodes, solutions = 0, 0  # Contradicción: el tablero no tiene solución
+        elif board.is_solved():
+            # Un dígito por celda no basta: la propagación completa comprueba las sumas y las unidades
+            nodes, solutions = 0, 1 if solver.propagate() else 0
+        else:
+            solutions = solver.count_solutions(2)
+            nodes = solver.search_stats["nodes"]
+
+        for key, before in visited:
+            self.remember(key, (tuple(used - previous for used, previous in zip(uses, before)), nodes, solutions))
+
+        needed = {name: count for name, count in zip(GRADING_ORDER, uses) if count}
+        score = sum(STRATEGY_COSTS[name] * count for name, count in needed.items()) + SEARCH_COST * nodes
+        if nodes:
+            level, difficulty = "search", "hard"
+        else:
+            level = max(needed, key=STRATEGY_COSTS.get, default="obvious_singles")
+            difficulty = "easy" if STRATEGY_COSTS[level] <= EASY_COST else "medium"
+        return {"score": score, "difficulty": difficulty, "level": level, "strategies": needed,
+                "nodes": nodes, "solutions": solutions, "cached": remaining is not None}
+
+
+def grade_puzzles(puzzles, grader=None):
+    """
+    Califica una secuencia de tableros con una misma instancia de `Grader`.
+
+    Args:
+        puzzles (iterable): Pares (id_tablero, datos), por ejemplo los de `convert_to_json.iter_puzzles`.
+        grader (Grader, optional): La instancia a reutilizar (y su caché). Si es None, se crea una.
+
+    Yields:
+        dict: El resultado de cada tablero (ver `Grader.grade`) con su "id".
+    """
+    if grader is None:
+        grader = Grader()
+    for puzzle_id, data in puzzles:
+        result = {"id": puzzle_id}
+        result.update(grader.grade(data))
+        yield result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Califica la dificultad de tableros de Sudoku Killer.")
+    parser.add_argument("path", help="Archivo (.txt, .json, .jsonl, .ndjson, .sdkb) o carpeta con tableros.")
+    parser.add_argument("-o", "--output", help="Archivo NDJSON de salida (por defecto, la salida estándar).")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE, help=f"Estados intermedios a recordar (0 = sin caché). Por defecto {CACHE_SIZE}.")
+    args = parser.parse_args(argv)
+
+    grader = Grader(cache_size=args.cache_size)
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for result in grade_puzzles(iter_puzzles(args.path), grader):
+            output.write(json.dumps(result) + "\n")  # Una línea JSON por tablero
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,10 @@ def main():
 
         # Paso 2: Verificar el archivo JSON generado
         print('Verificando el archivo JSON...')
-        is_valid = verify_sudoku_killer_json('output.json')
+        is_valid, message = verify_sudoku_killer_json('output.json')
 
         if not is_valid:
-            print('El archivo JSON contiene inconsistencias. Corrige los errores y vuelve a intentarlo.')
+            print(f'El archivo JSON contiene inconsistencias: {message} Corrige los errores y vuelve a intentarlo.')
             return
         print('El archivo JSON es válido.')
 
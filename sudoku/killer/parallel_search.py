@@ -0,0 +1,243 @@
+# Archivo: parallel_search.py
+#
+# Búsqueda en paralelo de un único tablero difícil de Sudoku Killer.
+#
+# Después de la propagación inicial, se expanden los primeros niveles del árbol de búsqueda (con la
+# misma heurística MRV de `KillerSudokuSolver.choose_cell`) hasta tener suficientes ramas
+# independientes. Cada rama es una lista de asignaciones (celda, dígito) que se explora en un
+# proceso distinto: el proceso reconstruye el estado de la raíz, repite las asignaciones y continúa
+# con `search`. Cuando una rama encuentra una solución se activa un evento compartido y el resto
+# de los procesos abandonan su búsqueda; las ramas que todavía no empezaron se cancelan.
+#
+# Uso:
+#   python parallel_search.py output.json --workers 8
+#   python parallel_search.py output.json --workers 8 --branches 64
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from bitboard import BIT, MASK_DIGITS
+from sudoku import KillerSudokuSolver
+
+
+def apply_assignments(solver, assignments):
+    """
+    Asigna y propaga una secuencia de pares (celda, dígito) sobre el estado actual del solver.
+
+    Args:
+        solver (KillerSudokuSolver): El solver, con el estado de la raíz ya propagado.
+        assignments (iterable): Pares (índice_celda, dígito).
+
+    Returns:
+        bool: True si todas las asignaciones son consistentes, False si la propagación encontró un conflicto.
+    """
+    board = solver.board
+    for cell, digit in assignments:
+        mark = board.mark()
+        board.set(cell, BIT[digit])
+        if not solver.propagate(mark):
+            return False
+    return True
+
+
+def split_search(solver, branches):
+    """
+    Expande los primeros niveles del árbol de búsqueda hasta tener al menos `branches` ramas.
+
+    El árbol se recorre por niveles: cada rama del nivel actual se reproduce sobre el estado de la raíz,
+    se elige su celda con `choose_cell` y se generan sus hijos consistentes. El tablero del solver queda
+    igual que antes de la llamada. Si se agota el plazo de `solver.limits`, se devuelven ramas vacías
+    y `solver.timed_out` queda en True.
+
+    Args:
+        solver (KillerSudokuSolver): El solver, con el estado de la raíz ya propagado.
+        branches (int): Cantidad mínima de ramas deseada.
+
+    Returns:
+        tuple: (ramas, solución). `ramas` es la lista de asignaciones de cada rama; si la expansión llega
+               a una solución, `solución` es su cadena (ver `solution_string`) y las ramas quedan vacías.
+    """
+    board = solver.board
+    frontier = [()]
+    while len(frontier) < branches:
+        expanded = []
+        split = False
+        for assignments in frontier:
+            mark = board.mark()
+            apply_assignments(solver, assignments)  # Ya se verificó al crear la rama
+            cell = solver.choose_cell()
+            if cell is None:  # La rama ya es una solución
+                solution = solver.solution_string()
+                board.undo(mark)
+                return [], solution
+            split = True
+            for digit in MASK_DIGITS[board.domains[cell]]:
+                if solver.limit_reached():
+                    board.undo(mark)
+                    return [], None
+                solver.search_stats["nodes"] += 1
+                branch_mark = board.mark()
+                board.set(cell, BIT[digit])
+                if solver.propagate(branch_mark):
+                    expanded.append(assignments + ((cell, digit),))
+                board.undo(branch_mark)
+            board.undo(mark)
+        frontier = expanded
+        if not split or not frontier:
+            break
+    return frontier, None
+
+
+_worker_solver = None  # Instancia del solver de cada proceso del pool, con el estado de la raíz propagado
+
+
+def init_worker(data, stop_event):
+    """
+    Prepara el solver de un proceso del pool: carga el tablero y propaga la raíz una sola vez.
+
+    Args:
+        data (dict): Los datos del tablero ({"cages": [...]}).
+        stop_event (multiprocessing.Event): El evento que indica que otra rama ya encontró la solución.
+    """
+    global _worker_solver
+    _worker_solver = KillerSudokuSolver()
+    _worker_solver.load_puzzle(data)
+    _worker_solver.outsiders()
+    _worker_solver.propagate()
+    _worker_solver.stop_event = stop_event
+
+
+def solve_branch(assignments):
+    """
+    Explora una rama dentro de un proceso del pool.
+
+    Args:
+        assignments (tuple): Las asignaciones (celda, dígito) que definen la rama.
+
+    Returns:
+        tuple: (solución, nodos). `solución` es la cadena del tablero resuelto o None si la rama no
+               tiene solución o se canceló.
+    """
+    solver = _worker_solver
+    if solver.stop_event.is_set():
+        return None, 0
+    solver.search_stats = {"nodes": 0, "backtracks": 0, "time": 0.0}
+    solver.cancelled = False
+    mark = solver.board.mark()
+    try:
+        if apply_assignments(solver, assignments) and solver.search():
+            return solver.solution_string(), solver.search_stats["nodes"]
+        return None, solver.search_stats["nodes"]
+    finally:
+        solver.board.undo(mark)  # Vuelve al estado de la raíz para la siguiente rama
+
+
+def solve_parallel(solver, workers=None, branches=None, log=False, time_limit=None, pass_limit=None):
+    """
+    Resuelve el tablero cargado en `solver` explorando en paralelo las ramas de los primeros niveles.
+
+    Si la propagación inicial o la expansión de los primeros niveles ya resuelven el tablero, no se
+    crea ningún proceso. Al terminar, el tablero de `solver` queda resuelto (si hay solución) y
+    `search_stats` tiene las mismas claves que después de `KillerSudokuSolver.solver` ("status",
+    "fixed" y, con `pass_limit`, "passes"), con los nodos explorados entre todos los procesos.
+
+    Args:
+        solver (KillerSudokuSolver): El solver con el tablero ya cargado (por archivo o con `load_puzzle`).
+        workers (int, optional): Cantidad de procesos. Por defecto, la cantidad de núcleos.
+        branches (int, optional): Cantidad mínima de ramas a repartir. Por defecto, 4 por proceso.
+        log (bool, optional): Si es True, imprime el progreso. Defaults to False.
+        time_limit (float, optional): Tiempo máximo en segundos; al agotarse, los procesos abandonan
+                                      sus ramas. Defaults to None (sin límite).
+        pass_limit (int, optional): Restricciones que puede procesar la propagación del proceso principal
+                                    (la raíz y la expansión). Defaults to None (sin límite).
+
+    Returns:
+        bool: True si se encuentra una solución, False en caso contrario (incluso si se agotó un límite).
+    """
+    start_time = solver.start_search(time_limit, None, pass_limit)
+    workers = workers or os.cpu_count() or 1
+    branches = branches or 4 * workers
+    data = {"cages": solver.cage_list()}
+
+    solution = None
+    try:
+        solver.outsiders()
+        if solver.propagate():
+            frontier, solution = split_search(solver, branches)
+            if log:
+                print(f"Ramas a explorar: {len(frontier)}")
+            if solution is None and frontier:
+                solution = search_branches(solver, data, frontier, workers, log)
+    finally:
+        solver.end_limits(pass_limit)
+
+    if solution is not None:
+        for index, digit in enumerate(solution):
+            solver.board.set(index, BIT[int(digit)])
+    solver.finish_stats(solution is not None)
+    solver.search_stats["time"] = time.perf_counter() - start_time
+    if log:
+        print(f"Nodos explorados: {solver.search_stats['nodes']}, tiempo: {solver.search_stats['time']:.4f} s")
+    return solution is not None
+
+
+def search_branches(solver, data, frontier, workers, log=False):
+    """
+    Reparte las ramas entre los procesos y devuelve la primera solución encontrada.
+
+    Args:
+        solver (KillerSudokuSolver): El solver principal (solo se actualizan sus `search_stats`).
+        data (dict): Los datos del tablero que cada proceso vuelve a cargar.
+        frontier (list): Las asignaciones de cada rama (ver `split_search`).
+        workers (int): Cantidad de procesos.
+        log (bool, optional): Si es True, imprime el progreso. Defaults to False.
+
+    Returns:
+        str: La solución encontrada, o None si ninguna rama tiene solución o se agotó el plazo de
+             `solver.limits` (en ese caso `solver.timed_out` pasa a True).
+    """
+    deadline = solver.limits[0] if solver.limits is not None else None
+    stop_event = multiprocessing.Event()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(data, stop_event))
+    try:
+        pending = {executor.submit(solve_branch, assignments) for assignments in frontier}
+        while pending:
+            timeout = max(deadline - time.perf_counter(), 0.0) if deadline is not None else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:  # Se agotó el plazo: los procesos abandonan su rama
+                solver.timed_out = True
+                stop_event.set()
+                return None
+            for future in done:
+                solution, nodes = future.result()
+                solver.search_stats["nodes"] += nodes
+                if solution is not None:
+                    if log:
+                        print(f"Solución encontrada; se cancelan {len(pending)} ramas")
+                    stop_event.set()  # Los procesos que siguen buscando abandonan su rama
+                    return solution
+        return None
+    finally:
+        executor.shutdown(cancel_futures=True)  # Las ramas que no empezaron no llegan a ejecutarse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve un tablero de Sudoku Killer repartiendo la búsqueda entre varios procesos.")
+    parser.add_argument("path", help="Archivo JSON con el tablero (formato de output.json).")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="Cantidad de procesos (0 = todos los núcleos).")
+    parser.add_argument("-b", "--branches", type=int, default=0, help="Cantidad mínima de ramas a repartir (0 = 4 por proceso).")
+    parser.add_argument("--log", action="store_true", help="Imprimir el progreso de la búsqueda.")
+    args = parser.parse_args(argv)
+
+    solver = KillerSudokuSolver(args.path)
+    if solve_parallel(solver, workers=args.workers or None, branches=args.branches or None, log=args.log):
+        solver.print_board2()
+    else:
+        print("No se encontró solución")
+
+
+if __name__ == "__main__":
+    main()
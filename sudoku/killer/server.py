@@ -0,0 +1,255 @@
+# Archivo: server.py
+#
+# Servidor asyncio que resuelve tableros de Sudoku Killer sobre un socket local (TCP o Unix).
+#
+# Protocolo: una línea JSON por pedido y una línea JSON por respuesta, sobre la misma conexión.
+#   Pedido:    {"id": ..., "cages": [...], "deadline": 2.5, "count": 2}
+#              ("id", "deadline" en segundos y "count" como en `batch.py --count` son opcionales)
+#   Respuesta: el resultado de `batch.solve_puzzle` ({"id", "status", "solution", "nodes", "time", ...}),
+#              con "status" "timeout" si no terminó antes del plazo y "coalesced": true si se
+#              reutilizó la resolución de un pedido idéntico que ya estaba en curso.
+# Las respuestas salen a medida que terminan, no en el orden de los pedidos: el "id" las identifica.
+#
+# Las resoluciones se hacen en un pool de procesos (cada proceso reutiliza su instancia del solver,
+# como en `batch.solve_puzzles_parallel`), así que el bucle de eventos solo lee y escribe y un tablero
+# difícil no bloquea a los demás. Los pedidos idénticos (las mismas jaulas, en cualquier orden) que
+# llegan mientras el primero sigue en curso esperan su resultado en lugar de resolverse de nuevo.
+#
+# Contrapresión: cada conexión tiene a lo sumo `--max-inflight` pedidos en curso; al llegar al límite
+# el servidor deja de leer esa conexión hasta que alguno termine. En todo el servidor, a lo sumo
+# `--max-pending` resoluciones distintas están en el pool o esperándolo; los pedidos nuevos esperan
+# un lugar, y ese tiempo cuenta para su plazo.
+#
+# Un pedido que vence su plazo se responde con "timeout" de inmediato; si nadie más espera esa
+# resolución y el pool todavía no la empezó, se cancela. Si ya empezó, el proceso la abandona al
+# agotarse el plazo con el que se envió (`KillerSudokuSolver.solver(time_limit=...)`). Cada resolución
+# compartida lleva el plazo más lejano de los pedidos que la esperan: si un pedido idéntico con un
+# plazo más largo llega cuando el proceso ya empezó con el plazo anterior y este se agota, la
+# resolución se vuelve a enviar al pool con lo que le queda al pedido más paciente.
+#
+# Uso:
+#   python server.py --port 8765 --workers 8
+#   python server.py --unix /tmp/killer.sock --deadline 10
+#   python -c "import json; print(json.dumps(json.load(open('output.json'))))" | nc -q 5 localhost 8765
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from batch import init_worker, solve_chunk
+from verify_json import check_puzzle
+
+LINE_LIMIT = 1 << 20  # Tamaño máximo de un pedido (bytes)
+STATUS_STATS = {"solved": "solved", "unsolved": "unsolved", "timeout": "timeouts", "invalid": "invalid"}  # Estado -> contador
+
+
+def puzzle_key(cages, count_limit):
+    """Clave de un pedido, independiente del orden y los IDs de las jaulas y del orden de sus celdas."""
+    return tuple(sorted((tuple(sorted(cage['cells'])), cage['sum']) for cage in cages)), count_limit
+
+
+class SolveServer:
+    """
+    Atiende pedidos de resolución con un pool de procesos, agrupando los pedidos idénticos.
+    """
+
+    def __init__(self, workers=None, max_pending=None, max_inflight=32, deadline=None):
+        """
+        Args:
+            workers (int, optional): Cantidad de procesos del pool. Por defecto, la cantidad de núcleos.
+            max_pending (int, optional): Resoluciones distintas en curso o esperando el pool. Por defecto, 4 por proceso.
+            max_inflight (int, optional): Pedidos en curso por conexión. Defaults to 32.
+            deadline (float, optional): Plazo en segundos para los pedidos que no indican uno (None = sin plazo).
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_inflight = max_inflight
+        self.deadline = deadline
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        self.slots = asyncio.Semaphore(max_pending or 4 * self.workers)
+        self.inflight = {}  # Clave del pedido -> [tarea de la resolución, pedidos que la esperan, plazo más lejano]
+        self.stats = {"requests": 0, "solved": 0, "unsolved": 0, "coalesced": 0, "timeouts": 0, "invalid": 0,
+                      "errors": 0, "resubmitted": 0}
+
+    def forget(self, key, entry):
+        # Quita la resolución de las que están en curso (si no la reemplazó otra con la misma clave)
+        if self.inflight.get(key) is entry:
+            del self.inflight[key]
+
+    async def run_solve(self, data, count_limit, entry):
+        # Espera un lugar y resuelve el tablero en el pool; la verificación ya se hizo al recibirlo.
+        # El proceso recibe como límite de tiempo lo que le queda al pedido más paciente de `entry`
+        # (entry[2], None = sin plazo), para no seguir ocupado después de que todos venzan.
+        async with self.slots:
+            while True:
+                expires = entry[2]
+                limits = {"time_limit": max(expires - time.perf_counter(), 0.0)} if expires is not None else None
+                future = self.executor.submit(solve_chunk, [(None, data)], False, count_limit, limits)
+                try:
+                    results = await asyncio.wrap_future(future)
+                except asyncio.CancelledError:
+                    if not future.cancelled():  # Ya empezó: el lugar se libera cuando el proceso termine
+                        await asyncio.wait([asyncio.wrap_future(future)])
+                    raise
+                except BrokenProcessPool:  # Un proceso murió: el pool se reemplaza para los pedidos siguientes
+                    self.executor.shutdown(cancel_futures=True)
+                    self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+                    raise
+                # Si se agotó el plazo con el que se envió pero un pedido agrupado después tiene uno
+                # más largo que no venció, se vuelve a resolver con ese plazo
+                if results[0]["status"] != "timeout" or entry[2] == expires or (
+                        entry[2] is not None and entry[2] <= time.perf_counter()):
+                    return results[0]
+                self.stats["resubmitted"] += 1
+
+    async def solve(self, request):
+        """
+        Resuelve un pedido ya decodificado.
+
+        Args:
+            request (dict): El pedido ({"id", "cages", "deadline", "count"}).
+
+        Returns:
+            dict: La respuesta (ver el encabezado del archivo).
+        """
+        start_time = time.perf_counter()
+        self.stats["requests"] += 1
+        result = {"id": request.get('id'), "status": "error", "solution": None, "nodes": 0}
+        try:
+            cages = request['cages']
+            is_valid, message = check_puzzle(cages)
+            if not is_valid:
+                self.stats["invalid"] += 1
+                result.update(status="invalid", message=message)
+                return result
+            count_limit = int(request.get('count') or 0)
+            deadline = request.get('deadline', self.deadline)
+            expires = start_time + deadline if deadline is not None else None
+
+            key = puzzle_key(cages, count_limit)
+            entry = self.inflight.get(key)
+            if entry is None:
+                entry = self.inflight[key] = [None, 0, expires]
+                entry[0] = asyncio.ensure_future(self.run_solve({"cages": cages}, count_limit, entry))
+                entry[0].add_done_callback(lambda _: self.forget(key, entry))
+            else:
+                self.stats["coalesced"] += 1
+                result["coalesced"] = True
+                if entry[2] is not None:  # La resolución compartida dura lo que el pedido más paciente
+                    entry[2] = None if expires is None else max(entry[2], expires)
+            task = entry[0]
+
+            entry[1] += 1
+            try:
+                solved = await asyncio.wait_for(asyncio.shield(task), deadline)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                result["status"] = "timeout"
+                return result
+            finally:
+                entry[1] -= 1
+                if entry[1] == 0 and not task.done():  # Nadie más la espera: se cancela si todavía no empezó
+                    self.forget(key, entry)
+                    task.cancel()
+            result.update({name: value for name, value in solved.items() if name not in ("id", "time")})
+            # Se cuenta según el estado del resultado: el proceso también responde "timeout" si se agota
+            # el plazo con el que se envió, aunque el pedido no haya vencido antes
+            self.stats[STATUS_STATS.get(result["status"], "errors")] += 1
+        except Exception as e:  # Un pedido con errores no afecta a los demás
+            self.stats["errors"] += 1
+            result["message"] = f"{type(e).__name__}: {e}"
+        finally:
+            result["time"] = round(time.perf_counter() - start_time, 6)
+        return result
+
+    async def handle(self, reader, writer):
+        """Atiende una conexión: lee pedidos línea por línea y escribe cada respuesta al terminar."""
+        inflight = asyncio.Semaphore(self.max_inflight)
+        tasks = set()
+
+        async def answer(line):
+            try:
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("se esperaba un objeto JSON")
+                except ValueError as e:
+                    self.stats["invalid"] += 1
+                    response = {"id": None, "status": "invalid", "solution": None, "nodes": 0, "message": f"JSON inválido: {e}"}
+                else:
+                    response = await self.solve(request)
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+            except ConnectionError:
+                pass  # El cliente cerró la conexión
+            finally:
+                inflight.release()
+
+        try:
+            while True:
+                await inflight.acquire()  # Contrapresión: no se lee más hasta que haya lugar
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):  # Línea demasiado larga o conexión cortada
+                    inflight.release()
+                    break
+                if not line:
+                    inflight.release()
+                    break
+                if not line.strip():
+                    inflight.release()
+                    continue
+                task = asyncio.ensure_future(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, path=None):
+        """
+        Atiende conexiones hasta que se interrumpa.
+
+        Args:
+            host (str, optional): Dirección TCP. Defaults to "127.0.0.1".
+            port (int, optional): Puerto TCP. Defaults to 8765.
+            path (str, optional): Si se indica, escucha en ese socket Unix en lugar de TCP.
+        """
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle, path, limit=LINE_LIMIT)
+        else:
+            server = await asyncio.start_server(self.handle, host, port, limit=LINE_LIMIT)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local que resuelve tableros de Sudoku Killer (una línea JSON por pedido).")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección TCP. Por defecto 127.0.0.1.")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto TCP. Por defecto 8765.")
+    parser.add_argument("--unix", metavar="RUTA", help="Escuchar en un socket Unix en lugar de TCP.")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="Cantidad de procesos (0 = todos los núcleos).")
+    parser.add_argument("--max-pending", type=int, default=0, help="Resoluciones distintas en curso o en espera (0 = 4 por proceso).")
+    parser.add_argument("--max-inflight", type=int, default=32, help="Pedidos en curso por conexión. Por defecto 32.")
+    parser.add_argument("--deadline", type=float, help="Plazo en segundos de los pedidos que no indican uno.")
+    args = parser.parse_args(argv)
+
+    async def run():
+        server = SolveServer(args.workers or None, args.max_pending or None, args.max_inflight, args.deadline)
+        await server.serve(args.host, args.port, args.unix)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,174 @@
-import copy
 import json
-import itertools
-from itertools import product
+import os
+import re
+import sys
+import time
 from itertools import combinations
+from collections import deque
+from functools import lru_cache
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Módulos compartidos con v1 (`geometry`)
+
+from geometry import CELLS, CELL_INDEX, UNITS, CELL_UNITS, CELL_LINES, PEERS, BOX_LINES, UNIT_BOX_LINES, cage_index, adjacent_regions, blocks_adjacent
+from bitboard import BitBoard, VarsValuesView, BIT, POPCOUNT, MASK_DIGITS, mask_from_digits, digits_from_mask, is_single
+from cage_table import cage_union, cage_support, outsider_mask
+from stats import StrategyStats, profiled
+from compact import decode_killer
+from convert_to_json import parse_cage_line
+
+CAGE_TEXT = re.compile(r"\s*(//|\d+:)")  # Comienzo de un texto con el formato de input.txt (id:celdas:suma)
+
+
+def parse_puzzle_text(text):
+    """
+    Convierte el texto de un tablero (JSON o el formato de input.txt) en su lista de jaulas.
+
+    En el formato de input.txt las jaulas pueden ir en líneas separadas o en una sola línea separadas
+    por ';' (ej. "0:A1,B1:9;1:C1,D1:12;...").
+
+    Args:
+        text (str): El texto del tablero.
+
+    Returns:
+        list: Las jaulas ({"id", "cells", "sum"}).
+    """
+    stripped = text.lstrip()
+    if stripped.startswith(('{', '[')):
+        return parse_puzzle(json.loads(stripped))
+    if not CAGE_TEXT.match(stripped):
+        raise ValueError("El texto no es un tablero JSON ni tiene el formato id:celdas:suma")
+    cages = (parse_cage_line(line) for part in stripped.splitlines() for line in part.split(';'))
+    return [cage for cage in cages if cage is not None]
+
+
+def parse_puzzle(puzzle):
+    """
+    Devuelve la lista de jaulas de un tablero en cualquiera de los formatos admitidos.
+
+    Formatos admitidos:
+    - dict con la lista de jaulas en "cages" (formato de output.json),
+    - lista de jaulas ({"id", "cells", "sum"}),
+    - bytes, bytearray o memoryview con un registro Killer de `compact` (ej. `PuzzleFile[i]`),
+    - str con el texto del tablero (ver `parse_puzzle_text`),
+    - str u `os.PathLike` con la ruta de un archivo .json o con el formato de input.txt.
+
+    Args:
+        puzzle: El tablero.
+
+    Returns:
+        list: Las jaulas ({"id", "cells", "sum"}).
+    """
+    if isinstance(puzzle, dict):
+        return puzzle['cages']
+    if isinstance(puzzle, (list, tuple)):
+        return list(puzzle)
+    if isinstance(puzzle, (bytes, bytearray, memoryview)):
+        return decode_killer(puzzle)['cages']
+    if is_puzzle_path(puzzle):
+        with open(puzzle, 'r') as file:
+            return parse_puzzle_text(file.read())
+    if isinstance(puzzle, str):
+        return parse_puzzle_text(puzzle)
+    raise TypeError(f"Formato de tablero no admitido: {type(puzzle).__name__}")
+
+
+def is_puzzle_path(puzzle):
+    """Indica si `parse_puzzle` trata a `puzzle` como la ruta de un archivo y no como el texto del tablero."""
+    if isinstance(puzzle, os.PathLike):
+        return True
+    return isinstance(puzzle, str) and not CAGE_TEXT.match(puzzle) and not puzzle.lstrip().startswith(('{', '['))
+
+
+@lru_cache(maxsize=None)
+def named_adjacent_constraints():
+    """
+    Devuelve las regiones de `geometry.adjacent_regions` agrupadas por número de unidades y con las
+    celdas por nombre (ver `KillerSudokuSolver.define_adjacent_constraints`).
+
+    Returns:
+        dict: número de unidades -> tupla de `frozenset` de nombres de celda.
+    """
+    constraints = {num_adjacent: [] for num_adjacent in range(1, 10)}
+    for num_adjacent, cells, _, _ in adjacent_regions():
+        constraints[num_adjacent].append(frozenset(CELLS[cell] for cell in cells))
+    return {num_adjacent: tuple(regions) for num_adjacent, regions in constraints.items()}
+
 
 class KillerSudokuSolver:
 
-    def __init__(self, file_path):
+    def __init__(self, puzzle=None):
         """
         Inicializa una instancia de la clase `KillerSudokuSolver`.
 
+        El tablero puede ser la ruta a un archivo o estar ya en memoria: un diccionario con el formato
+        de output.json, la lista de jaulas, un registro binario de `compact` o el texto del tablero
+        (ver `parse_puzzle`). Se interpreta una sola vez y la misma lista de jaulas se usa para los
+        dominios (`read_cages`) y para las restricciones (`define_constraints`).
+
+        Si no se indica un tablero, la instancia queda con las estructuras de la cuadrícula (filas,
+        columnas, bloques, regiones de adyacencia) ya construidas y sin jaulas; los tableros se cargan
+        después con `load_puzzle`, lo que permite reutilizar la misma instancia para muchos tableros.
+
         Args:
-            file_path (str): La ruta al archivo JSON que contiene el tablero de Sudoku Killer a resolver.
+            puzzle (optional): El tablero de Sudoku Killer a resolver, o la ruta al archivo que lo contiene.
         """
-        self.file_path = file_path  # Guarda la ruta al archivo en el atributo `file_path`
-        self.vars_values = self.define_variables()  # Inicializa el diccionario `vars_values` con todas las celdas y sus posibles valores
-        self.read_board()  # Lee el tablero de Sudoku desde el archivo y actualiza `vars_values` con los valores iniciales
-        self.restricciones = self.define_constraints()  # Define las restricciones del Sudoku (filas, columnas, bloques)
+        self.file_path = puzzle if is_puzzle_path(puzzle) else None  # Guarda la ruta al archivo, si el tablero viene de uno
+        self.vars_values = self.define_variables()  # Inicializa el tablero de bits y la vista `vars_values` con todas las celdas y sus posibles valores
+        if puzzle is not None:
+            cages = parse_puzzle(puzzle)  # Lee el tablero una sola vez
+            self.read_cages(cages)  # Actualiza los dominios con los valores iniciales
+            self.restricciones = self.define_constraints(cages)  # Define las restricciones del Sudoku (filas, columnas, bloques, jaulas)
+        else:
+            self.restricciones = self.define_grid_constraints()  # Solo filas, columnas y bloques
         self.adjacent_constraints = self.define_adjacent_constraints()
+        self.index_constraints()  # Traduce las restricciones a índices enteros para las estrategias
+        self.search_stats = {"nodes": 0, "backtracks": 0, "time": 0.0}  # Estadísticas de la última búsqueda
+        self.strategy_stats = StrategyStats()  # Llamadas, tiempo, eliminados y fijadas por estrategia (None las desactiva)
+        self.stop_event = None  # Evento opcional (ej. multiprocessing.Event) que interrumpe la búsqueda al activarse
+        self.cancelled = False  # True si la última búsqueda se interrumpió por `stop_event`
+        self.limits = None  # (instante límite, nodos máximos) de la búsqueda en curso (ver `solver`)
+        self.pass_budget = None  # Restricciones que la propagación puede procesar todavía (None = sin límite)
+        self.timed_out = False  # True si la última llamada a `solver` o `count_solutions` agotó su presupuesto
+        self.first_solution = None  # Dominios de la primera solución de `count_solutions`
+        self.found_solutions = []  # Soluciones guardadas por `count_solutions`, como cadenas
 
     def define_variables(self):
         """
         Define e inicializa las variables del Sudoku Killer.
 
-        Este método crea un diccionario llamado `vars_values` que almacenará la información de cada celda del Sudoku.
-        Cada celda se representa con una clave (ej. "A1") y su valor es una lista con la siguiente estructura:
+        Los dominios de las 81 celdas se guardan en un `BitBoard`: un arreglo plano de enteros de 9 bits,
+        donde el bit (d - 1) indica si el dígito d es posible. Cada celda tiene un índice entero
+        (0-80) y un nombre (ej. "A1"); `cells` y `cell_index` traducen entre ambos.
+
+        Para mantener la interfaz histórica, este método devuelve una vista de diccionario
+        `vars_values` donde cada celda (ej. "A1") se representa con la estructura:
         [id_jaula, suma_jaula, dominio]
 
         - id_jaula: El identificador de la jaula a la que pertenece la celda.
         - suma_jaula: La suma objetivo de los valores de las celdas dentro de la jaula.
-        - dominio: Un conjunto que contiene los posibles valores que la celda puede tomar (inicialmente 1-9).
+        - dominio: Una vista de conjunto sobre la máscara de la celda (inicialmente 1-9).
 
         Además, define las etiquetas de las columnas (`columnas`) como "ABCDEFGHI" y las filas (`filas`) como un conjunto de números del 1 al 9.
 
         Returns:
-            dict: El diccionario `vars_values` que mapea cada celda a su información correspondiente.
+            VarsValuesView: La vista `vars_values` que mapea cada celda a su información correspondiente.
         """
         self.columnas = "ABCDEFGHI"  # Define las etiquetas de las columnas del Sudoku
         self.filas = {i for i in range(1, 10)}  # Define los números de las filas del Sudoku (1-9) como un conjunto
-        vars_values = {}  # Crea un diccionario vacío para almacenar las variables y sus valores
-
-        for col in self.columnas:  # Itera sobre cada columna (A, B, C, ...)
-            for fila in self.filas:  # Itera sobre cada fila (1, 2, 3, ...)
-                vars_values[f"{col}{fila}"] = []  # A cada celda se le asigna una lista vacía donde se agregarán sus atributos
-        return vars_values  # Devuelve el diccionario `vars_values`
+        self.cells = CELLS  # Nombre de cada celda según su índice (ver `geometry`)
+        self.cell_index = CELL_INDEX  # Índice de cada celda según su nombre
+        self.cage_ids = [None] * len(self.cells)  # ID de la jaula de cada celda
+        self.cage_sums = [0] * len(self.cells)  # Suma objetivo de la jaula de cada celda
+        self.board = BitBoard(len(self.cells))  # Dominios de las celdas como máscaras de bits
+        return VarsValuesView(self.board, self.cells, self.cell_index, self.cage_ids, self.cage_sums)
 
     def extract_domains(self, length, value):
         """
         Calcula la unión de todos los conjuntos posibles de dígitos únicos (1-9) de una longitud dada que suman un valor dado.
 
         Este método se utiliza para determinar el dominio inicial de las celdas dentro de una jaula en un Sudoku Killer.
-        Genera todas las combinaciones posibles de dígitos únicos (sin repetición) de la longitud especificada y selecciona
-        aquellas combinaciones cuya suma es igual al valor dado. Luego, calcula la unión de todos los dígitos presentes en
-        estas combinaciones válidas.
+        Las combinaciones de dígitos únicos (sin repetición) de cada longitud y suma se consultan en la tabla
+        precalculada de `cage_table`, y se devuelve la unión de todos los dígitos presentes en ellas.
 
         Args:
             length (int): La cantidad de dígitos en el conjunto (corresponde al número de celdas en una jaula).
@@ -61,44 +177,138 @@ class KillerSudokuSolver:
         Returns:
             set: Un conjunto que contiene la unión de todos los dominios válidos para la jaula.
         """
-
-        all_combinations = itertools.combinations(range(1, 10), length)  # Genera todas las combinaciones posibles de dígitos únicos de la longitud dada
-        union_domain = set()  # Inicializa un conjunto vacío para almacenar la unión de los dominios
-
-        for combination in all_combinations:  # Itera sobre cada combinación
-            if sum(combination) == value:  # Si la suma de la combinación es igual al valor objetivo
-                union_domain.update(combination)  # Agrega los dígitos de la combinación al conjunto de unión
-
-        return union_domain  # Devuelve el conjunto de unión, que representa el dominio inicial de las celdas en la jaula
+        return digits_from_mask(cage_union(length, value))  # Devuelve el conjunto de unión, que representa el dominio inicial de las celdas en la jaula
 
     def read_board(self):
         """
         Lee el tablero de Sudoku Killer desde el archivo JSON y actualiza las variables.
 
-        Este método abre el archivo JSON especificado por `file_path` y extrae la información de las jaulas y las celdas.
-        Luego, actualiza el diccionario `vars_values` con los valores iniciales y la información del dominio para cada celda.
+        Este método abre el archivo especificado por `file_path` y extrae la información de las jaulas y las celdas.
+        Luego, actualiza los dominios del tablero y la información de jaula de cada celda (ver `read_cages`).
 
-        Para cada jaula, se calcula el dominio utilizando la función `extract_domains` y se almacena en el diccionario
-        `vars_values` junto con el ID de la jaula y la suma objetivo.
+        Para cada jaula, se calcula el dominio utilizando la función `extract_domains` y se almacena como máscara
+        de bits en el tablero, junto con el ID de la jaula y la suma objetivo.
 
-        No retorna ningún valor, pero modifica el estado interno del objeto `KillerSudokuSolver`.
+        Returns:
+            list: Las jaulas leídas, para reutilizarlas sin volver a leer el archivo (ej. en `define_constraints`).
         """
+        cages = parse_puzzle(self.file_path)  # Lee y convierte el archivo en la lista de jaulas
+        self.read_cages(cages)
+        return cages
 
-        with open(self.file_path, 'r') as file:  # Abre el archivo JSON en modo lectura
-            data = json.load(file)  # Carga los datos del archivo JSON en un diccionario llamado 'data'
+    def read_cages(self, cages):
+        """
+        Actualiza los dominios y la información de jaula de cada celda a partir de una lista de jaulas.
 
-        for cage_data in data['cages']:  # Itera sobre cada jaula en los datos JSON
+        Args:
+            cages (list): Lista de jaulas con el formato del archivo JSON ({"id", "cells", "sum"}).
+        """
+        for cage_data in cages:  # Itera sobre cada jaula
             cage_id = cage_data['id']  # Obtiene el ID de la jaula actual
             cage_sum = cage_data['sum']  # Obtiene la suma objetivo de la jaula actual
             cage_cells = cage_data['cells']  # Obtiene la lista de celdas que pertenecen a la jaula actual
 
-            domain = self.extract_domains(len(cage_cells), cage_sum)  # Calcula el dominio de la jaula utilizando la función 'extract_domains'
+            domain = cage_union(len(cage_cells), cage_sum)  # Obtiene la máscara del dominio de la jaula (ver 'extract_domains')
 
-            # Actualiza vars_values con la información de la jaula para cada celda
+            # Actualiza el ID, la suma y el dominio de cada celda de la jaula
             for cell in cage_cells:
-                self.vars_values[cell].insert(0, cage_id)  # Agrega el ID de la jaula al inicio de la lista de la celda
-                self.vars_values[cell].insert(1, cage_sum)  # Agrega la suma de la jaula en la segunda posición de la lista de la celda
-                self.vars_values[cell].append(set(domain))  # Agrega el dominio de la jaula al final de la lista de la celda
+                index = self.cell_index[cell]  # Obtiene el índice entero de la celda
+                self.cage_ids[index] = cage_id  # Guarda el ID de la jaula de la celda
+                self.cage_sums[index] = cage_sum  # Guarda la suma de la jaula de la celda
+                self.board.set(index, domain)  # Asigna el dominio de la jaula a la celda
+
+    def load_puzzle(self, data):
+        """
+        Carga un nuevo tablero en esta instancia, reutilizando las estructuras de la cuadrícula.
+
+        Reinicia los dominios y la información de jaulas, y reconstruye solo lo que depende de las
+        jaulas (`restricciones[27:]` y sus índices). Las restricciones de filas, columnas y bloques,
+        las regiones de `adjacent_constraints` y las tablas de `cage_table` no se vuelven a calcular.
+
+        Args:
+            data: El tablero en cualquiera de los formatos de `parse_puzzle` (ej. {"cages": [...]}, como el archivo JSON).
+        """
+        cages = parse_puzzle(data)
+        self.file_path = data if is_puzzle_path(data) else None
+        self.board.reset()
+        for index in range(len(self.cells)):
+            self.cage_ids[index] = None
+            self.cage_sums[index] = 0
+        self.read_cages(cages)
+        self.restricciones[27:] = [set(cage_data['cells']) for cage_data in cages]
+        self.index_cages()
+
+    def update_cages(self, cages):
+        """
+        Reemplaza las jaulas del tablero recalculando solo lo que depende de las que cambiaron.
+
+        A diferencia de `load_puzzle`, no modifica los dominios: quien llama decide cómo rehacerlos
+        (ver `editor.PuzzleEditor`). Se actualizan `cage_ids`, `cage_sums`, `cell_units` y `cell_peers`
+        de las celdas cuya jaula cambió (de celdas, de suma o de posición en `restricciones`) y las
+        reducciones de `outsiders` de las regiones que las tocan.
+
+        Args:
+            cages (list): Lista completa de jaulas con el formato del archivo JSON ({"id", "cells", "sum"}).
+
+        Returns:
+            int: Máscara de 81 bits con las celdas cuya jaula cambió.
+        """
+        index = self.cell_index
+        units = [tuple(sorted(index[cell] for cell in cage_data['cells'])) for cage_data in cages]
+        cell_cage = cage_index(units, offset=27)
+        changed = 0
+        for cell, unit_index in enumerate(cell_cage):
+            old_index = self.cell_cage[cell]
+            cage_data = cages[unit_index - 27] if unit_index is not None else None
+            if unit_index == old_index and (unit_index is None or (
+                    units[unit_index - 27] == self.units[unit_index] and cage_data['sum'] == self.cage_sums[cell]
+                    and cage_data['id'] == self.cage_ids[cell])):
+                continue
+            changed |= 1 << cell
+            self.cage_ids[cell] = cage_data['id'] if cage_data is not None else None
+            self.cage_sums[cell] = cage_data['sum'] if cage_data is not None else 0
+
+        self.restricciones[27:] = [set(cage_data['cells']) for cage_data in cages]
+        self.units[27:] = units
+        self.cell_cage = cell_cage
+        for cell in range(len(self.cells)):
+            if not changed >> cell & 1:
+                continue
+            unit_index = cell_cage[cell]
+            if unit_index is None:
+                self.cell_units[cell] = CELL_UNITS[cell]
+                self.cell_peers[cell] = PEERS[cell]
+            else:
+                self.cell_units[cell] = CELL_UNITS[cell] + (unit_index,)
+                self.cell_peers[cell] = tuple(sorted(set(PEERS[cell]).union(self.units[unit_index]) - {cell}))
+        if changed:
+            self.index_outsiders(changed)
+        return changed
+
+    def solution_string(self):
+        """
+        Devuelve el tablero como una cadena de 81 caracteres en el orden de `cells` (A1, A2, ..., I9).
+
+        Las celdas resueltas se representan con su dígito y las demás con ".".
+
+        Returns:
+            str: La cadena del tablero.
+        """
+        return "".join(str(self.board.value(index) or ".") for index in range(len(self.cells)))
+
+    def cage_list(self):
+        """
+        Devuelve las jaulas del tablero cargado con el formato del archivo JSON.
+
+        Returns:
+            list: Lista de jaulas ({"id", "cells", "sum"}), en el orden de `restricciones[27:]`.
+        """
+        cages = []
+        for unit in self.units[27:]:
+            first = unit[0]
+            cages.append({"id": self.cage_ids[first], "cells": [self.cells[index] for index in unit],
+                          "sum": self.cage_sums[first]})
+        return cages
 
     def print_board(self):
         """
@@ -192,7 +402,7 @@ class KillerSudokuSolver:
             if fila % 3 == 0:  # Si se ha llegado al final de un bloque 3x3 en vertical
                 print("+-------+-------+-------+")  # Imprime la línea horizontal que separa los bloques 3x3
 
-    def define_constraints(self):
+    def define_constraints(self, cages=None):
         """
         Define y retorna las restricciones del Sudoku Killer.
 
@@ -201,46 +411,170 @@ class KillerSudokuSolver:
         - Restricciones de fila: Cada conjunto contiene las celdas que pertenecen a una misma fila.
         - Restricciones de columna: Cada conjunto contiene las celdas que pertenecen a una misma columna.
         - Restricciones de bloque 3x3: Cada conjunto contiene las celdas que pertenecen a un mismo bloque 3x3.
-        - Restricciones de jaula: Cada conjunto contiene las celdas que pertenecen a una misma jaula, obtenidas del archivo JSON.
+        - Restricciones de jaula: Cada conjunto contiene las celdas que pertenecen a una misma jaula.
+
+        Args:
+            cages (list, optional): Las jaulas ya leídas. Si es None, se leen del archivo `file_path`.
 
         Returns:
             list: Una lista de conjuntos que representan las restricciones del Sudoku.
         """
-        restricciones = []  # Inicializa una lista vacía para almacenar las restricciones
-
-        # Restricciones de filas:
-        for col in self.columnas:  # Itera sobre cada columna
-            vars = set()  # Crea un conjunto vacío para almacenar las celdas de la fila actual
-            for fila in self.filas:  # Itera sobre cada fila
-                vars.add(f"{col}{fila}")  # Agrega la celda actual al conjunto de la fila
-            restricciones.append(vars)  # Agrega el conjunto de la fila a la lista de restricciones
-
-        # Restricciones de columnas:
-        for fila in self.filas:  # Itera sobre cada fila
-            vars = set()  # Crea un conjunto vacío para almacenar las celdas de la columna actual
-            for col in self.columnas:  # Itera sobre cada columna
-                vars.add(f"{col}{fila}")  # Agrega la celda actual al conjunto de la columna
-            restricciones.append(vars)  # Agrega el conjunto de la columna a la lista de restricciones
-
-        # Restricciones de bloques 3x3:
-        for i in range(3):  # Itera sobre los bloques en horizontal
-            for j in range(3):  # Itera sobre los bloques en vertical
-                vars = set()  # Crea un conjunto vacío para almacenar las celdas del bloque actual
-                for col in self.columnas[i * 3:(i + 1) * 3]:  # Itera sobre las columnas del bloque
-                    for fila in list(self.filas)[j * 3:(j + 1) * 3]:  # Itera sobre las filas del bloque
-                        vars.add(f"{col}{fila}")  # Agrega la celda actual al conjunto del bloque
-                restricciones.append(vars)  # Agrega el conjunto del bloque a la lista de restricciones
+        restricciones = self.define_grid_constraints()  # Restricciones de filas, columnas y bloques
 
         # Restricciones de jaula:
-        with open(self.file_path, 'r') as file:  # Abre el archivo JSON
-            data = json.load(file)  # Carga los datos del archivo JSON
+        if cages is None:
+            cages = parse_puzzle(self.file_path)
 
-        for cage_data in data['cages']:  # Itera sobre cada jaula en los datos JSON
+        for cage_data in cages:  # Itera sobre cada jaula
             cage_cells = set(cage_data['cells'])  # Crea un conjunto con las celdas de la jaula
             restricciones.append(cage_cells)  # Agrega el conjunto de la jaula a la lista de restricciones
 
         return restricciones  # Retorna la lista de restricciones
 
+    def define_grid_constraints(self):
+        """
+        Define y retorna las 27 restricciones de la cuadrícula (filas, columnas y bloques 3x3).
+
+        Returns:
+            list: Una lista de 27 conjuntos de celdas.
+        """
+        # Las unidades de la cuadrícula se precalculan al importar `geometry`, en el mismo orden:
+        # filas (misma letra), columnas (mismo número) y bloques 3x3.
+        restricciones = [{self.cells[index] for index in unit} for unit in UNITS]
+        return restricciones  # Retorna la lista de restricciones
+
+    def index_constraints(self):
+        """
+        Traduce las restricciones a índices enteros de celda para las estrategias.
+
+        Las estrategias trabajan con índices de celda (0-80) y máscaras de bits en lugar de nombres
+        y conjuntos. Las tablas de la cuadrícula se toman de `geometry`, que las calcula una sola vez
+        al importarse; el resto se calcula a partir de `restricciones`:
+        - `units`: las celdas de cada restricción como tuplas de índices (mismo orden que `restricciones`).
+        - `cell_cage`: el índice en `restricciones` de la jaula de cada celda (None si no tiene jaula).
+        - `cell_lines`: las restricciones de columna y de fila de cada celda.
+        - `cell_units`: todas las restricciones (incluida la jaula) a las que pertenece cada celda.
+        - `cell_peers`: las demás celdas que comparten alguna restricción con cada celda.
+        - `box_lines`: las intersecciones entre bloques y filas/columnas que usa `pointing_triples`,
+          como tuplas (intersección, resto del bloque, resto de la línea).
+        - `unit_box_lines`: las entradas de `box_lines` en las que participa cada fila, columna o bloque.
+        - `regions`: las regiones de la técnica "outsiders" (ver `geometry.adjacent_regions`).
+
+        Lo que depende de las jaulas se calcula en `index_cages`.
+        """
+        # Las tablas de la cuadrícula se comparten entre instancias (ver `geometry`)
+        self.units = list(UNITS)
+        self.cell_lines = CELL_LINES
+        self.box_lines = BOX_LINES
+        self.unit_box_lines = UNIT_BOX_LINES
+
+        self.regions = adjacent_regions()  # Catálogo de regiones, calculado una vez por proceso
+
+        self.index_cages()
+
+    def index_cages(self):
+        """
+        Calcula los índices que dependen de las jaulas: `units[27:]`, `cell_cage`, `cell_units`,
+        `cell_peers` (ver `index_constraints`) y las reducciones de `outsiders` (ver `index_outsiders`).
+        """
+        index = self.cell_index
+        self.units[27:] = [tuple(sorted(index[cell] for cell in constraint)) for constraint in self.restricciones[27:]]
+
+        self.cell_cage = cage_index(self.units[27:], offset=27)  # Restricción de jaula de cada celda
+
+        # Las vecinas de la cuadrícula vienen de `geometry`; solo se agregan las de la jaula
+        self.cell_units = []
+        self.cell_peers = []
+        for cell, unit_index in enumerate(self.cell_cage):
+            if unit_index is None:
+                self.cell_units.append(CELL_UNITS[cell])
+                self.cell_peers.append(PEERS[cell])
+            else:
+                cage = self.units[unit_index]
+                self.cell_units.append(CELL_UNITS[cell] + (unit_index,))
+                self.cell_peers.append(tuple(sorted(set(PEERS[cell]).union(cage) - {cell})))
+
+        self.index_outsiders()
+
+    def index_outsiders(self, changed=None):
+        """
+        Precalcula las reducciones de la técnica "outsiders" para las jaulas cargadas.
+
+        Para cada región de `regions` (la unión de n filas, columnas o bloques, que suma 45 * n) se
+        buscan las jaulas que la tocan, la suma de esas jaulas y sus celdas que quedan fuera de la
+        región. Esas celdas externas suman (suma de las jaulas - 45 * n), lo que limita sus dígitos
+        (ver `cage_table.outsider_mask`). Como el resultado no depende de los dominios, se calcula una
+        sola vez por tablero y `outsiders` solo aplica las reducciones guardadas en `outsider_rules`.
+
+        Las jaulas y las celdas se manejan como máscaras enteras: en una pasada por el índice celda ->
+        jaula se arma la máscara de celdas de cada jaula y, para cada fila, columna y bloque, la máscara
+        de las jaulas que la tocan; las jaulas de una región son la unión de las de sus unidades.
+        Las regiones con celdas sin jaula se omiten.
+
+        La reducción de cada región se guarda en `region_rules` (None si no hay); con `changed` solo se
+        recalculan las regiones que tocan esas celdas (ver `update_cages`).
+
+        Args:
+            changed (int, optional): Máscara de 81 bits con las celdas cuya jaula cambió. Si es None,
+                                     se recalculan todas las regiones.
+        """
+        cage_count = len(self.units) - 27
+        cage_cells = [0] * cage_count  # Máscara de 81 bits con las celdas de cada jaula
+        cage_sums = [0] * cage_count  # Suma de cada jaula
+        unit_cages = [0] * 27  # Máscara con las jaulas que tocan cada fila, columna y bloque
+        uncaged = 0  # Celdas sin jaula
+        for cell, unit_index in enumerate(self.cell_cage):
+            if unit_index is None:
+                uncaged |= 1 << cell
+                continue
+            cage = unit_index - 27
+            cage_cells[cage] |= 1 << cell
+            cage_sums[cage] = self.cage_sums[cell]
+            for unit in CELL_UNITS[cell]:
+                unit_cages[unit] |= 1 << cage
+
+        # Celdas de las jaulas que tocan cada unidad: las celdas externas de una región se obtienen
+        # sin recorrer sus jaulas, que solo se suman si la región pasa el filtro de 1 a 4 celdas
+        unit_cells = [0] * 27
+        for unit, cages in enumerate(unit_cages):
+            while cages:
+                low = cages & -cages
+                cages ^= low
+                unit_cells[unit] |= cage_cells[low.bit_length() - 1]
+
+        if changed is None:
+            self.region_rules = [None] * len(self.regions)
+        for number, (num_adjacent, _, region_mask, region_units) in enumerate(self.regions):
+            if changed is not None and not region_mask & changed:
+                continue  # Ninguna jaula de la región cambió
+            self.region_rules[number] = None
+            if region_mask & uncaged:
+                continue
+            cages = 0
+            outside = 0  # Celdas de las jaulas de la región que quedan fuera de ella
+            for unit in region_units:
+                cages |= unit_cages[unit]
+                outside |= unit_cells[unit]
+            outside &= ~region_mask
+            count = outside.bit_count()
+            if not 0 < count <= 4:
+                continue  # Salta la región si no involucra entre 1 y 4 celdas externas
+            cages_sum = 0
+            while cages:
+                low = cages & -cages
+                cages ^= low
+                cages_sum += cage_sums[low.bit_length() - 1]
+            domain = outsider_mask(count, cages_sum - 45 * num_adjacent)
+            if domain:
+                cells = []
+                while outside:  # Recorre solo los bits encendidos (de 1 a 4 celdas)
+                    low = outside & -outside
+                    outside ^= low
+                    cells.append(low.bit_length() - 1)
+                self.region_rules[number] = (tuple(cells), domain)
+        self.outsider_rules = [rule for rule in self.region_rules if rule is not None]
+
+    @profiled("obvious_singles")
     def obvious_singles(self):
         """
         Aplica la estrategia de "singles obvios" al Sudoku Killer.
@@ -252,51 +586,56 @@ class KillerSudokuSolver:
         No retorna ningún valor, pero modifica el estado interno del objeto `KillerSudokuSolver`
         actualizando los dominios de las celdas.
         """
-
-        for constraint in self.restricciones:  # Itera sobre cada restricción (fila, columna, bloque, jaula)
-            for key in constraint:  # Itera sobre cada celda dentro de la restricción actual
-                if len(self.vars_values[key][2]) == 1:  # Si la celda tiene solo un valor posible en su dominio
-                    for borrar_key in constraint:  # Itera sobre las demás celdas en la misma restricción
+        domains = self.board.domains
+        remove = self.board.remove
+
+        for unit in self.units:  # Itera sobre cada restricción (fila, columna, bloque, jaula)
+            for key in unit:  # Itera sobre cada celda dentro de la restricción actual
+                mask = domains[key]
+                if is_single(mask):  # Si la celda tiene solo un valor posible en su dominio
+                    for borrar_key in unit:  # Itera sobre las demás celdas en la misma restricción
                         if borrar_key != key:  # Si la celda actual no es la misma que la celda con el single obvio
-                            self.vars_values[borrar_key][2].discard(list(self.vars_values[key][2])[0])  # Elimina el valor del single obvio del dominio de la otra celda
-                    self.update_domain(key)  # Actualiza el dominio de la celda después de aplicar la estrategia de singles obvios
-            if len(constraint) == 2:
-                pair_to_match = list(constraint)
-                self.match_sum_pair_domains(pair_to_match[0], pair_to_match[1], self.vars_values[pair_to_match[0]][1])
+                            remove(borrar_key, mask)  # Elimina el valor del single obvio del dominio de la otra celda
+                    self.update_cell_domain(key)  # Actualiza la jaula de la celda después de aplicar la estrategia de singles obvios
+            if len(unit) == 2:
+                self.match_sum_pair_masks(unit[0], unit[1], self.cage_sums[unit[0]])
 
     def update_domain(self, cell):
         """
         Actualiza el dominio de una celda en función de las restricciones de la jaula a la que pertenece.
 
         Este método se utiliza para reducir el dominio de una celda en una jaula después de que se ha asignado un valor
-        a otra celda en la misma jaula. Recorre todas las restricciones de jaula, y si la celda dada pertenece a una de ellas,
-        calcula la suma restante necesaria para cumplir con la restricción de la jaula. Luego, reduce el dominio de la celda
+        a otra celda en la misma jaula. Busca la restricción de jaula de la celda dada,
+        calcula la suma restante necesaria para cumplir con la restricción de la jaula y reduce el dominio de las celdas
         a aquellos valores que aún podrían permitir que se cumpla la restricción de suma de la jaula.
 
         Args:
             cell (str): El nombre de la celda cuyo dominio se va a actualizar (ej. "A1").
         """
-        for i in range(27, len(self.restricciones)):  # Itera sobre las restricciones de jaula (índices 27 en adelante)
-            if cell in self.restricciones[i]:  # Si la celda pertenece a la restricción de jaula actual
-                sum = self.vars_values[cell][1]  # Obtiene la suma objetivo de la jaula
-                cells_to_update = []  # Lista para almacenar las celdas cuyo dominio se actualizará
-                domains_to_update = []  # Lista para almacenar los dominios de las celdas a actualizar
+        self.update_cell_domain(self.cell_index[cell])
 
-                for cell1 in self.restricciones[i]:  # Itera sobre las celdas en la jaula
-                    if len(self.vars_values[cell1][2]) == 1:  # Si la celda ya tiene un valor asignado
-                        sum = sum - list(self.vars_values[cell1][2])[0]  # Resta el valor asignado de la suma objetivo
-                    else:  # Si la celda aún no tiene un valor asignado
-                        cells_to_update.append(cell1)  # Agrega la celda a la lista de celdas a actualizar
-                        domains_to_update.append(self.vars_values[cell1][2])  # Agrega el dominio de la celda a la lista de dominios a actualizar
+    def update_cell_domain(self, cell):
+        """
+        Versión de `update_domain` que recibe el índice entero de la celda.
 
-                reduced_domain = self.reduce_sum_domain(domains_to_update, sum)  # Llama a reduce_sum_domain para obtener el dominio reducido
+        Las celdas ya resueltas de la jaula participan en el cálculo con su único valor, de modo que
+        la suma restante y la unicidad de dígitos se tienen en cuenta a la vez.
 
-                # Actualiza el dominio de las celdas
-                for cell1 in cells_to_update:  # Itera sobre las celdas a actualizar
-                    current_domain = self.vars_values[cell1][2]  # Obtiene el dominio actual de la celda
-                    self.vars_values[cell1][2] = current_domain & reduced_domain  # Actualiza el dominio con la intersección del dominio actual y el dominio reducido
-                    if len(cells_to_update) == 2:  # Si hay dos celdas en la jaula a actualizar
-                        self.match_sum_pair_domains(cells_to_update[0], cells_to_update[1], sum)  # Llama a match_sum_pair_domains para jaulas de dos celdas
+        Args:
+            cell (int): El índice de la celda (0-80).
+        """
+        unit_index = self.cell_cage[cell]  # Obtiene la restricción de jaula de la celda
+        if unit_index is None:
+            return
+
+        cage_cells = self.units[unit_index]  # Celdas de la jaula
+        domains = self.board.domains
+        # Consulta los dígitos que participan en alguna combinación válida de la jaula, celda por celda
+        support = cage_support(tuple(domains[cell1] for cell1 in cage_cells), self.cage_sums[cell])
+
+        # Actualiza el dominio de cada celda con la intersección del dominio actual y los dígitos soportados
+        for cell1, mask in zip(cage_cells, support):
+            self.board.intersect(cell1, mask)
 
     def match_sum_pair_domains(self, cell1, cell2, target_sum):
         """
@@ -315,29 +654,43 @@ class KillerSudokuSolver:
             cell2 (str): El nombre de la segunda celda (ej. "B1").
             target_sum (int): La suma objetivo para las dos celdas.
         """
+        self.match_sum_pair_masks(self.cell_index[cell1], self.cell_index[cell2], target_sum)
 
-        domain1 = self.vars_values[cell1][2]  # Obtiene el dominio de la primera celda
-        domain2 = self.vars_values[cell2][2]  # Obtiene el dominio de la segunda celda
+    def match_sum_pair_masks(self, cell1, cell2, target_sum):
+        """
+        Versión de `match_sum_pair_domains` que trabaja con índices de celda y máscaras.
 
-        # Encuentra impostores en domain1
-        impostors1 = set()  # Inicializa un conjunto para almacenar los impostores de la primera celda
-        for num1 in domain1:  # Itera sobre cada valor en el dominio de la primera celda
-            if not any(num1 != num2 and num1 + num2 == target_sum for num2 in domain2):  # Si no hay ningún valor en el dominio de la segunda celda que pueda sumar con num1 para alcanzar la suma objetivo
-                impostors1.add(num1)  # Agrega num1 a los impostores de la primera celda
+        Un dígito d de una celda sobrevive solo si (target_sum - d) es un dígito distinto de d
+        presente en el dominio de la otra celda.
 
-        # Encuentra impostores en domain2
-        impostors2 = set()  # Inicializa un conjunto para almacenar los impostores de la segunda celda
-        for num2 in domain2:  # Itera sobre cada valor en el dominio de la segunda celda
-            if not any(num1 != num2 and num1 + num2 == target_sum for num1 in domain1):  # Si no hay ningún valor en el dominio de la primera celda que pueda sumar con num2 para alcanzar la suma objetivo
-                impostors2.add(num2)  # Agrega num2 a los impostores de la segunda celda
+        Args:
+            cell1 (int): El índice de la primera celda.
+            cell2 (int): El índice de la segunda celda.
+            target_sum (int): La suma objetivo para las dos celdas.
+        """
+        domain1 = self.board.domains[cell1]
+        domain2 = self.board.domains[cell2]
+        self.board.intersect(cell1, self.pair_partners(domain2, target_sum))  # Descarta impostores de la primera celda
+        self.board.intersect(cell2, self.pair_partners(domain1, target_sum))  # Descarta impostores de la segunda celda
 
-        # Descarta impostores de ambos dominios
-        domain1.difference_update(impostors1)  # Elimina los impostores del dominio de la primera celda
-        domain2.difference_update(impostors2)  # Elimina los impostores del dominio de la segunda celda
+    @staticmethod
+    def pair_partners(mask, target_sum):
+        """
+        Calcula la máscara de dígitos que pueden sumar `target_sum` con algún dígito distinto de `mask`.
 
-        # Actualiza los dominios en self.vars_values
-        self.vars_values[cell1][2] = domain1  # Actualiza el dominio de la primera celda en el diccionario vars_values
-        self.vars_values[cell2][2] = domain2  # Actualiza el dominio de la segunda celda en el diccionario vars_values
+        Args:
+            mask (int): El dominio de la otra celda.
+            target_sum (int): La suma objetivo del par.
+
+        Returns:
+            int: La máscara de dígitos compañeros válidos.
+        """
+        partners = 0
+        for digit in MASK_DIGITS[mask]:
+            partner = target_sum - digit
+            if 1 <= partner <= 9 and partner != digit:
+                partners |= BIT[partner]
+        return partners
 
     def reduce_sum_domain(self, sets, target_sum):
         """
@@ -347,12 +700,12 @@ class KillerSudokuSolver:
         Toma una lista de conjuntos (`sets`), donde cada conjunto representa el dominio de una celda en la jaula,
         y un valor objetivo (`target_sum`).
 
-        El método genera todas las combinaciones posibles de números de los conjuntos de entrada y selecciona
-        aquellas combinaciones que cumplen las siguientes condiciones:
+        Un número de un conjunto es utilizable si existe una combinación, tomando un número de cada uno
+        de los otros conjuntos, que cumple las siguientes condiciones:
         - La suma de los números en la combinación es igual a `target_sum`.
         - Todos los números en la combinación son únicos (no hay repeticiones).
 
-        Luego, devuelve un conjunto que contiene todos los números que forman parte de al menos una combinación válida.
+        Luego, devuelve un conjunto que contiene todos los números utilizables.
 
         Args:
             sets (list): Una lista de conjuntos, donde cada conjunto contiene números.
@@ -361,37 +714,26 @@ class KillerSudokuSolver:
         Returns:
             set: Un conjunto que contiene los números de los conjuntos de entrada que pueden formar la suma objetivo.
         """
+        return digits_from_mask(self.reduce_sum_masks([mask_from_digits(s) for s in sets], target_sum))
 
-        result = set()  # Inicializa un conjunto vacío para almacenar los resultados
-
-        # Genera todas las combinaciones posibles de números de los conjuntos
-        for combination in itertools.product(*sets):  # Itera sobre todas las combinaciones posibles de números de los conjuntos de entrada utilizando itertools.product
-            # Verifica si la combinación tiene números distintos y suma la suma objetivo
-            if len(set(combination)) == len(combination) and sum(combination) == target_sum:  # Si la combinación tiene números distintos (sin repeticiones) y la suma de los números es igual a target_sum
-                result.update(combination)  # Agrega los números de la combinación válida al conjunto de resultados
-
-        # Descarta números inutilizables
-        discard_sets = [set() for _ in range(len(sets))]  # Crea una lista de conjuntos vacíos para almacenar los números a descartar de cada conjunto de entrada
+    def reduce_sum_masks(self, masks, target_sum):
+        """
+        Versión de `reduce_sum_domain` que trabaja con máscaras de bits.
 
-        for i, current_set in enumerate(sets):  # Itera sobre cada conjunto de entrada y su índice
-            for num in current_set:  # Itera sobre cada número en el conjunto actual
-                is_usable = False  # Inicializa una bandera para indicar si el número es utilizable
-                # Itera a través de combinaciones de otros conjuntos para verificar la usabilidad
-                for other_combination in itertools.product(*[s for j, s in enumerate(sets) if j != i]):  # Itera sobre las combinaciones de números de los otros conjuntos (excluyendo el conjunto actual)
-                    combined = (num,) + other_combination  # Crea una combinación que incluye el número actual y la combinación de los otros conjuntos
-                    # Verifica si los números combinados son distintos y suman la suma objetivo
-                    if len(set(combined)) == len(combined) and sum(combined) == target_sum:  # Si la combinación tiene números distintos y la suma de los números es igual a target_sum
-                        is_usable = True  # Marca el número como utilizable
-                        break  # Sale del bucle interno, ya que se ha encontrado una combinación válida que usa el número actual
-                if not is_usable:  # Si el número no es utilizable
-                    discard_sets[i].add(num)  # Agrega el número al conjunto de números a descartar del conjunto actual
+        En lugar de enumerar el producto de los dominios, filtra las combinaciones precalculadas
+        de la jaula (ver `cage_table.cage_support`).
 
-        # Resultado final: unión de todos los conjuntos menos los números descartados
-        final_result = set()  # Inicializa un conjunto vacío para almacenar el resultado final
-        for i, current_set in enumerate(sets):  # Itera sobre cada conjunto de entrada y su índice
-            final_result.update(current_set.difference(discard_sets[i]))  # Agrega los números del conjunto actual que no están en el conjunto de números a descartar al resultado final
+        Args:
+            masks (list): Las máscaras de los dominios de las celdas.
+            target_sum (int): La suma objetivo.
 
-        return final_result  # Devuelve el resultado final
+        Returns:
+            int: La máscara con los números utilizables de los dominios de entrada.
+        """
+        result = 0  # Máscara de números utilizables
+        for mask in cage_support(tuple(masks), target_sum):  # Dígitos soportados por cada dominio
+            result |= mask
+        return result
 
     def extract_domains_outsiders(self, length, value):
         """
@@ -410,21 +752,15 @@ class KillerSudokuSolver:
             set: Un conjunto que contiene todos los dígitos posibles que pueden
                   formar la secuencia con la longitud y suma especificadas.
         """
-        possible_digits = set()
-
-        # Genera todas las combinaciones con reemplazo
-        for combination in itertools.combinations_with_replacement(range(1, 10), length):
-            if sum(combination) == value:
-                possible_digits.update(combination)  # Agrega dígitos únicos al conjunto
-
-        return possible_digits
+        return digits_from_mask(outsider_mask(length, value))  # Consulta la tabla memorizada de `cage_table`
 
+    @profiled("outsiders")
     def outsiders(self):
         """
         Aplica la técnica de "outsiders" al Sudoku Killer.
 
         Esta técnica se enfoca en jaulas que se extienden a través de múltiples bloques 3x3.
-        Analiza las restricciones de adyacencia definidas en `adjacent_constraints` para
+        Analiza las regiones de adyacencia (ver `geometry.adjacent_regions`) para
         identificar posibles valores en celdas fuera de la región principal de la jaula
         que podrían influir en la suma total de la jaula.
 
@@ -438,47 +774,17 @@ class KillerSudokuSolver:
         """
         changes_made = False  # Inicializa una variable para rastrear si se realizaron cambios
 
-        # Itera sobre las restricciones de adyacencia por número de bloques adyacentes
-        for num_adjacent, constraints in self.adjacent_constraints.items():
-            for constraint in constraints:  # Itera sobre cada restricción en la lista
-                ids_in_constraint = []  # Lista para almacenar los IDs de jaula en la restricción
-                cells_in_constraint = set()  # Conjunto para almacenar las celdas en la restricción
-                cages_sum = 0  # Variable para acumular la suma de las jaulas en la restricción
-
-                # Recopila información sobre las jaulas en la restricción
-                for cell in constraint:
-                    if self.vars_values[cell][0] not in ids_in_constraint:
-                        ids_in_constraint.append(self.vars_values[cell][0])  # Agrega el ID de jaula si no está presente
-                        cages_sum = cages_sum + self.vars_values[cell][1]  # Acumula la suma de la jaula
-
-                # Encuentra todas las celdas que pertenecen a las jaulas en la restricción
-                for j in range(27, len(self.restricciones)):
-                    for id in ids_in_constraint:
-                        for cell in self.restricciones[j]:
-                            if id == self.vars_values[cell][0]:
-                                cells_in_constraint.add(cell)  # Agrega la celda al conjunto
-
-                # Excluye las celdas que ya están en la restricción original
-                cells_in_constraint = cells_in_constraint.difference(constraint)
-                if len(cells_in_constraint) > 4:
-                    continue  # Salta la restricción si involucra más de 4 celdas externas
-
-                # Calcula el dominio de las celdas externas utilizando la función extract_domains_outsiders
-                domain = self.extract_domains_outsiders(len(cells_in_constraint), cages_sum - 45 * num_adjacent)
-
-                # Si se encuentra un dominio válido, actualiza los dominios de las celdas externas
-                if domain != set():
-                    for cell in cells_in_constraint:
-                        self.vars_values[cell][2] = self.vars_values[cell][2].intersection(set(domain))
-                        changes_made = True  # Marca que se realizaron cambios en el tablero
-
-                ids_in_constraint = []
-                cells_in_constraint = set()
-                cages_sum = 0
+        # Las reducciones solo dependen de las jaulas, así que se precalculan al cargar el tablero
+        # (ver `index_outsiders`): cada una es un par (celdas externas, dominio permitido).
+        for cells_outside, domain in self.outsider_rules:
+            for cell in cells_outside:
+                if self.board.intersect(cell, domain):
+                    changes_made = True  # Marca que se realizaron cambios en el tablero
 
         return changes_made  # Devuelve True si se realizaron cambios, False en caso contrario
 
-    def hidden_singles(self):
+    @profiled("hidden_singles")
+    def hidden_singles(self, units=None):
         """
         Aplica la estrategia de "Hidden Singles" (Singles Ocultos) al Sudoku Killer.
 
@@ -486,9 +792,12 @@ class KillerSudokuSolver:
         donde un valor candidato solo puede aparecer en una única celda. Si se encuentra
         tal valor, se convierte en el único valor posible para esa celda (un "Hidden Single").
 
-        La estrategia funciona examinando cada restricción y cada valor candidato (1-9).
-        Si un valor candidato solo aparece una vez en el dominio de las celdas dentro
-        de esa restricción, entonces ese valor debe ser asignado a esa celda.
+        Para cada restricción se acumulan dos máscaras: los dígitos vistos al menos una vez
+        y los vistos al menos dos veces. Los dígitos vistos exactamente una vez son hidden singles.
+
+        Args:
+            units (iterable, optional): Índices de las restricciones a revisar. Si es None,
+                                        se revisan todas las filas, columnas y bloques.
 
         Returns:
             bool: True si se realizaron cambios en el tablero (dominios de celdas),
@@ -496,95 +805,69 @@ class KillerSudokuSolver:
         """
 
         changes_made = False  # Inicializa una variable para rastrear si se realizaron cambios
+        domains = self.board.domains
 
         # Itera sobre las restricciones (filas, columnas, bloques 3x3)
-        for constraint in self.restricciones[:27]:  # Solo considera las primeras 27 restricciones (filas, columnas, bloques)
-            # Obtiene los dominios de las celdas en la restricción actual
-            constraint_domains = [self.vars_values[cell][2] for cell in constraint if self.vars_values[cell]]
-
-            # Busca Hidden Singles para cada dígito (1-9)
-            for digit in range(1, 10):
-                count = 0  # Contador para la cantidad de veces que aparece el dígito en la restricción
-                cell_with_digit = None  # Variable para almacenar la celda que contiene el dígito
-
-                # Itera sobre las celdas en la restricción
-                for cell in constraint:
-                    if self.vars_values[cell] and digit in self.vars_values[cell][2]:
-                        count += 1  # Incrementa el contador si el dígito está en el dominio de la celda
-                        cell_with_digit = cell  # Guarda la celda que contiene el dígito
-
-                # Si el dígito aparece solo una vez en la restricción
-                if count == 1 and cell_with_digit:
-                    # print(f"Hidden single found: Cell {cell_with_digit} must be {digit}")  # (Opcional) Imprime un mensaje para indicar que se encontró un Hidden Single
-                    self.vars_values[cell_with_digit][2] = {digit}  # Actualiza el dominio de la celda para contener solo el dígito
-                    changes_made = True  # Marca que se realizaron cambios en el tablero
+        for unit_index in range(27) if units is None else units:
+            if unit_index >= 27:
+                continue  # Solo considera las primeras 27 restricciones (filas, columnas, bloques)
+            unit = self.units[unit_index]
+            seen_once = 0  # Dígitos que aparecen al menos una vez en la restricción
+            seen_twice = 0  # Dígitos que aparecen al menos dos veces en la restricción
+            for cell in unit:
+                mask = domains[cell]
+                seen_twice |= seen_once & mask
+                seen_once |= mask
+
+            # Busca Hidden Singles para cada dígito que aparece solo una vez en la restricción
+            for digit in MASK_DIGITS[seen_once & ~seen_twice]:
+                bit = BIT[digit]
+                for cell in unit:
+                    if domains[cell] & bit:  # La única celda que contiene el dígito
+                        if self.board.set(cell, bit):  # Actualiza el dominio de la celda para contener solo el dígito
+                            changes_made = True  # Marca que se realizaron cambios en el tablero
+                        break
 
         return changes_made  # Devuelve True si se realizaron cambios, False en caso contrario
 
-    def pointing_pairs(self):
-        # Iterar por cada bloque 3x3
-        # range(0, 9, 3), itera de 0 a 8 de 3 en 3
+    @profiled("pointing_pairs")
+    def pointing_pairs(self, units=None):
+        # Iterar por cada bloque 3x3 (restricciones 18 a 26), o solo por los bloques de `units`
         changesMade = False  # Inicializa una bandera para rastrear si se hicieron cambios
-
-        for block_start_row in range(0, 9, 3):
-            for block_start_col in range(0, 9, 3):
-                # Crear las celdas para el bloque actual
-                # chr(65 + col) crea el id alfabético (A, B, C...) de la columna en conjunto con el id para fila, creando identificador de celda (ej: A1)
-                block_cells = [
-                    f"{chr(65 + col)}{row + 1}"
-                    for row in range(block_start_row, block_start_row + 3)
-                    for col in range(block_start_col, block_start_col + 3)
-                ]
-                # Objeto para posicionar y contar las coincidencias de dominios en una misma fila o columna
-                # ej: {1: ["A2", "A3"], 2: []... hasta 9}
-                candidates = {num: [] for num in range(1, 10)}
-
-                # Obtener las celdas y dominios del bloque
-                for cell in block_cells:
-                    if cell in self.vars_values:
-                        domain = self.vars_values[cell][2]
-                        for num in domain:
-                            # Se recorren los dominios de cada celda y se agrega el id de la celda al candidato coincidente con num
-                            candidates[num].append(cell)
-
-                # Recorrer candidatos en busca de pointing pairs
-                for num, cells in candidates.items():
-                    # El bloque debe de tener dos coincidencias para aplicar pointing pairs
-                    # Existe la posibilidad de que en esta sección de código se pueda aplicar también triples, añadiendo: len(cells) == 3. (Debe de ser testeado y comparar con la solución de Juan)
-                    if len(cells) == 2:
-                        # rows mantiene un rastreo de las filas en donde se encuentra el candidato actual (num), únicamente guarda el id de row. (ej: 1)
-                        # cell[1] es el id de la fila
-                        rows = {cell[1] for cell in cells}
-                        # cols mantiene un rastreo de las columnas en donde se encuentra num, guarda el id alfabético asociado a las columnas coincidentes. (ej: B)
-                        # cell[0] es el carácter alfabético de la columna
-                        cols = {cell[0] for cell in cells}  # Columna de cada celda
-
-                        # Si solo existe un elemento en rows, significa que las coincidencias de num están en la misma fila, repartidos por la columna
-                        if len(rows) == 1:
-                            row = next(iter(rows))
-                            # Elimina los elementos coincidentes de las celdas, en la fila
-                            for col in "ABCDEFGHI":
-                                # Crea los ids de celdas en la misma fila
-                                cell = f"{col}{row}"
-                                # Comprueba que el id de la celda generada no pertenezca al bloque perteneciente a la celda que está siendo evaluada antes de eliminar el candidato
-                                if cell not in cells and cell in self.vars_values:
-                                    self.vars_values[cell][2].discard(num)
-                                    changesMade = True
-                        # En caso de que exista solo una columna, significa que las coincidencias están en la misma columna, repartidos por la fila
-                        elif len(cols) == 1:
-                            col = next(iter(cols))
-                            for row in range(1, 10):
-                                # Recrea los ids de las celdas pertenecientes a la misma columna de la celda del bloque que está siendo evaluada
-                                cell = f"{col}{row}"
-                                # Comprueba que el id de la celda generado no pertenezca al bloque actual antes de eliminarlo
-                                if cell not in cells and cell in self.vars_values:
-                                    self.vars_values[cell][2].discard(num)
-                                    changesMade = True
+        domains = self.board.domains
+
+        for block_index in range(18, 27) if units is None else units:
+            if not 18 <= block_index < 27:
+                continue
+            block = self.units[block_index]
+            # Recorrer candidatos en busca de pointing pairs
+            for num in range(1, 10):
+                bit = BIT[num]
+                # Celdas del bloque que contienen el candidato num
+                cells = [cell for cell in block if domains[cell] & bit]
+                # El bloque debe de tener dos coincidencias para aplicar pointing pairs
+                if len(cells) != 2:
+                    continue
+                lines1 = self.cell_lines[cells[0]]  # [columna, fila] de la primera coincidencia
+                lines2 = self.cell_lines[cells[1]]  # [columna, fila] de la segunda coincidencia
+
+                # Si ambas coincidencias comparten fila o columna, num se elimina del resto de esa línea
+                if lines1[1] == lines2[1]:
+                    line = lines1[1]
+                elif lines1[0] == lines2[0]:
+                    line = lines1[0]
+                else:
+                    continue
+                for cell in self.units[line]:
+                    # Comprueba que la celda no sea una de las coincidencias antes de eliminar el candidato
+                    if cell not in cells and self.board.remove(cell, bit):
+                        changesMade = True
 
         return changesMade  # Devuelve la bandera para indicar si se hicieron cambios
 
 
-    def obvious_pairs(self):
+    @profiled("obvious_pairs")
+    def obvious_pairs(self, units=None):
         """
         Aplica la estrategia de "Obvious Pairs" (Pares Obvios) al Sudoku Killer.
 
@@ -596,125 +879,130 @@ class KillerSudokuSolver:
         candidatos pueden ser eliminados de los dominios de todas las demás celdas
         en la misma restricción.
 
+        Args:
+            units (iterable, optional): Índices de las restricciones a revisar. Si es None,
+                                        se revisan todas.
+
         Returns:
             bool: True si se realizaron cambios en el tablero (dominios de celdas),
                   False en caso contrario.
         """
 
         changes_made = False  # Inicializa una variable para rastrear si se realizaron cambios
+        domains = self.board.domains
 
-        for constraint in self.restricciones:  # Itera sobre las restricciones (filas, columnas, bloques, jaulas)
-            pairs = {}  # Diccionario para almacenar los pares de candidatos y las celdas que los contienen
+        for unit_index in range(len(self.units)) if units is None else units:  # Itera sobre las restricciones (filas, columnas, bloques, jaulas)
+            unit = self.units[unit_index]
+            pairs = {}  # Diccionario de máscara de dos candidatos -> celdas que la contienen
 
-            for cell in constraint:  # Itera sobre las celdas en la restricción actual
-                if self.vars_values[cell] and len(self.vars_values[cell][2]) == 2:  # Si la celda tiene un dominio de tamaño 2
-                    pair_values = tuple(sorted(list(self.vars_values[cell][2])))  # Obtiene los dos candidatos de la celda, ordenados
-                    if pair_values in pairs:  # Si este par de candidatos ya está en el diccionario
-                        pairs[pair_values].append(cell)  # Agrega la celda a la lista de celdas que contienen este par
-                    else:
-                        pairs[pair_values] = [cell]  # Crea una nueva entrada en el diccionario para este par de candidatos
+            for cell in unit:  # Itera sobre las celdas en la restricción actual
+                mask = domains[cell]
+                if POPCOUNT[mask] == 2:  # Si la celda tiene un dominio de tamaño 2
+                    pairs.setdefault(mask, []).append(cell)
 
-            for pair_values, cells in pairs.items():  # Itera sobre los pares de candidatos y las celdas que los contienen
+            for pair_mask, cells in pairs.items():  # Itera sobre los pares de candidatos y las celdas que los contienen
                 if len(cells) == 2:  # Si hay dos celdas con el mismo par de candidatos
-                    #print(f"Obvious pair found: Cells {cells[0]} and {cells[1]} must be {pair_values[0]} and {pair_values[1]}")  # (Opcional) Imprime un mensaje para indicar que se encontró un Obvious Pair
-                    for cell in constraint:  # Itera sobre las celdas en la restricción actual
-                        if cell not in cells and self.vars_values[cell]:  # Si la celda no es una de las celdas del par y tiene un dominio
-                            if pair_values[0] in self.vars_values[cell][2] or pair_values[1] in self.vars_values[cell][2]:  # Si alguno de los candidatos del par está en el dominio de la celda
-                                self.vars_values[cell][2].discard(pair_values[0])  # Elimina el primer candidato del dominio de la celda
-                                self.vars_values[cell][2].discard(pair_values[1])  # Elimina el segundo candidato del dominio de la celda
-                                changes_made = True  # Marca que se realizaron cambios en el tablero
+                    for cell in unit:  # Elimina ambos candidatos de las demás celdas de la restricción
+                        if cell not in cells and self.board.remove(cell, pair_mask):
+                            changes_made = True  # Marca que se realizaron cambios en el tablero
 
         return changes_made  # Devuelve True si se realizaron cambios, False en caso contrario
 
-    def obvious_triples(self):
+    @profiled("obvious_triples")
+    def obvious_triples(self, units=None):
         """
         Aplica la estrategia de Triples Obvios al rompecabezas de Sudoku.
-        Identifica celdas con solo tres valores posibles en su dominio, y
-        si esos tres valores son los mismos en tres celdas en la misma restricción,
-        los elimina del dominio de otras celdas en esa restricción.
+        Identifica tres celdas de una misma restricción, cada una con dos o tres valores posibles,
+        cuyos dominios juntos solo tienen tres valores, y elimina esos valores del dominio de
+        las otras celdas de esa restricción.
+
+        Args:
+            units (iterable, optional): Índices de las restricciones a revisar. Si es None,
+                                        se revisan todas.
 
         Actualizaciones:
-            self.vars_values: Actualiza el dominio de las celdas basado en la estrategia de Triples Obvios.
+            self.board: Actualiza el dominio de las celdas basado en la estrategia de Triples Obvios.
 
         Retorna:
             bool: True si se hicieron cambios en el tablero, False en caso contrario.
         """
 
         changes_made = False  # Inicializa una bandera para rastrear si se encontraron triples
-
-        for constraint in self.restricciones:  # Itera a través de cada restricción
-            # Encuentra todas las celdas en la restricción con un dominio de tamaño 3
-            cells_with_3_domain = [cell for cell in constraint if self.vars_values[cell] and len(self.vars_values[cell][2]) == 3]
-
-            if len(cells_with_3_domain) >= 3:
-                # Si hay al menos 3 celdas con un dominio de tamaño 3 en la restricción
-                for cell_group in itertools.combinations(cells_with_3_domain, 3):
-                    # Considera todas las combinaciones de 3 celdas
-                    if self.vars_values[cell_group[0]][2] == self.vars_values[cell_group[1]][2] == self.vars_values[cell_group[2]][2]:
-                        # Si los dominios de las 3 celdas son iguales
-                        triple_values = self.vars_values[cell_group[0]][2]  # Obtén los valores del triple
-
-                        # Elimina los valores del triple de otras celdas en la restricción
-                        for cell in constraint:
-                            if cell not in cell_group and self.vars_values[cell]:
-                                old_domain = set(self.vars_values[cell][2])  # Copia el dominio antes de cualquier cambio
-                                self.vars_values[cell][2] = self.vars_values[cell][2].difference(triple_values)  # Elimina los valores del triple
-                                if old_domain != self.vars_values[cell][2]:  # Verifica si el dominio realmente cambió
-                                    changes_made = True  # Establece la bandera a True si se hicieron cambios
+        domains = self.board.domains
+
+        for unit_index in range(len(self.units)) if units is None else units:  # Itera a través de cada restricción
+            unit = self.units[unit_index]
+            # Celdas con dos o tres candidatos: cualquier grupo de tres cuyos dominios juntos tengan
+            # solo tres valores es un triple, aunque alguna celda ya haya perdido uno de ellos
+            cells = [cell for cell in unit if 2 <= POPCOUNT[domains[cell]] <= 3]
+            for cell_group in combinations(cells, 3):
+                triple_mask = domains[cell_group[0]] | domains[cell_group[1]] | domains[cell_group[2]]
+                if POPCOUNT[triple_mask] != 3:
+                    continue
+                # Elimina los valores del triple de otras celdas en la restricción
+                for cell in unit:
+                    if cell not in cell_group and self.board.remove(cell, triple_mask):
+                        changes_made = True  # Establece la bandera a True si se hicieron cambios
 
         return changes_made  # Devuelve la bandera para indicar si se hicieron cambios
 
-    def pointing_triples(self):
+    @profiled("pointing_triples")
+    def pointing_triples(self, units=None):
         """
         Aplica la estrategia de "Pointing Triples" (Triples Apuntadores) al Sudoku Killer.
 
-        Esta estrategia busca trios de candidatos que aparecen únicamente dentro de un mismo
-        bloque 3x3 y en la misma fila o columna. Si se encuentra un trío de este tipo,
-        se puede eliminar de las demás celdas de esa fila o columna fuera del bloque.
+        Esta estrategia busca candidatos que, dentro de un bloque 3x3, solo aparecen en las celdas
+        de una misma fila o columna (la intersección, de tres celdas). Ese candidato se puede
+        eliminar de las demás celdas de esa fila o columna fuera del bloque, y viceversa.
+
+        La lógica es que si un candidato del bloque solo puede estar en la intersección, debe estar
+        en una de sus celdas (aunque alguna ya lo haya descartado). Por lo tanto, no puede estar en
+        ninguna otra celda de la misma fila o columna fuera del bloque.
 
-        La lógica es que si esos tres candidatos solo pueden estar en tres celdas dentro del
-        bloque, entonces al menos uno de ellos debe estar en una de esas tres celdas.
-        Por lo tanto, no pueden estar en ninguna otra celda de la misma fila o columna
-        fuera del bloque.
+        Args:
+            units (iterable, optional): Índices de las restricciones cuyas intersecciones se revisan.
+                                        Si es None, se revisan todas.
 
         Returns:
             bool: True si se realizaron cambios en el tablero (dominios de celdas),
                   False en caso contrario.
         """
-        initial_board = copy.deepcopy(self.vars_values)  # Crea una copia del tablero actual para comparar y detectar cambios.
         changes_made = False  # Inicializa una variable para rastrear si se realizaron cambios en el tablero.
-        for i in range(18, 27):  # Itera a través de las restricciones de bloque (índices 18 a 26 en la lista de restricciones, que representan los 9 bloques 3x3).
-            for j in range(0, 18):  # Itera a través de las restricciones de fila y columna (índices 0 a 17 en la lista de restricciones, que representan las 9 filas y 9 columnas).
-                cell_intersection = list(self.restricciones[i] & self.restricciones[j])  # Obtiene la intersección entre el bloque actual y la fila/columna actual, es decir, las celdas que pertenecen a ambos.
-                if len(cell_intersection) > 0:  # Si hay celdas en la intersección (es decir, celdas compartidas entre el bloque y la fila/columna).
-                    possible_nums = self.vars_values[cell_intersection[0]][2] & self.vars_values[cell_intersection[1]][2] & self.vars_values[cell_intersection[2]][2]  # Obtiene los números posibles (candidatos) que están presentes en el dominio de las tres primeras celdas de la intersección.
-                    cell_difference1 = self.restricciones[i] - self.restricciones[j]  # Obtiene las celdas que están en el bloque actual pero no en la fila/columna actual.
-                    cell_difference2 = self.restricciones[j] - self.restricciones[i]  # Obtiene las celdas que están en la fila/columna actual pero no en el bloque actual.
-
-                    difference1_domain = set()  # Inicializa un conjunto para almacenar los dominios de las celdas en cell_difference1.
-                    difference2_domain = set()  # Inicializa un conjunto para almacenar los dominios de las celdas en cell_difference2.
-
-                    for cell in cell_difference1:  # Itera sobre las celdas en cell_difference1 (celdas en el bloque pero no en la fila/columna).
-                        difference1_domain = difference1_domain | self.vars_values[cell][2]  # Agrega el dominio de la celda actual al conjunto difference1_domain.
+        domains = self.board.domains
 
-                    for cell in cell_difference2:  # Itera sobre las celdas en cell_difference2 (celdas en la fila/columna pero no en el bloque).
-                        difference2_domain = difference2_domain | self.vars_values[cell][2]  # Agrega el dominio de la celda actual al conjunto difference2_domain.
-
-                    for num in possible_nums:  # Itera sobre cada número posible (candidato) en la intersección.
-                        if num not in difference1_domain:  # Si el número posible no está en el dominio de las celdas en cell_difference1 (bloque - fila/columna).
-                            for cell in cell_difference2:  # Itera sobre las celdas en cell_difference2 (fila/columna - bloque).
-                                self.vars_values[cell][2].discard(num)  # Elimina el número posible (candidato) del dominio de la celda actual en cell_difference2.
-
-                        if num not in difference2_domain:  # Si el número posible no está en el dominio de las celdas en cell_difference2 (fila/columna - bloque).
-                            for cell in cell_difference1:  # Itera sobre las celdas en cell_difference1 (bloque - fila/columna).
-                                self.vars_values[cell][2].discard(num)  # Elimina el número posible (candidato) del dominio de la celda actual en cell_difference1.
-
-        final_board = copy.deepcopy(self.vars_values)  # Crea una copia del tablero después de aplicar la estrategia Pointing Triples.
-
-        if initial_board == final_board:  # Compara el tablero inicial con el tablero final.
-            return False  # Si no hay cambios, retorna False (no se realizaron cambios en el tablero).
+        if units is None:
+            box_lines = self.box_lines
         else:
-            return True  # Si hay cambios, retorna True (se realizaron cambios en el tablero).
+            box_lines = dict.fromkeys(box_line for unit_index in units if unit_index < 27 for box_line in self.unit_box_lines[unit_index])
+
+        # Itera sobre las intersecciones precalculadas entre bloques y filas/columnas.
+        for intersection, block_rest, line_rest in box_lines:
+            possible_nums = 0  # Números presentes en alguna celda de la intersección.
+            for cell in intersection:
+                possible_nums |= domains[cell]
+            if not possible_nums:
+                continue
+
+            block_domain = 0  # Unión de los dominios de las celdas del bloque fuera de la línea.
+            for cell in block_rest:
+                block_domain |= domains[cell]
+            line_domain = 0  # Unión de los dominios de las celdas de la línea fuera del bloque.
+            for cell in line_rest:
+                line_domain |= domains[cell]
+
+            # Los números que no aparecen en el resto del bloque se eliminan del resto de la línea, y viceversa.
+            remove_from_line = possible_nums & ~block_domain
+            remove_from_block = possible_nums & ~line_domain
+            if remove_from_line:
+                for cell in line_rest:
+                    if self.board.remove(cell, remove_from_line):
+                        changes_made = True
+            if remove_from_block:
+                for cell in block_rest:
+                    if self.board.remove(cell, remove_from_block):
+                        changes_made = True
+
+        return changes_made
 
     def apply_rules(self, log=False):  # Agrega el parámetro 'log' con valor predeterminado False
         """
@@ -736,7 +1024,7 @@ class KillerSudokuSolver:
             bool: True si se realizaron cambios en el tablero (dominios de celdas),
                   False en caso contrario.
         """
-        initial_board = copy.deepcopy(self.vars_values)  # Crea una copia del tablero inicial para comparar cambios.
+        initial_changes = self.board.changes  # Contador de cambios antes de aplicar las estrategias.
         self.obvious_singles()  # Aplica la regla de "singles obvios".
         if self.obvious_triples():  # Si se aplicó la regla de "triples obvios"...
             if log: print("Se aplicó la estrategia obvious triples")  # Imprime si log es True
@@ -754,88 +1042,454 @@ class KillerSudokuSolver:
             if log: print("Se aplicó la estrategia hidden singles")  # Imprime si log es True
             self.obvious_singles()  # ...vuelve a aplicar la regla de "singles obvios".
 
-        if initial_board == self.vars_values:  # Compara el tablero actual con el tablero inicial.
-            return False  # Si no hay cambios, retorna False (no se realizaron cambios en el tablero).
+        return self.board.changes != initial_changes  # True si algún dominio cambió.
+
+    def propagate(self, mark=None, log=False):
+        """
+        Propaga las restricciones con una cola de trabajo guiada por las celdas modificadas.
+
+        En lugar de repetir todas las estrategias sobre todas las restricciones hasta que no haya
+        cambios (como `apply_rules`), se leen las celdas que cambiaron en el registro de deshacer
+        del tablero (`board.trail`) y solo se revisan las restricciones que las contienen:
+        - Si una celda modificada quedó con un único valor, ese valor se elimina de sus vecinas
+          (`cell_peers`), igual que en "singles obvios".
+        - Cada restricción de la celda (`cell_units`) entra en la cola una sola vez. Al procesarla se
+          reduce su jaula, y se aplican hidden singles, pares y triples obvios, pointing triples y
+          pointing pairs limitados a esa restricción.
+
+        Los cambios que producen las estrategias vuelven al registro y, por lo tanto, a la cola,
+        hasta que no queda nada pendiente. El trabajo de cada estrategia se suma a `strategy_stats`.
+
+        Si `pass_budget` no es None, cada restricción procesada lo descuenta; al agotarse la propagación
+        se detiene (los dominios quedan reducidos, aunque no del todo) y `timed_out` pasa a True.
+
+        Args:
+            mark (int, optional): Posición del registro a partir de la cual leer las celdas modificadas
+                                  (ver `BitBoard.mark`). Si es None, se encolan todas las restricciones.
+            log (bool, optional): Si es True, imprime qué estrategias produjeron cambios. Defaults to False.
+
+        Returns:
+            bool: False si algún dominio quedó vacío (contradicción), True en caso contrario.
+        """
+        board = self.board
+        domains = board.domains
+        trail = board.trail
+        queued = bytearray(len(self.units))  # Marca de las restricciones que ya están en la cola
+        queue = deque()
+        used = set()  # Nombres de las estrategias que produjeron cambios
+
+        if mark is None:
+            if not all(domains):
+                return False  # Ya hay un dominio vacío
+            queue.extend(range(len(self.units)))
+            queued = bytearray(b"\x01") * len(self.units)
+            position = len(trail)
+            for cell, mask in enumerate(domains):  # Elimina de sus vecinas los valores ya resueltos
+                if not mask & (mask - 1):
+                    for peer in self.cell_peers[cell]:
+                        board.remove(peer, mask)
         else:
-            return True  # Si hay cambios, retorna True (se realizaron cambios en el tablero).
+            position = mark
+
+        # Estrategias por restricción: (función sin decorar, nombre, solo filas/columnas/bloques).
+        # Las estadísticas se acumulan aquí directamente, sin el costo del decorador en cada llamada.
+        cls = type(self)
+        steps = (
+            (cls.hidden_singles.__wrapped__, "hidden_singles", False),
+            (cls.obvious_pairs.__wrapped__, "obvious_pairs", False),
+            (cls.obvious_triples.__wrapped__, "obvious_triples", False),
+            (cls.pointing_triples.__wrapped__, "pointing_triples", True),
+            (cls.pointing_pairs.__wrapped__, "pointing_pairs", True),
+        )
+        # Estadísticas de esta llamada por paso (0 = "obvious_singles", luego los de `steps`):
+        # [eliminados, fijadas, llamadas útiles, tiempo medido, llamadas medidas]. Para que sean baratas,
+        # los contadores del tablero se comparan en cada paso, pero el tiempo solo se mide en una de
+        # cada 8 iteraciones y luego se extrapola a todas las llamadas.
+        profile = self.strategy_stats is not None
+        totals = [[0, 0, 0, 0.0, 0] for _ in range(len(steps) + 1)]
+        last = [None, board.eliminated, board.fixed]  # Instante (None si no se mide) y contadores del último registro
+        clock = time.perf_counter
+        iterations = pops = grid_pops = 0
+        budget = self.pass_budget
+
+        def account(step):
+            # Atribuye al paso `step` el trabajo hecho desde el último registro
+            total = totals[step]
+            eliminated = board.eliminated
+            if eliminated != last[1]:
+                fixed = board.fixed
+                total[0] += eliminated - last[1]
+                total[1] += fixed - last[2]
+                total[2] += 1
+                last[1], last[2] = eliminated, fixed
+            if last[0] is not None:
+                now = clock()
+                total[3] += now - last[0]
+                total[4] += 1
+                last[0] = now
+
+        try:
+            while True:
+                if profile:
+                    iterations += 1
+                    last[0] = None if iterations & 7 else clock()
+
+                # Lee las celdas modificadas desde la última lectura del registro. Este trabajo y la
+                # reducción de jaulas se registran como "obvious_singles", igual que en `apply_rules`.
+                while position < len(trail):
+                    cell = trail[position] & 0x7F
+                    position += 1
+                    mask = domains[cell]
+                    if not mask:
+                        if profile:
+                            account(0)
+                        return False  # Dominio vacío: contradicción
+                    if not mask & (mask - 1):  # La celda tiene un único valor: lo elimina de sus vecinas
+                        for peer in self.cell_peers[cell]:
+                            board.remove(peer, mask)
+                    for unit_index in self.cell_units[cell]:
+                        if not queued[unit_index]:
+                            queued[unit_index] = 1
+                            queue.append(unit_index)
+
+                if not queue:
+                    if profile:
+                        account(0)
+                    break
+                if budget is not None:
+                    budget -= 1
+                    if budget < 0:  # Presupuesto agotado: los dominios quedan reducidos, pero sin terminar
+                        self.timed_out = True
+                        break
+                unit_index = queue.popleft()
+                queued[unit_index] = 0
+                units = (unit_index,)
+                grid_unit = unit_index < 27
+
+                # Aplica las estrategias limitadas a la restricción, de la más barata a la más costosa
+                if not grid_unit:
+                    self.update_cell_domain(self.units[unit_index][0])
+                if profile:
+                    pops += 1
+                    grid_pops += grid_unit
+                    if last[0] is not None or board.eliminated != last[1]:
+                        account(0)
+                for step, (strategy, name, grid_only) in enumerate(steps, start=1):
+                    if grid_only and not grid_unit:
+                        continue
+                    if strategy(self, units):
+                        used.add(name)
+                    if profile and (last[0] is not None or board.eliminated != last[1]):
+                        account(step)
+        finally:
+            if budget is not None:
+                self.pass_budget = max(budget, 0)
+            if profile:
+                counters = self.strategy_stats.counters
+                for step, name in enumerate(("obvious_singles",) + tuple(step[1] for step in steps)):
+                    calls = iterations if step == 0 else grid_pops if steps[step - 1][2] else pops
+                    eliminated, fixed, productive, measured_time, measured_calls = totals[step]
+                    counter = counters[name]
+                    counter[0] += calls
+                    if measured_calls:
+                        counter[1] += measured_time * calls / measured_calls
+                    counter[2] += eliminated
+                    counter[3] += fixed
+                    counter[4] += productive
+
+        if log:
+            for name in sorted(used):
+                print(f"Se aplicó la estrategia {name.replace('_', ' ')}")
+        return True
 
-    def solver(self, log=False):
+    def solver(self, log=False, time_limit=None, node_limit=None, pass_limit=None):
         """
-        Resuelve el Sudoku Killer utilizando una combinación de estrategias y backtracking.
+        Resuelve el Sudoku Killer utilizando una combinación de estrategias y búsqueda en profundidad.
 
         Este método primero aplica las estrategias outsiders y las reglas del Sudoku (obvious singles,
         hidden singles, pointing pairs, obvious pairs) para reducir el dominio de las variables.
-        Si el Sudoku no se resuelve con estas estrategias, utiliza un enfoque de backtracking para explorar
-        diferentes combinaciones de valores para las celdas seleccionadas.
+        Si el Sudoku no se resuelve con estas estrategias, utiliza una búsqueda en profundidad (`search`)
+        que ramifica sobre la celda más restringida y propaga las reglas en cada nodo.
+
+        Al terminar, `search_stats` contiene la cantidad de nodos explorados, de retrocesos
+        y el tiempo total empleado en segundos, y `strategy_stats` las llamadas, el tiempo, los
+        candidatos eliminados y las celdas fijadas por cada estrategia (ver `stats.StrategyStats`).
+
+        Los límites se comprueban dentro de la búsqueda (el de nodos en cada nodo, el de tiempo cada 16)
+        y de la propagación (el de pasadas, en cada restricción procesada). Si alguno se agota, la
+        búsqueda se abandona y el tablero queda con los dominios reducidos por la propagación de la
+        raíz, que siguen siendo válidos para cualquier solución. En `search_stats`, "status" indica
+        cómo terminó ("solved", "unsolved", "timeout" o "cancelled"), "fixed" cuántas celdas quedaron con
+        un único valor y "passes" cuántas restricciones procesó la propagación.
 
         Args:
             log (bool, optional): Si es True, imprime información sobre las asignaciones de valores durante
-                                  el proceso de backtracking. Defaults to False.
+                                  la búsqueda. Defaults to False.
+            time_limit (float, optional): Tiempo máximo en segundos. Defaults to None (sin límite).
+            node_limit (int, optional): Nodos de búsqueda máximos. Defaults to None (sin límite).
+            pass_limit (int, optional): Restricciones que la propagación puede procesar en total (ver
+                                        `propagate`). Defaults to None (sin límite).
+
+        Returns:
+            bool: True si se encuentra una solución, False en caso contrario (incluso si se agotó un límite).
+        """
+        start_time = self.start_search(time_limit, node_limit, pass_limit)
+
+        try:
+            # Aplica la técnica de 'outsiders' para reducir los dominios de las celdas.
+            self.outsiders()
+            if log:
+                print("Se aplicó la estrategia outsiders")
+            # Propaga las reglas del Sudoku (obvious singles, hidden singles, pointing pairs, obvious pairs)
+            # sobre todas las restricciones hasta que no haya más cambios, y luego busca si hace falta.
+            solved = self.propagate(log=log) and self.search(log)
+        finally:
+            self.end_limits(pass_limit)
+
+        self.finish_stats(solved)
+        self.search_stats["time"] = time.perf_counter() - start_time
+        if log:
+            print(f"Nodos explorados: {self.search_stats['nodes']}, tiempo: {self.search_stats['time']:.4f} s")
+            if self.strategy_stats is not None:
+                print(self.strategy_stats)
+        return solved
+
+    def start_search(self, time_limit=None, node_limit=None, pass_limit=None, **extra_stats):
+        """
+        Prepara una búsqueda de `solver`, `count_solutions` o `parallel_search.solve_parallel`: vacía
+        `search_stats` (con las claves de `extra_stats` además de las comunes) y `strategy_stats`,
+        quita la cancelación y prepara los límites (ver `start_limits`).
+
+        Returns:
+            float: El instante de inicio, para calcular `search_stats["time"]` al terminar.
+        """
+        start_time = time.perf_counter()
+        self.search_stats = {"nodes": 0, "backtracks": 0, "time": 0.0, **extra_stats}
+        if self.strategy_stats is not None:
+            self.strategy_stats.reset()
+        self.cancelled = False
+        self.start_limits(start_time, time_limit, node_limit, pass_limit)
+        return start_time
+
+    def start_limits(self, start_time, time_limit, node_limit, pass_limit):
+        """Prepara los límites de `solver` y `count_solutions`: `limits` para la búsqueda y `pass_budget` para la propagación."""
+        self.timed_out = False
+        if time_limit is not None or node_limit is not None:
+            self.limits = (start_time + time_limit if time_limit is not None else None, node_limit)
+        self.pass_budget = pass_limit
+
+    def end_limits(self, pass_limit):
+        """Quita los límites y anota en `search_stats` las restricciones que procesó la propagación ("passes")."""
+        self.limits = None
+        if pass_limit is not None:
+            self.search_stats["passes"] = pass_limit - self.pass_budget
+        self.pass_budget = None
+
+    def finish_stats(self, solved):
+        """Anota en `search_stats` cómo terminó la búsqueda ("status") y cuántas celdas quedaron fijas ("fixed")."""
+        if solved:
+            status = "solved"
+        elif self.timed_out:
+            status = "timeout"
+        elif self.cancelled:
+            status = "cancelled"
+        else:
+            status = "unsolved"
+        self.search_stats["status"] = status
+        self.search_stats["fixed"] = sum(1 for mask in self.board.domains if is_single(mask))
+
+    def limit_reached(self):
+        """
+        Comprueba los límites de `limits` antes de explorar un nodo: el de nodos en cada nodo y el de
+        tiempo cada 16. Al agotarse alguno, `timed_out` pasa a True.
+
+        Returns:
+            bool: True si se agotó algún límite (aquí o antes).
+        """
+        if self.limits is not None and not self.timed_out:
+            deadline, node_limit = self.limits
+            nodes = self.search_stats["nodes"]
+            if (node_limit is not None and nodes >= node_limit) or (
+                    deadline is not None and not nodes & 15 and time.perf_counter() > deadline):
+                self.timed_out = True
+        return self.timed_out
+
+    def choose_cell(self):
+        """
+        Elige la celda sobre la que ramificar la búsqueda (heurística MRV).
+
+        Se elige la celda sin resolver con menos valores posibles en su dominio. Los empates se
+        resuelven a favor de la celda cuya jaula es más pequeña, ya que su suma la restringe más.
+
+        Returns:
+            int: El índice de la celda elegida, o None si todas las celdas están resueltas.
+        """
+        domains = self.board.domains
+        best = None
+        best_key = None
+        for cell, mask in enumerate(domains):
+            size = POPCOUNT[mask]
+            if size < 2:
+                continue  # Celda resuelta
+            unit_index = self.cell_cage[cell]
+            key = (size, len(self.units[unit_index]) if unit_index is not None else 10)
+            if best_key is None or key < best_key:
+                best, best_key = cell, key
+                if key == (2, 1):
+                    break  # No existe una elección mejor
+        return best
+
+    def search(self, log=False):
+        """
+        Búsqueda en profundidad con propagación en cada nodo.
+
+        Elige la celda más restringida (`choose_cell`) y prueba cada valor de su dominio. Después de
+        cada asignación se propagan las reglas solo desde las celdas modificadas (`propagate`); si no
+        hay contradicción se continúa recursivamente. Para retroceder se deshacen los cambios de la
+        rama con el registro del tablero (`BitBoard.undo`), sin copiar el tablero. Si `stop_event`
+        se activa, la búsqueda se abandona, `cancelled` queda en True y se devuelve False; lo mismo
+        con `timed_out` si se agota alguno de los límites de `solver`.
+
+        Args:
+            log (bool, optional): Si es True, imprime las asignaciones y los retrocesos. Defaults to False.
 
         Returns:
-            bool: True si se encuentra una solución, False en caso contrario.
+            bool: True si se encontró una solución (el tablero queda resuelto), False en caso contrario.
         """
+        if self.timed_out:
+            return False  # La propagación se detuvo sin terminar: el tablero puede no ser consistente
+        cell = self.choose_cell()
+        if cell is None:
+            return True  # Todas las celdas tienen un único valor y la propagación no encontró conflictos
+
+        board = self.board
+        for digit in MASK_DIGITS[board.domains[cell]]:
+            if self.limit_reached():
+                return False  # Presupuesto agotado (aquí o en una rama anterior)
+            self.search_stats["nodes"] += 1
+            if self.stop_event is not None and not self.search_stats["nodes"] & 63 and self.stop_event.is_set():
+                self.cancelled = True  # Búsqueda cancelada desde afuera (el evento se consulta cada 64 nodos)
+            if self.cancelled:
+                return False
+            branch_mark = board.mark()  # Marca la posición del registro de deshacer
+            board.set(cell, BIT[digit])
+            if log:
+                print(f"Valores asignados: {self.cells[cell]}: {digit}")
+
+            if self.propagate(branch_mark) and self.search(log):
+                return True
+
+            if log:
+                print("No se encontró solución en esta rama")
+            self.search_stats["backtracks"] += 1
+            board.undo(branch_mark)  # Deshace los cambios hechos en esta rama
+
+        return False
+
+    def count_solutions(self, limit=2, log=False, keep=1, time_limit=None, node_limit=None, pass_limit=None):
+        """
+        Cuenta las soluciones del tablero hasta llegar a `limit`.
+
+        Aplica lo mismo que `solver` (outsiders y propagación en la raíz) y recorre el árbol de
+        búsqueda completo con `count_search`, que sigue buscando después de cada solución. Con
+        `limit=2` basta para saber si la solución es única (resultado 1).
+
+        Al terminar, `search_stats` contiene, además de los nodos, retrocesos y tiempo, la cantidad
+        de soluciones ("solutions") y si la búsqueda se detuvo por el límite ("limit_reached"); en ese
+        caso puede haber más soluciones. Si hay al menos una, el tablero queda con la primera encontrada,
+        y las primeras `keep` quedan en `found_solutions` como cadenas de 81 caracteres (ver `solution_string`).
 
-        # Aplica la técnica de 'outsiders' para reducir los dominios de las celdas.
-        self.outsiders()
+        Los límites de tiempo, nodos y pasadas son los de `solver` y se comprueban igual. Si alguno se
+        agota, `timed_out` queda en True, "status" en "timeout" y la cantidad devuelta es la de las
+        soluciones encontradas hasta entonces (puede haber más); sin ninguna, el tablero queda con los
+        dominios reducidos por la propagación de la raíz.
+
+        Args:
+            limit (int, optional): Cantidad de soluciones a partir de la cual se deja de buscar (0 = todas).
+                                   Defaults to 2.
+            log (bool, optional): Si es True, imprime las soluciones encontradas y las estadísticas. Defaults to False.
+            keep (int, optional): Cantidad de soluciones a guardar en `found_solutions`. Defaults to 1.
+            time_limit (float, optional): Tiempo máximo en segundos. Defaults to None (sin límite).
+            node_limit (int, optional): Nodos de búsqueda máximos. Defaults to None (sin límite).
+            pass_limit (int, optional): Restricciones que la propagación puede procesar en total. Defaults to None (sin límite).
+
+        Returns:
+            int: La cantidad de soluciones encontradas (a lo sumo `limit` si es mayor que 0).
+        """
+        start_time = self.start_search(time_limit, node_limit, pass_limit, solutions=0, limit_reached=False)
+        self.first_solution = None  # Dominios de la primera solución encontrada
+        self.found_solutions = []
+
+        try:
+            self.outsiders()
+            if self.propagate(log=log):
+                root_mark = self.board.mark()
+                self.count_search(limit, log, keep)
+                self.board.undo(root_mark)
+                if self.first_solution is not None:
+                    for cell, mask in enumerate(self.first_solution):
+                        self.board.set(cell, mask)  # Deja en el tablero la primera solución
+        finally:
+            self.end_limits(pass_limit)
+
+        self.finish_stats(self.search_stats["solutions"] > 0 and not self.timed_out)
+        self.search_stats["time"] = time.perf_counter() - start_time
         if log:
-            print("Se aplicó la estrategia outsiders")
-        # Entra en un bucle que aplica las reglas del Sudoku hasta que no haya más cambios.
-        while True:
-            # Aplica las reglas del Sudoku (obvious singles, hidden singles, pointing pairs, obvious pairs).
-            if not self.apply_rules(log):
-                # Si no hay cambios, sale del bucle.
-                break
-
-        # Verifica si el Sudoku ya está resuelto después de aplicar las reglas.
-        if not self.is_solved(self.vars_values):
-            # Si no está resuelto, selecciona celdas para el backtracking.
-            cells_to_change = ["A1", "C3", "G7", "I9"]
-            # Crea una lista para almacenar los dominios de las celdas seleccionadas.
-            values_to_change = []
-
-            # Itera sobre las celdas seleccionadas para obtener sus dominios.
-            for i in range(4):
-                # Obtiene el dominio de la celda actual.
-                values = self.vars_values[cells_to_change[i]][2]
-                # Agrega el dominio a la lista de dominios.
-                values_to_change.append(list(values))
-
-            # Itera sobre todas las combinaciones posibles de valores para las celdas seleccionadas.
-            for values in product(*values_to_change):
-                # Verifica si la combinación de valores es consistente con las restricciones del Sudoku.
-                if self.is_consistent(cells_to_change, values):
-                    # Si es consistente, crea una copia temporal de los valores de las variables.
-                    temp_vars_values = copy.deepcopy(self.vars_values)
-                    # Asigna los valores de la combinación actual a las celdas seleccionadas.
-                    for i in range(4):
-                        self.vars_values[cells_to_change[i]][2] = {values[i]}
-
-                    # Imprime información sobre las asignaciones si log=True.
-                    if log:
-                        # Crea una cadena con las asignaciones de valores.
-                        assignment_str = ", ".join([f"{cells_to_change[i]}: {values[i]}" for i in range(4)])
-                        # Imprime la cadena de asignaciones.
-                        print(f"Valores asignados: {assignment_str}")
-
-                    # Aplica las reglas del Sudoku hasta que no haya más cambios.
-                    while True:
-                        # Aplica las reglas del Sudoku.
-                        if not self.apply_rules(log):
-                            # Si no hay cambios, sale del bucle.
-                            break
-
-                    # Verifica si el Sudoku está resuelto después de aplicar las reglas.
-                    if self.is_solved(self.vars_values):
-                        # Si está resuelto, retorna True.
-                        return True
-                    else:
-                        if log:
-                            print("No se encontró solución en esta rama")
-                        # Si no está resuelto, restaura los valores de las variables a la copia temporal.
-                        self.vars_values = copy.deepcopy(temp_vars_values)
+            print(f"Soluciones: {self.search_stats['solutions']}{'+' if self.search_stats['limit_reached'] else ''}, "
+                  f"nodos explorados: {self.search_stats['nodes']}, tiempo: {self.search_stats['time']:.4f} s")
+        return self.search_stats["solutions"]
+
+    def count_search(self, limit, log=False, keep=1):
+        """
+        Búsqueda en profundidad que cuenta las soluciones (ver `count_solutions`).
+
+        Ramifica igual que `search`, con propagación completa en cada nodo, pero al llegar a una
+        solución la cuenta, deshace la rama y sigue con la siguiente. El tablero vuelve siempre al
+        estado en que se recibió.
+
+        Args:
+            limit (int): Cantidad de soluciones a partir de la cual se deja de buscar (0 = todas).
+            log (bool, optional): Si es True, imprime cada solución encontrada. Defaults to False.
+            keep (int, optional): Cantidad de soluciones a guardar en `found_solutions`. Defaults to 1.
+
+        Returns:
+            bool: True si se llegó al límite, la búsqueda se canceló o se agotó un presupuesto (hay que dejar de buscar).
+        """
+        if self.timed_out:
+            return True  # La propagación se detuvo sin terminar: el tablero puede no ser consistente
+        stats = self.search_stats
+        cell = self.choose_cell()
+        if cell is None:
+            stats["solutions"] += 1
+            if self.first_solution is None:
+                self.first_solution = list(self.board.domains)
+            if len(self.found_solutions) < keep:
+                self.found_solutions.append(self.solution_string())
+            if log:
+                print(f"Solución {stats['solutions']}: {self.solution_string()}")
+            if limit and stats["solutions"] >= limit:
+                stats["limit_reached"] = True
+                return True
+            return False
+
+        board = self.board
+        for digit in MASK_DIGITS[board.domains[cell]]:
+            if self.limit_reached():
+                return True  # Presupuesto agotado
+            stats["nodes"] += 1
+            if self.stop_event is not None and not stats["nodes"] & 63 and self.stop_event.is_set():
+                self.cancelled = True  # Búsqueda cancelada desde afuera (el evento se consulta cada 64 nodos)
+            if self.cancelled:
+                return True
+            branch_mark = board.mark()
+            board.set(cell, BIT[digit])
+            stop = self.propagate(branch_mark) and self.count_search(limit, log, keep)
+            if not stop:
+                stats["backtracks"] += 1
+            board.undo(branch_mark)  # Deshace la rama, haya o no encontrado soluciones
+            if stop:
+                return True
 
-        # Si no se encontró una solución, retorna False.
         return False
 
     def is_consistent(self, cells, values):
@@ -844,7 +1498,7 @@ class KillerSudokuSolver:
 
         Este método comprueba si la asignación de los valores dados a las celdas especificadas
         viola alguna de las restricciones del Sudoku, como la unicidad de valores en filas,
-        columnas, bloques 3x3 y jaulas.
+        columnas y bloques 3x3. El tablero no se modifica.
 
         Args:
             cells (list): Una lista de nombres de celdas (ej. ["A1", "B2", "C3"]) a las que se asignarán valores.
@@ -853,58 +1507,47 @@ class KillerSudokuSolver:
         Returns:
             bool: True si la asignación es consistente (no hay conflictos), False en caso contrario.
         """
+        domains = self.board.domains
+        assigned = {}  # Máscara asignada a cada índice de celda
 
-        # Crea una copia temporal de vars_values para evitar modificar el original.
-        temp_vars_values = copy.deepcopy(self.vars_values)
-
-        # Asigna los valores a las celdas en la copia temporal.
         for cell, value in zip(cells, values):
-            # Si la celda ya tiene un valor fijo y es diferente del nuevo valor, es inconsistente.
-            # O si el valor no está en el dominio, es inconsistente.
-            # Se utiliza el método get para evitar KeyError.
-            # Si la clave no existe o no tiene valor, devuelve None. Esto se verifica más adelante.
-            if (temp_vars_values.get(cell) and len(temp_vars_values[cell][2]) == 1 and list(temp_vars_values[cell][2])[0] != value) or \
-              (temp_vars_values.get(cell) and value not in temp_vars_values[cell][2]):
+            index = self.cell_index[cell]
+            # Si el valor no está en el dominio (o la celda ya tiene otro valor fijo), es inconsistente.
+            if not domains[index] & BIT[value]:
                 return False  # La asignación es inconsistente
+            assigned[index] = BIT[value]
+
+        # Verifica si hay valores repetidos en filas, columnas y bloques 3x3.
+        for unit in self.units[:27]:
+            used = 0  # Máscara de valores fijos en la restricción actual
+            for cell in unit:
+                mask = assigned.get(cell, domains[cell])
+                if is_single(mask):
+                    if used & mask:
+                        return False  # Inconsistente si hay duplicados
+                    used |= mask
 
-            # Solo si la celda no fue inicializada (en el archivo .json),
-            # se inicializa con el nuevo valor y un dominio de solo este valor.
-            if not temp_vars_values.get(cell):
-                temp_vars_values[cell] = [0, 0, {value}]
-
-        # Verifica si hay conflictos en filas, columnas y bloques 3x3.
-        for constraint in self.restricciones[:27]:  # Itera sobre las restricciones de filas, columnas y bloques
-            values_in_constraint = []  # Lista para almacenar los valores en la restricción actual
-            for cell in constraint:  # Itera sobre las celdas en la restricción actual
-                if temp_vars_values.get(cell) and len(temp_vars_values[cell][2]) == 1:  # Si la celda tiene un valor asignado
-                    values_in_constraint.append(list(temp_vars_values[cell][2])[0])  # Agrega el valor a la lista
-                elif not temp_vars_values.get(cell):  # Si la celda no fue inicializada en el archivo JSON
-                    for cell2, value2 in zip(cells, values):  # Busca la celda en la lista de celdas a asignar
-                        if cell == cell2:  # Si la celda coincide
-                            values_in_constraint.append(value2)  # Agrega el valor a la lista
-                            break  # Sale del bucle interno
-
-            # Verifica si hay valores duplicados en la restricción.
-            if len(values_in_constraint) != len(set(values_in_constraint)):
-                return False  # Inconsistent if duplicates are found
-
-        return True  # Consistent if no conflicts are found
+        return True  # Consistente si no hay conflictos
 
     def is_solved(self, board):
         """
-        Verifica si el Sudoku está resuelto, es decir, si todas las celdas tienen un único valor asignado
-        y el tablero es consistente con las restricciones.
+        Verifica si el Sudoku está resuelto, es decir, si todas las celdas tienen un único valor asignado.
+
+        Args:
+            board: El tablero a verificar (normalmente `self.vars_values`).
 
         Returns:
             bool: True si el Sudoku está resuelto, False en caso contrario.
         """
         if board is None:  # Verifica si board es None
             return False  # Si es None, el Sudoku no está resuelto
+        if board is self.vars_values:  # El tablero propio se verifica directamente sobre las máscaras
+            return self.board.is_solved()
         # Verificar si todas las celdas tienen un único valor asignado
         for cell in board:
             if len(board[cell][2]) != 1:
                 return False  # Si alguna celda tiene más de un valor posible, el Sudoku no está resuelto
-        return True  # Si todas las celdas tienen un único valor y el tablero es consistente, el Sudoku está resuelto
+        return True  # Si todas las celdas tienen un único valor, el Sudoku está resuelto
 
     def define_adjacent_constraints(self):
         """
@@ -915,69 +1558,23 @@ class KillerSudokuSolver:
         Las restricciones de adyacencia se utilizan en la técnica de "outsiders" para identificar posibles
         valores en celdas fuera de una región específica que podrían influir en la suma total de una jaula.
 
+        El catálogo se construye a partir de `geometry.adjacent_regions`, sin regiones repetidas, y el
+        diccionario resultante es compartido por todas las instancias: no debe modificarse.
+
         Returns:
             dict: Un diccionario que contiene las restricciones de adyacencia.
                   Las claves son el número de restricciones adyacentes (1 a 9).
-                  Los valores son listas de conjuntos de celdas que corresponden a esas restricciones.
-        """
-        adjacent_constraints = {}  # Inicializa el diccionario de restricciones adyacentes
-
-        # Columnas:
-        for num_adjacent in range(1, 10):  # Itera para 1 a 9 columnas adyacentes
-            adjacent_constraints[num_adjacent] = []  # Inicializa la lista de restricciones para el número actual de adyacencias
-            for start_col_index in range(len(self.columnas) - num_adjacent + 1):  # Itera sobre las posibles columnas de inicio
-                cells_set = set()  # Inicializa un conjunto para almacenar las celdas de la restricción actual
-                for col_index in range(start_col_index, start_col_index + num_adjacent):  # Itera sobre las columnas adyacentes
-                    for fila in self.filas:  # Itera sobre las filas para agregar las celdas al conjunto
-                        cells_set.add(f"{self.columnas[col_index]}{fila}")  # Agrega la celda al conjunto
-                adjacent_constraints[num_adjacent].append(cells_set)  # Agrega el conjunto de celdas a la lista de restricciones
-
-        # Filas:
-        for num_adjacent in range(1, 10):  # Itera para 1 a 9 filas adyacentes
-            adjacent_constraints[num_adjacent] = adjacent_constraints.get(num_adjacent, [])  # Obtiene la lista de restricciones o la inicializa si no existe
-            for start_row in range(1, 10 - num_adjacent + 1):  # Itera sobre las posibles filas de inicio
-                cells_set = set()  # Inicializa un conjunto para almacenar las celdas de la restricción actual
-                for row in range(start_row, start_row + num_adjacent):  # Itera sobre las filas adyacentes
-                    for col in self.columnas:  # Itera sobre las columnas para agregar las celdas al conjunto
-                        cells_set.add(f"{col}{row}")  # Agrega la celda al conjunto
-                adjacent_constraints[num_adjacent].append(cells_set)  # Agrega el conjunto de celdas a la lista de restricciones
-
-        # Bloques 3x3:
-        blocks = self.restricciones[18:27]  # Obtiene las restricciones de bloques 3x3 de la lista de restricciones
-
-        for i in range(18, 27):  # Agrega cada bloque 3x3 como una restricción adyacente individual
-            adjacent_constraints[1].append(self.restricciones[i])
-
-        # Define la adyacencia de bloques usando combinaciones:
-        for num_adjacent in range(1, 10):
-            # Inicializa una lista vacía para el número actual de bloques adyacentes si no existe
-            adjacent_constraints[num_adjacent] = adjacent_constraints.get(num_adjacent, [])
-            # Genera todas las combinaciones de bloques con el número actual de bloques adyacentes
-            for block_combination in combinations(blocks, num_adjacent):
-                # Verifica si todos los bloques en la combinación son adyacentes entre sí (continuos)
-                # Obtiene los índices de los bloques en la combinación
-                block_indices = [self.restricciones.index(block) - 18 for block in block_combination]
-                # Verifica si todos los bloques son adyacentes a al menos otro bloque en la combinación
-                is_continuous = all(
-                    any(self.are_blocks_adjacent(block_indices[i], block_indices[j]) for j in range(len(block_indices)) if i != j)
-                    for i in range(len(block_indices))
-                )
-
-                # Si los bloques son continuos, crea un conjunto de celdas y lo agrega a la lista
-                if is_continuous:
-                    # Une todas las celdas de los bloques en la combinación
-                    cells_set = set().union(*block_combination)
-                    # Agrega el conjunto de celdas a la lista de restricciones adyacentes
-                    adjacent_constraints[num_adjacent].append(cells_set)
-
-        return adjacent_constraints  # Retorna el diccionario de restricciones adyacentes
+                  Los valores son tuplas de conjuntos de celdas que corresponden a esas restricciones.
+        """
+        return named_adjacent_constraints()  # Se calcula una vez por proceso y se comparte entre instancias
 
     def are_blocks_adjacent(self, block1_index, block2_index):
         """
-        Verifica si dos bloques 3x3 son adyacentes (horizontal o verticalmente, no diagonalmente).
+        Verifica si dos bloques 3x3 son adyacentes.
 
-        Esta función determina si dos bloques 3x3 en el tablero de Sudoku son adyacentes,
-        considerando la adyacencia horizontal y vertical, pero no la diagonal.
+        Esta función determina si dos bloques 3x3 en el tablero de Sudoku son adyacentes. Como en la
+        versión original, dos bloques que solo se tocan en diagonal también cuentan como adyacentes
+        (ver `geometry.blocks_adjacent`).
 
         Args:
             block1_index (int): Índice del primer bloque (0-8).
@@ -986,11 +1583,4 @@ class KillerSudokuSolver:
         Returns:
             bool: True si los bloques son adyacentes, False en caso contrario.
         """
-        # Calcula la diferencia en filas y columnas entre los dos bloques
-        row_diff = abs(block1_index // 3 - block2_index // 3)  # Diferencia en filas
-        col_diff = abs(block1_index % 3 - block2_index % 3)  # Diferencia en columnas
-
-        # Verifica si los bloques son adyacentes y no son el mismo bloque
-        # (row_diff <= 1 and col_diff <= 1) asegura que la diferencia de filas y la de columnas sea menor a 1, esto significa que son adyacentes
-        # (row_diff + col_diff != 0) asegura que no sean el mismo bloque, ya que un bloque con el mismo índice consigo mismo tendría una diferencia de filas y columnas de 0
-        return (row_diff <= 1 and col_diff <= 1) and (row_diff + col_diff != 0)
+        return blocks_adjacent(block1_index, block2_index)
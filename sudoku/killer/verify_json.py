@@ -1,44 +1,64 @@
 import json
+import os
+import sys
 
-def verify_sudoku_killer_json(json_file):
-    with open(json_file, 'r') as f:
-        data = json.load(f)
-        cages = data['cages']
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Módulos compartidos con v1 (`geometry`)
 
-    # 1. Verificar IDs únicos
-    ids = [cage['id'] for cage in cages]
-    if len(ids) != len(set(ids)):  # Compara la longitud original con el conjunto (sin duplicados).
-        return False, "Se encontraron IDs de jaulas duplicados."
+from geometry import CELLS, CELL_INDEX
+
+ALL_CELLS = (1 << len(CELLS)) - 1  # Máscara con las 81 celdas (bit i = celda i de `geometry.CELLS`)
 
-    # 2. Verificar la suma total de las jaulas
-    total_sum = sum(cage['sum'] for cage in cages)
-    if total_sum != 405:  # En Sudoku Killer, la suma total de todas las celdas debe ser 405.
-        return False, f"Suma total incorrecta de las jaulas: {total_sum}. Se esperaba: 405."
 
-    # 3. Verificar que no haya celdas repetidas e identificar jaulas con celdas repetidas
-    all_cells = []  # Lista para almacenar todas las celdas procesadas.
-    repeated_cells = []  # Lista para almacenar celdas repetidas.
-    cages_with_repeated_cells = []  # Lista para identificar IDs de jaulas con celdas repetidas.
+def check_puzzle(cages):
+    """
+    Verifica la estructura de un tablero en tiempo lineal.
+
+    Comprueba que los IDs de las jaulas sean únicos, que la suma total sea 405, que ninguna celda esté
+    en dos jaulas y que estén las 81 celdas. Los IDs se guardan en un conjunto y las celdas vistas en
+    una máscara de 81 bits, así que cada celda se revisa en tiempo constante.
+
+    Args:
+        cages (iterable): Las jaulas del tablero ({"id", "cells", "sum"}).
+
+    Returns:
+        tuple: (bool, str) indicando si el tablero es válido y un mensaje.
+    """
+    ids = set()
+    seen = 0  # Máscara de las celdas ya vistas
+    total_sum = 0
+    repeated_cells = []  # Celdas que aparecen en más de una jaula
+    cages_with_repeated_cells = []  # IDs de las jaulas donde se repiten
+    extra_cells = []  # Nombres que no son celdas de la cuadrícula
 
     for cage in cages:
+        # 1. Verificar IDs únicos
+        if cage['id'] in ids:
+            return False, "Se encontraron IDs de jaulas duplicados."
+        ids.add(cage['id'])
+        total_sum += cage['sum']
+
         for cell in cage['cells']:
-            if cell in all_cells:  # Si la celda ya existe, es repetida.
+            index = CELL_INDEX.get(cell)
+            if index is None:
+                extra_cells.append(cell)
+            elif seen >> index & 1:  # La celda ya estaba en otra jaula
                 repeated_cells.append(cell)
                 cages_with_repeated_cells.append(cage['id'])
             else:
-                all_cells.append(cell)
+                seen |= 1 << index
 
-    if repeated_cells:  # Si se encontraron celdas repetidas, se retorna el error.
-        return False, f"Celdas repetidas encontradas: {repeated_cells}. Jaulas con celdas repetidas: {cages_with_repeated_cells}."
+    # 2. Verificar la suma total de las jaulas
+    if total_sum != 405:  # En Sudoku Killer, la suma total de todas las celdas debe ser 405.
+        return False, f"Suma total incorrecta de las jaulas: {total_sum}. Se esperaba: 405."
 
-    # 4. Verificar que todas las celdas estén presentes e identificar celdas faltantes o adicionales
-    expected_cells = [f"{chr(col)}{row}" for col in range(ord('A'), ord('J')) for row in range(1, 10)]
-    # Genera todas las celdas esperadas en un Sudoku 9x9, como 'A1', 'B2', etc.
-    missing_cells = list(set(expected_cells) - set(all_cells))  # Celdas faltantes.
-    extra_cells = list(set(all_cells) - set(expected_cells))  # Celdas adicionales.
+    # 3. Verificar que no haya celdas repetidas
+    if repeated_cells:
+        return False, f"Celdas repetidas encontradas: {repeated_cells}. Jaulas con celdas repetidas: {cages_with_repeated_cells}."
 
-    if missing_cells or extra_cells:
+    # 4. Verificar que todas las celdas estén presentes y que no haya celdas adicionales
+    if seen != ALL_CELLS or extra_cells:
         error_message = ""
+        missing_cells = [cell for index, cell in enumerate(CELLS) if not seen >> index & 1]
         if missing_cells:  # Si hay celdas faltantes, las incluye en el mensaje.
             error_message += f"Celdas faltantes: {missing_cells}. "
         if extra_cells:  # Si hay celdas adicionales, las incluye también.
@@ -47,11 +67,34 @@ def verify_sudoku_killer_json(json_file):
 
     return True, "Todas las verificaciones pasaron correctamente."
 
-# Ejemplo de uso
-json_file = 'output.json'
-is_valid, message = verify_sudoku_killer_json(json_file)
 
-if is_valid:
-    print("El archivo JSON es válido.")
-else:
-    print(f"El archivo JSON no es válido: {message}")
\ No newline at end of file
+def verify_sudoku_killer_json(json_file):
+    """
+    Verifica la estructura de un tablero guardado en un archivo JSON (formato de output.json).
+
+    Args:
+        json_file (str): La ruta al archivo.
+
+    Returns:
+        tuple: (bool, str) indicando si el tablero es válido y un mensaje (ver `check_puzzle`).
+    """
+    with open(json_file, 'r') as f:
+        data = json.load(f)
+    return check_puzzle(data['cages'])
+
+
+def main(argv=None):
+    # Ejemplo de uso: python verify_json.py [output.json]
+    argv = sys.argv[1:] if argv is None else argv
+    json_file = argv[0] if argv else 'output.json'
+    is_valid, message = verify_sudoku_killer_json(json_file)
+
+    if is_valid:
+        print("El archivo JSON es válido.")
+    else:
+        print(f"El archivo JSON no es válido: {message}")
+    return 0 if is_valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""
+Caché de soluciones por forma canónica para tableros clásicos y Killer.
+
+Dos tableros equivalentes por una simetría del Sudoku (trasponer, permutar bandas, filas dentro de
+una banda, pilas y columnas dentro de una pila, lo que incluye rotaciones y reflexiones, y en el
+clásico además renombrar los dígitos) tienen la misma forma canónica: la menor representación del
+tablero entre todas sus transformaciones. La solución se guarda una vez, expresada en el marco
+canónico, y se devuelve a cada variante aplicando la transformación inversa.
+
+Para no recorrer las 2 * 6^8 transformaciones, bandas, filas, pilas y columnas se ordenan primero
+por firmas invariantes ante el grupo (cuántas veces aparece cada dígito dado en el clásico, el tamaño
+y la suma de cada jaula en el Killer, refinadas con las filas y columnas donde aparecen) y solo se
+prueban las permutaciones entre elementos con la misma firma. Si los empates superan
+`MAX_TRANSFORMS`, se usan las primeras en un orden fijo: un tablero muy simétrico puede no reconocerse
+como variante de otro, pero la respuesta sigue siendo correcta porque cada acierto se verifica
+contra el tablero antes de devolverlo.
+
+En el clásico las celdas se leen de la cadena de 81 caracteres (celda i en la fila i // 9 y la columna
+i % 9); en el Killer, en el orden de `geometry.CELLS`. La caché no depende de ningún solucionador:
+`solve_classic` y `solve_killer` reciben la función que resuelve cuando no hay acierto.
+"""
+
+import shelve
+from collections import OrderedDict
+from itertools import permutations, product
+
+from geometry import CELL_INDEX, UNITS
+
+MAX_TRANSFORMS = 2048  # Transformaciones que se prueban como máximo por tablero
+REFINE_ROUNDS = 4  # Rondas de refinamiento de las firmas de filas, columnas y etiquetas
+DEFAULT_SIZE = 10000  # Soluciones que se guardan en memoria
+DIGITS = "123456789"
+
+
+def _groups(items, signature):
+    # Ordena `items` por su firma y devuelve las permutaciones posibles de cada grupo de empatados
+    ordered = sorted(items, key=signature)
+    groups = []
+    for item in ordered:
+        if groups and signature(groups[-1][0]) == signature(item):
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+    return [list(permutations(group)) for group in groups]
+
+
+def _line_orders(line_signature):
+    # Órdenes posibles de las 9 filas (o columnas): bandas ordenadas por firma y, dentro de cada
+    # banda, filas ordenadas por firma; solo se permutan los empatados
+    def band_signature(band):
+        return tuple(sorted(line_signature(line) for line in range(band * 3, band * 3 + 3)))
+
+    orders = []
+    for band_choice in product(*_groups(range(3), band_signature)):
+        bands = [band for group in band_choice for band in group]
+        line_choices = [product(*_groups(range(band * 3, band * 3 + 3), line_signature)) for band in bands]
+        for lines in product(*line_choices):
+            orders.append(tuple(line for band in lines for group in band for line in group))
+            if len(orders) >= MAX_TRANSFORMS:
+                return orders
+    return orders
+
+
+def _ranks(signatures):
+    # Reemplaza cada firma por su posición entre las firmas distintas (sigue siendo invariante)
+    order = {signature: rank for rank, signature in enumerate(sorted(set(signatures)))}
+    return [order[signature] for signature in signatures]
+
+
+def _orientations(labels, label_features):
+    """
+    Devuelve los órdenes de celdas a probar: para cada orientación (tal cual o traspuesta) con la
+    menor firma, el producto de los órdenes posibles de filas y columnas.
+
+    Las firmas de filas, columnas y etiquetas se refinan unas con otras durante `REFINE_ROUNDS`
+    rondas: la de una fila depende de las etiquetas de sus celdas y de las columnas donde están, la de
+    una etiqueta de las filas y columnas de sus celdas, y así sucesivamente.
+
+    Args:
+        labels (list): La etiqueta de cada celda (dígito o jaula; None para las vacías), en orden de
+                       fila (celda r * 9 + c).
+        label_features (dict): Una característica invariante por etiqueta (ej. cuántas veces aparece).
+
+    Returns:
+        list: Tuplas de 81 índices: la celda original que ocupa cada posición canónica.
+    """
+    names = sorted(label_features)
+    candidates = []
+    for transpose in (False, True):
+        def cell(row, col, transpose=transpose):
+            return col * 9 + row if transpose else row * 9 + col
+
+        given = [[(row, col, labels[cell(row, col)]) for col in range(9) if labels[cell(row, col)] is not None] for row in range(9)]
+        cells = [item for row in given for item in row]
+        label_color = dict(zip(names, _ranks([label_features[name] for name in names])))
+        row_color = [0] * 9
+        col_color = [0] * 9
+        for _ in range(REFINE_ROUNDS):
+            row_signature = [tuple(sorted((label_color[label], col_color[col]) for _, col, label in given[row])) for row in range(9)]
+            col_signature = [tuple(sorted((label_color[label], row_color[row]) for row, c, label in cells if c == col)) for col in range(9)]
+            positions = {name: [] for name in names}
+            for row, col, label in cells:
+                positions[label].append((row_color[row], col_color[col]))
+            label_signature = [(label_color[name], tuple(sorted(positions[name]))) for name in names]
+            row_color = _ranks([(row_color[row], row_signature[row]) for row in range(9)])
+            col_color = _ranks([(col_color[col], col_signature[col]) for col in range(9)])
+            label_color = dict(zip(names, _ranks(label_signature)))
+        signature = (tuple(sorted(row_signature)), tuple(sorted(col_signature)))
+        candidates.append((signature, _line_orders(row_color.__getitem__), _line_orders(col_color.__getitem__), cell))
+
+    best = min(candidate[0] for candidate in candidates)
+    orders = []
+    for signature, rows_orders, cols_orders, cell in candidates:
+        if signature != best:
+            continue
+        for rows in rows_orders:
+            for cols in cols_orders:
+                orders.append(tuple(cell(row, col) for row in rows for col in cols))
+                if len(orders) >= MAX_TRANSFORMS:
+                    return orders
+    return orders
+
+
+def canonical_classic(board):
+    """
+    Calcula la forma canónica de un tablero clásico.
+
+    Args:
+        board (str): El tablero como cadena de 81 caracteres ('.' o '0' = vacía).
+
+    Returns:
+        tuple: (clave, orden, etiquetas): la clave de la forma canónica, la celda original de cada
+               posición canónica y el dígito original de cada etiqueta ('1'..'9' por orden de aparición).
+    """
+    values = [char if char in DIGITS else None for char in board]
+    frequency = {digit: values.count(digit) for digit in DIGITS if digit in values}
+
+    best = None
+    for order in _orientations(values, frequency):
+        labels = {}
+        key = []
+        for index in order:
+            value = values[index]
+            if value is None:
+                key.append("0")
+            else:
+                if value not in labels:
+                    labels[value] = DIGITS[len(labels)]
+                key.append(labels[value])
+        key = "".join(key)
+        if best is None or key < best[0]:
+            best = (key, order, labels)
+    key, order, labels = best
+    return "c" + key, order, {label: digit for digit, label in labels.items()}
+
+
+def canonical_killer(cages):
+    """
+    Calcula la forma canónica de un tablero Killer; las jaulas se transforman junto con las celdas.
+
+    Args:
+        cages (list): Las jaulas con el formato del archivo JSON ({"id", "cells", "sum"}).
+
+    Returns:
+        tuple: (clave, orden): la clave de la forma canónica y la celda original de cada posición canónica.
+    """
+    cage_of = [None] * 81
+    sums = []
+    for number, cage in enumerate(cages):
+        sums.append(cage['sum'])
+        for cell in cage['cells']:
+            cage_of[CELL_INDEX[cell]] = number
+    features = {number: (len(cage['cells']), cage['sum']) for number, cage in enumerate(cages)}
+
+    best = None
+    for order in _orientations(cage_of, features):
+        labels = {}
+        key = []
+        for index in order:
+            number = cage_of[index]
+            if number is None:
+                key.append(".")
+            else:
+                if number not in labels:
+                    labels[number] = len(labels)
+                key.append(chr(48 + labels[number]))
+        key = "".join(key) + ":" + ",".join(str(sums[number]) for number in sorted(labels, key=labels.get))
+        if best is None or key < best[0]:
+            best = (key, order)
+    key, order = best
+    return "k" + key, order
+
+
+def is_valid_grid(solution):
+    """Indica si una cadena de 81 dígitos cumple las filas, columnas y bloques."""
+    return all(len({solution[cell] for cell in unit}) == 9 for unit in UNITS) and all(char in DIGITS for char in solution)
+
+
+class SolutionCache:
+    """
+    Caché LRU de soluciones por forma canónica, con almacenamiento opcional en disco (`shelve`).
+
+    `stats` cuenta los aciertos ("hits", de los cuales "disk_hits" vinieron del disco), los fallos
+    ("misses") y las soluciones que salieron de la memoria por falta de espacio ("evictions").
+    """
+
+    def __init__(self, maxsize=DEFAULT_SIZE, path=None):
+        """
+        Args:
+            maxsize (int, optional): Soluciones que se guardan en memoria. Defaults to DEFAULT_SIZE.
+            path (str, optional): Archivo donde guardar también las soluciones, para reutilizarlas entre ejecuciones.
+        """
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self.store = shelve.open(path) if path is not None else None
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        """Devuelve la solución canónica guardada para `key`, o None."""
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory.move_to_end(key)
+            return value
+        if self.store is not None:
+            value = self.store.get(key)
+            if value is not None:
+                self.stats["disk_hits"] += 1
+                self.remember(key, value)
+        return value
+
+    def remember(self, key, value):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def put(self, key, value):
+        """Guarda la solución canónica `value` ("" si el tablero no tiene solución)."""
+        self.remember(key, value)
+        if self.store is not None:
+            self.store[key] = value
+
+    def solve_classic(self, board, solve):
+        """
+        Resuelve un tablero clásico, usando la caché si ya se resolvió él o una variante equivalente.
+
+        Args:
+            board (str): El tablero como cadena de 81 caracteres.
+            solve (callable): Función que recibe el tablero y devuelve su solución (cadena) o None.
+
+        Returns:
+            str: La solución en el mismo orden que `board`, o None si no tiene.
+        """
+        key, order, labels = canonical_classic(board)
+        stored = self.get(key)
+        if stored is not None:
+            if not stored:
+                self.stats["hits"] += 1
+                return None
+            # Las etiquetas sin dígito dado corresponden a los dígitos que no aparecen en el tablero
+            missing = iter(sorted(set(DIGITS) - set(labels.values())))
+            mapping = dict(labels)
+            for label in DIGITS:
+                if label not in mapping:
+                    mapping[label] = next(missing)
+            solution = [None] * 81
+            for position, index in enumerate(order):
+                solution[index] = mapping[stored[position]]
+            solution = "".join(solution)
+            if is_valid_grid(solution) and all(char == given for char, given in zip(solution, board) if given in DIGITS):
+                self.stats["hits"] += 1
+                return solution
+
+        self.stats["misses"] += 1
+        solution = solve(board)
+        if solution is None:
+            self.put(key, "")
+            return None
+        labels = {digit: label for label, digit in labels.items()}
+        for index in order:  # Etiqueta los dígitos que no estaban dados por orden de aparición
+            if solution[index] not in labels:
+                labels[solution[index]] = DIGITS[len(labels)]
+        self.put(key, "".join(labels[solution[index]] for index in order))
+        return solution
+
+    def solve_killer(self, cages, solve):
+        """
+        Resuelve un tablero Killer, usando la caché si ya se resolvió él o una variante equivalente.
+
+        Args:
+            cages (list): Las jaulas con el formato del archivo JSON ({"id", "cells", "sum"}).
+            solve (callable): Función que recibe las jaulas y devuelve la solución (81 caracteres en el
+                              orden de `geometry.CELLS`) o None.
+
+        Returns:
+            str: La solución en el orden de `geometry.CELLS`, o None si no tiene.
+        """
+        key, order = canonical_killer(cages)
+        stored = self.get(key)
+        if stored is not None:
+            if not stored:
+                self.stats["hits"] += 1
+                return None
+            solution = [None] * 81
+            for position, index in enumerate(order):
+                solution[index] = stored[position]
+            solution = "".join(solution)
+            if is_valid_grid(solution) and all(
+                    sum(int(solution[CELL_INDEX[cell]]) for cell in cage['cells']) == cage['sum'] for cage in cages):
+                self.stats["hits"] += 1
+                return solution
+
+        self.stats["misses"] += 1
+        solution = solve(cages)
+        self.put(key, "" if solution is None else "".join(solution[index] for index in order))
+        return solution
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
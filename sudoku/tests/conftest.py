@@ -0,0 +1,60 @@
+# Archivo: conftest.py
+#
+# Configuración común de las pruebas (`python -m pytest -q sudoku/tests`).
+#
+# Los módulos del solucionador Killer se importan entre sí por nombre (ej. `from bitboard import ...`),
+# igual que en `benchmark/bench.py`: se agrega su carpeta al path y el `sudoku.py` de v1, que tiene el
+# mismo nombre, se carga aparte como `sudoku_v1`.
+
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SUDOKU_DIR = os.path.dirname(TESTS_DIR)
+CORPUS_DIR = os.path.join(SUDOKU_DIR, "benchmark", "corpus")
+
+sys.path.insert(0, os.path.join(SUDOKU_DIR, "killer"))
+sys.path.append(SUDOKU_DIR)  # Módulos compartidos (`geometry`, `compact`, `solution_cache`)
+sys.path.append(os.path.join(SUDOKU_DIR, "v1"))  # Módulos auxiliares de v1 (ej. `dlx`)
+
+from geometry import CELL_INDEX, UNITS  # noqa: E402
+
+
+def load_module(name, path):
+    """Importa un módulo desde su ruta con un nombre propio (ver `bench.load_module`)."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def is_killer_solution(cages, solution):
+    """Indica si `solution` (81 dígitos en el orden de `geometry.CELLS`) cumple las unidades y las jaulas."""
+    if not all(sorted(solution[cell] for cell in unit) == list("123456789") for unit in UNITS):
+        return False
+    return all(sum(int(solution[CELL_INDEX[cell]]) for cell in cage['cells']) == cage['sum'] and
+               len({solution[CELL_INDEX[cell]] for cell in cage['cells']}) == len(cage['cells']) for cage in cages)
+
+
+@pytest.fixture(scope="session")
+def sudoku_v1():
+    """El módulo `sudoku.py` de v1."""
+    return load_module("sudoku_v1", os.path.join(SUDOKU_DIR, "v1", "sudoku.py"))
+
+
+@pytest.fixture(scope="session")
+def killer_puzzles():
+    """Los tableros del corpus Killer como listas de jaulas ({"id", "cells", "sum"})."""
+    with open(os.path.join(CORPUS_DIR, "killer.ndjson"), 'r') as f:
+        return [json.loads(line)['cages'] for line in f if line.strip()]
+
+
+@pytest.fixture(scope="session")
+def classic_puzzles():
+    """Los tableros del corpus clásico como cadenas de 81 caracteres."""
+    with open(os.path.join(CORPUS_DIR, "classic.txt"), 'r') as f:
+        return [line.split()[0] for line in f if line.strip() and not line.startswith('#')]
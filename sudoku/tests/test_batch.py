@@ -0,0 +1,41 @@
+import pytest
+
+import batch
+from conftest import is_killer_solution
+from solution_cache import SolutionCache
+
+
+def test_solve_puzzles_with_cache(killer_puzzles):
+    cache = SolutionCache(8)
+    puzzles = [(i, {"cages": cages}) for i, cages in enumerate(killer_puzzles[:3])] * 2
+    results = list(batch.solve_puzzles(puzzles, cache=cache))
+    assert [result["status"] for result in results] == ["solved"] * 6
+    assert [result["cached"] for result in results] == [False] * 3 + [True] * 3
+    assert [result["solution"] for result in results[:3]] == [result["solution"] for result in results[3:]]
+
+
+def test_cache_rejected_with_workers(capsys):
+    with pytest.raises(SystemExit):
+        batch.main(["puzzles.ndjson", "--cache", "10", "--workers", "2"])
+    assert "--cache" in capsys.readouterr().err
+
+
+def test_bad_puzzles_do_not_stop_the_batch(killer_puzzles):
+    puzzles = [("ok", {"cages": killer_puzzles[0]}), ("missing", {"cages": killer_puzzles[1][1:]}),
+               ("broken", {"cages": [{"id": 0}]}), ("ok2", {"cages": killer_puzzles[2]})]
+    results = list(batch.solve_puzzles(puzzles))
+    assert [result["status"] for result in results] == ["solved", "invalid", "error", "solved"]
+    assert all(is_killer_solution(data['cages'], result["solution"])
+               for (_, data), result in zip(puzzles, results) if result["status"] == "solved")
+
+
+def test_parallel_matches_serial(killer_puzzles):
+    puzzles = [(i, {"cages": cages}) for i, cages in enumerate(killer_puzzles[:16])]
+    serial = {result["id"]: result for result in batch.solve_puzzles(puzzles, count_limit=2)}
+    parallel = list(batch.solve_puzzles_parallel(puzzles, workers=2, chunk_size=3, count_limit=2))
+    assert [result["id"] for result in parallel] == list(range(16))
+    for result in parallel:
+        assert (result["status"], result["solutions"], result["solution"]) == \
+            (serial[result["id"]]["status"], serial[result["id"]]["solutions"], serial[result["id"]]["solution"])
+    unordered = batch.solve_puzzles_parallel(puzzles, workers=2, chunk_size=3, ordered=False)
+    assert sorted(result["id"] for result in unordered) == list(range(16))
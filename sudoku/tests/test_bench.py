@@ -0,0 +1,37 @@
+import json
+import os
+
+import pytest
+
+from conftest import SUDOKU_DIR, load_module
+
+
+@pytest.fixture(scope="module")
+def bench():
+    return load_module("bench", os.path.join(SUDOKU_DIR, "benchmark", "bench.py"))
+
+
+def make_report(calibration, p50, repeats=3, name="killer.solver"):
+    metrics = {"runs": 10, "solved": 10, "puzzles_per_sec": round(1000 / p50, 3), "p50_ms": p50, "p99_ms": p50,
+               "mean_ms": p50, "peak_kb": 10.0}
+    return {"meta": {"repeats": repeats, "calibration_ms": calibration}, "results": {name: {"all": metrics}}}
+
+
+def test_compare_scales_with_calibration(bench):
+    baseline = make_report(10.0, 20.0)
+    assert bench.compare(make_report(20.0, 40.0), baseline) == []  # Máquina el doble de lenta
+    assert bench.compare(make_report(10.0, 40.0), baseline)
+    legacy = {"meta": {"repeats": 1}, "results": baseline["results"]}  # Sin calibración: se compara tal cual
+    assert bench.compare(make_report(20.0, 40.0), legacy)
+
+
+def test_save_baseline_keeps_meta_per_strategy(bench, tmp_path):
+    path = str(tmp_path / "baseline.json")
+    bench.save_baseline(make_report(10.0, 20.0, repeats=1, name="classic.dlx"), path)
+    bench.save_baseline(make_report(30.0, 60.0, repeats=5), path)
+    with open(path) as f:
+        baseline = json.load(f)
+    assert baseline["strategy_meta"]["classic.dlx"]["repeats"] == 1
+    assert baseline["strategy_meta"]["killer.solver"]["repeats"] == 5
+    assert bench.compare(make_report(10.0, 20.0, name="classic.dlx"), baseline) == []
+    assert bench.compare(make_report(10.0, 20.0), baseline) == []
@@ -0,0 +1,46 @@
+import random
+
+from bitboard import BitBoard, FULL_MASK, BIT, LOWEST_DIGIT
+from sudoku import KillerSudokuSolver
+
+
+def test_mark_undo_round_trip():
+    rng = random.Random(4)
+    board = BitBoard()
+    states = []
+    for _ in range(20):
+        states.append((board.mark(), list(board.domains)))
+        for _ in range(rng.randint(0, 12)):
+            cell, mask = rng.randrange(81), rng.randint(0, FULL_MASK)
+            rng.choice((board.set, board.remove, board.intersect))(cell, mask)
+    for mark, domains in reversed(states):
+        board.undo(mark)
+        assert list(board.domains) == domains
+    assert not board.trail
+
+
+def test_writes_report_changes():
+    board = BitBoard()
+    changes = board.changes
+    assert board.intersect(0, BIT[1] | BIT[2])
+    assert not board.intersect(0, FULL_MASK)
+    assert not board.remove(0, BIT[3])
+    assert board.remove(0, BIT[2]) and board.value(0) == 1
+    assert board.changes == changes + 2
+
+
+def test_propagate_undo_restores_domains(killer_puzzles):
+    solver = KillerSudokuSolver()
+    solver.load_puzzle(killer_puzzles[-1])
+    solver.outsiders()
+    solver.propagate()
+    board = solver.board
+    before = list(board.domains)
+    open_cells = [cell for cell in range(81) if board.count(cell) > 1]
+    assert open_cells
+    for cell in open_cells:
+        mark = board.mark()
+        board.intersect(cell, BIT[LOWEST_DIGIT[board.get(cell)]])
+        solver.propagate(mark)
+        board.undo(mark)
+        assert list(board.domains) == before
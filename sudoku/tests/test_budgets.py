@@ -0,0 +1,49 @@
+import batch
+from sudoku import KillerSudokuSolver
+
+HARD = 16  # Tablero del corpus que tarda más de un segundo en resolverse
+
+
+def test_solver_limits(killer_puzzles):
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": killer_puzzles[HARD]})
+    assert not solver.solver(node_limit=100)
+    assert solver.timed_out and solver.search_stats["status"] == "timeout"
+    assert solver.search_stats["nodes"] == 100
+    solver.load_puzzle({"cages": killer_puzzles[HARD]})
+    assert not solver.solver(pass_limit=300) and solver.search_stats["passes"] == 300
+
+
+def test_count_limits(killer_puzzles):
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": killer_puzzles[HARD]})
+    assert solver.count_solutions(2, node_limit=100) == 0
+    assert solver.timed_out and solver.search_stats["status"] == "timeout"
+    assert solver.search_stats["nodes"] == 100
+    solver.load_puzzle({"cages": killer_puzzles[HARD]})
+    solver.count_solutions(2, time_limit=0.1)
+    assert solver.timed_out and solver.search_stats["time"] < 0.5
+    solver.load_puzzle({"cages": killer_puzzles[0]})
+    assert solver.count_solutions(2, node_limit=10000) == 1
+    assert not solver.timed_out and solver.search_stats["status"] == "solved"
+
+
+def test_batch_count_reports_timeout(killer_puzzles):
+    solver = KillerSudokuSolver()
+    result = batch.solve_puzzle(solver, "hard", {"cages": killer_puzzles[HARD]}, count_limit=2,
+                                limits={"time_limit": 0.1})
+    assert result["status"] == "timeout" and result["time"] < 0.5
+    assert len(result["partial"]) == 81 and result["fixed"] < 81
+
+
+def test_v1_limits_apply_to_every_engine(sudoku_v1, classic_puzzles):
+    board = classic_puzzles[12]  # Necesita búsqueda con los dos motores
+    for motor in sudoku_v1.MOTORES:
+        for limits in ({"nodosLimite": 5}, {"pasadasLimite": 1}):
+            tabla = sudoku_v1.Sudoku(motor)
+            tabla.establecerDesdeCadena(board)
+            assert not tabla.solucionar(**limits)
+            assert tabla.estado == "timeout" and tabla.celdasFijas() < 81
+        tabla = sudoku_v1.Sudoku(motor)
+        tabla.establecerDesdeCadena(board)
+        assert tabla.solucionar(nodosLimite=100000) and tabla.estado == "resuelto" and tabla.celdasFijas() == 81
@@ -0,0 +1,39 @@
+import random
+from itertools import product
+
+from bitboard import FULL_MASK, BIT, MASK_DIGITS
+from cage_table import COMBINATIONS, cage_combinations, cage_support, cage_union
+
+
+def brute_support(masks, total):
+    # Dígitos de cada celda que aparecen en alguna asignación sin repetidos que suma `total`
+    support = [0] * len(masks)
+    for digits in product(*(MASK_DIGITS[mask] for mask in masks)):
+        if sum(digits) == total and len(set(digits)) == len(digits):
+            for i, digit in enumerate(digits):
+                support[i] |= BIT[digit]
+    return tuple(support)
+
+
+def test_combinations_are_distinct_digits_with_the_sum():
+    for (size, total), combos in COMBINATIONS.items():
+        for combo in combos:
+            assert len(MASK_DIGITS[combo]) == size and sum(MASK_DIGITS[combo]) == total
+    assert cage_combinations(2, 3) == (BIT[1] | BIT[2],)
+    assert cage_combinations(3, 15, FULL_MASK & ~BIT[5]) == tuple(
+        combo for combo in COMBINATIONS[(3, 15)] if not combo & BIT[5])
+    assert cage_union(2, 17) == BIT[8] | BIT[9]
+
+
+def test_cage_support_matches_brute_force():
+    rng = random.Random(3)
+    for _ in range(1500):
+        size = rng.randint(1, 5)
+        masks = tuple(rng.randint(1, FULL_MASK) for _ in range(size))
+        total = rng.randint(size, 9 * size)
+        assert cage_support(masks, total) == brute_support(masks, total), (masks, total)
+
+
+def test_cage_support_without_solution():
+    assert cage_support((BIT[1], BIT[1]), 2) == (0, 0)  # Repetido
+    assert cage_support((BIT[9], BIT[8] | BIT[9]), 10) == (0, 0)  # Ninguna combinación cabe
@@ -0,0 +1,52 @@
+import pytest
+
+from compact import CLASSIC, KILLER, HEADER_SIZE, MAX_CAGE_SLOTS, PuzzleFile, PuzzleWriter, write_puzzles
+from geometry import CELL_INDEX, CELLS
+
+
+def cage_set(cages):
+    return [(sorted(cage['cells'], key=CELL_INDEX.get), cage['sum']) for cage in cages]
+
+
+def test_killer_round_trip(tmp_path, killer_puzzles):
+    path = str(tmp_path / "killer.sdkb")
+    assert write_puzzles(path, KILLER, [{"cages": cages} for cages in killer_puzzles]) == len(killer_puzzles)
+    with PuzzleFile(path) as puzzles:
+        assert puzzles.kind == KILLER and len(puzzles) == len(killer_puzzles)
+        assert puzzles.cage_slots == max(len(cages) for cages in killer_puzzles)
+        for index, cages in enumerate(killer_puzzles):
+            assert cage_set(puzzles.decode(index)['cages']) == cage_set(cages)
+        assert cage_set(puzzles.decode(-1)['cages']) == cage_set(killer_puzzles[-1])
+
+
+def test_killer_cage_cap(tmp_path, killer_puzzles):
+    path = str(tmp_path / "killer.sdkb")
+    singles = [{"id": index, "cells": [cell], "sum": index % 9 + 1} for index, cell in enumerate(CELLS)]
+    with pytest.raises(ValueError):
+        write_puzzles(path, KILLER, [{"cages": killer_puzzles[0]}, {"cages": singles}])
+    with pytest.raises(ValueError):
+        PuzzleWriter(path, KILLER, cage_slots=len(CELLS))
+    with PuzzleWriter(path, KILLER) as writer:
+        writer.write({"cages": killer_puzzles[0]})
+    with PuzzleFile(path) as puzzles:
+        assert puzzles.record_size == len(CELLS) + MAX_CAGE_SLOTS <= 145
+
+
+def test_classic_round_trip(tmp_path, classic_puzzles):
+    path = str(tmp_path / "classic.sdkb")
+    boards = classic_puzzles + ["0" * 81]
+    write_puzzles(path, CLASSIC, iter(boards))  # Un iterador: la cantidad se completa al cerrar
+    with PuzzleFile(path) as puzzles:
+        assert [puzzles.decode(i) for i in range(len(puzzles))] == [board.replace("0", ".") for board in boards]
+        shards = [list(puzzles.shard(number, 4)) for number in range(4)]
+        assert sum(shards, []) == list(range(len(boards)))
+        with pytest.raises(IndexError):
+            puzzles[len(boards)]
+
+
+def test_truncated_file_rejected(tmp_path, classic_puzzles):
+    path = tmp_path / "classic.sdkb"
+    write_puzzles(str(path), CLASSIC, classic_puzzles)
+    path.write_bytes(path.read_bytes()[:HEADER_SIZE + 100])
+    with pytest.raises(ValueError):
+        PuzzleFile(str(path))
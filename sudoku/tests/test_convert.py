@@ -0,0 +1,44 @@
+import json
+import os
+
+import pytest
+
+from conftest import CORPUS_DIR
+from convert_to_json import main
+
+KILLER_CORPUS = os.path.join(CORPUS_DIR, "killer.ndjson")
+
+
+def write_puzzle(path, cages):
+    with open(path, 'w') as f:
+        f.write("\n".join(f"{cage['id']}:{','.join(cage['cells'])}:{cage['sum']}" for cage in cages) + "\n")
+
+
+def test_json_output_single_puzzle(tmp_path, killer_puzzles):
+    source, output = str(tmp_path / "puzzle.txt"), str(tmp_path / "puzzle.json")
+    write_puzzle(source, killer_puzzles[0])
+    assert main([source, "-o", output]) == 0
+    with open(output) as f:
+        assert json.load(f) == {"cages": killer_puzzles[0]}
+
+
+def test_json_output_validates(tmp_path, killer_puzzles):
+    source, output = str(tmp_path / "puzzle.txt"), str(tmp_path / "puzzle.json")
+    write_puzzle(source, killer_puzzles[0][1:])  # Falta una jaula
+    assert main([source, "-o", output]) == 1
+    assert not os.path.exists(output)
+
+
+def test_json_output_rejects_many_puzzles(tmp_path):
+    with pytest.raises(SystemExit):
+        main([KILLER_CORPUS, "-o", str(tmp_path / "all.json")])
+
+
+def test_ndjson_output_skips_invalid(tmp_path, killer_puzzles):
+    source, output = str(tmp_path / "puzzles.ndjson"), str(tmp_path / "out.ndjson")
+    with open(source, 'w') as f:
+        f.write(json.dumps({"id": "ok", "cages": killer_puzzles[0]}) + "\n")
+        f.write(json.dumps({"id": "bad", "cages": killer_puzzles[1][1:]}) + "\n")
+    assert main([source, "-o", output]) == 1
+    with open(output) as f:
+        assert [json.loads(line)["id"] for line in f] == ["ok"]
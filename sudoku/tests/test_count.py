@@ -0,0 +1,33 @@
+from conftest import is_killer_solution
+from sudoku import KillerSudokuSolver
+
+MULTIPLE = 9  # Tablero medio del corpus con 21 soluciones
+
+
+def test_unique_puzzles(killer_puzzles):
+    solver = KillerSudokuSolver()
+    for cages in killer_puzzles[:8]:
+        solver.load_puzzle({"cages": cages})
+        assert solver.count_solutions(2) == 1
+        assert not solver.search_stats["limit_reached"]
+        assert is_killer_solution(cages, solver.solution_string())
+
+
+def test_all_solutions_are_distinct_and_valid(killer_puzzles):
+    cages = killer_puzzles[MULTIPLE]
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": cages})
+    total = solver.count_solutions(0, keep=100)
+    assert total == 21 and not solver.search_stats["limit_reached"]
+    assert len(set(solver.found_solutions)) == total
+    assert all(is_killer_solution(cages, solution) for solution in solver.found_solutions)
+    assert solver.solution_string() == solver.found_solutions[0]
+
+
+def test_limit_and_keep(killer_puzzles):
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": killer_puzzles[MULTIPLE]})
+    assert solver.count_solutions(2) == 2
+    assert solver.search_stats["limit_reached"] and len(solver.found_solutions) == 1
+    solver.load_puzzle({"cages": killer_puzzles[MULTIPLE]})
+    assert solver.count_solutions(5, keep=3) == 5 and len(solver.found_solutions) == 3
@@ -0,0 +1,59 @@
+from itertools import combinations
+
+from dlx import DancingLinks
+
+
+def deadly_rectangle(board):
+    # Cuatro celdas en dos bloques con dos valores cruzados: vaciarlas deja exactamente dos soluciones
+    for r1, r2 in combinations(range(9), 2):
+        for c1, c2 in combinations(range(9), 2):
+            a, b = board[r1 * 9 + c1], board[r1 * 9 + c2]
+            boxes = {(r // 3, c // 3) for r in (r1, r2) for c in (c1, c2)}
+            if a != b and board[r2 * 9 + c1] == b and board[r2 * 9 + c2] == a and len(boxes) == 2:
+                return [r1 * 9 + c1, r1 * 9 + c2, r2 * 9 + c1, r2 * 9 + c2]
+    return None
+
+
+def blank(board, cells):
+    return "".join("." if i in cells else value for i, value in enumerate(board))
+
+
+def test_exact_cover_counts():
+    links = DancingLinks(3)
+    for row, columns in enumerate([[0], [1], [2], [0, 1], [1, 2]]):
+        links.agregarFila(row, columns)
+    assert links.buscar(0) == 3  # {0}{1}{2}, {0,1}{2}, {0}{1,2}
+
+
+def solve(sudoku_v1, board):
+    tabla = sudoku_v1.Sudoku("dlx")
+    tabla.establecerDesdeCadena(board)
+    assert tabla.solucionar()
+    return "".join(str(next(iter(tabla.tab_dom[key]))) for key in tabla.strKeys)
+
+
+def test_dlx_counts_multi_solution_grids(sudoku_v1, classic_puzzles):
+    def count(board, limit):
+        tabla = sudoku_v1.Sudoku("dlx")
+        tabla.establecerDesdeCadena(board)
+        return tabla.contarSoluciones(limit)
+
+    solved, cells = next((solution, deadly_rectangle(solution)) for solution in
+                         (solve(sudoku_v1, board) for board in classic_puzzles) if deadly_rectangle(solution))
+    assert count(solved, 0) == 1
+    assert count(blank(solved, cells), 0) == 2
+    assert count(blank(solved, cells), 1) == 1
+    assert count(blank(solved, cells[:3]), 0) == 1
+    assert count("." * 81, 25) == 25
+    assert count("11" + "." * 79, 0) == 0
+
+
+def test_dlx_solves_corpus(sudoku_v1, classic_puzzles):
+    for board in classic_puzzles[::4]:
+        tabla = sudoku_v1.Sudoku("dlx")
+        tabla.establecerDesdeCadena(board)
+        assert tabla.contarSoluciones(2) == 1
+        solution = solve(sudoku_v1, board)
+        assert all(given in ".0" or given == value for given, value in zip(board, solution))
+        for unit in ([r * 9 + c for c in range(9)] for r in range(9)):
+            assert sorted(solution[i] for i in unit) == list("123456789")
@@ -0,0 +1,89 @@
+import random
+import time
+
+from bitboard import MASK_DIGITS
+from editor import PuzzleEditor
+from geometry import CELLS
+from sudoku import KillerSudokuSolver
+
+
+def rebuilt(editor):
+    # Estado de referencia: un editor nuevo con las mismas jaulas y los mismos dígitos dados
+    fresh = PuzzleEditor({"cages": editor.cages})
+    fresh.apply(fresh.cages, editor.given_pairs())
+    return fresh
+
+
+def test_edits_match_fresh_rebuild(killer_puzzles):
+    rng = random.Random(24)
+    solver = KillerSudokuSolver()
+    for cages in killer_puzzles[:8:2]:
+        solver.load_puzzle({"cages": cages})
+        assert solver.solver()
+        solution = solver.solution_string()
+        editor = PuzzleEditor({"cages": cages})
+        checkpoints = [editor.checkpoint()]
+        for _ in range(25):
+            action = rng.random()
+            if action < 0.45:
+                cell = rng.randrange(81)
+                editor.set_cell(CELLS[cell], int(solution[cell]) if rng.random() < 0.8 else rng.randint(1, 9))
+            elif action < 0.6 and editor.givens:
+                editor.clear_cell(CELLS[rng.choice(editor.givens)[0]])
+            elif action < 0.75:
+                splittable = [cage for cage in editor.cages if len(cage['cells']) > 1]
+                cage = rng.choice(splittable)
+                cells = cage['cells'][:rng.randint(1, len(cage['cells']) - 1)]
+                editor.split_cage(cage['id'], cells, sum(int(solution[CELLS.index(cell)]) for cell in cells))
+            elif action < 0.85:
+                first, second = rng.sample(editor.cages, 2)
+                digits = [{solution[CELLS.index(cell)] for cell in cage['cells']} for cage in (first, second)]
+                if len(first['cells']) + len(second['cells']) <= 9 and not digits[0] & digits[1]:  # Solo uniones que conservan la solución
+                    editor.merge_cages(first['id'], second['id'])
+            elif action < 0.95:
+                checkpoints.append(editor.checkpoint())
+            else:
+                editor.rollback(rng.choice(checkpoints))
+            fresh = rebuilt(editor)
+            assert editor.consistent == fresh.consistent
+            if fresh.consistent:  # Tras una contradicción los dominios dependen de dónde se detuvo la propagación
+                assert list(editor.solver.board.domains) == list(fresh.solver.board.domains)
+
+
+def test_layer_edits_skip_rebase(killer_puzzles):
+    solver = KillerSudokuSolver()
+    edit_time = rebuild_time = 0.0
+    for cages in killer_puzzles[:12]:
+        solver.load_puzzle({"cages": cages})
+        assert solver.solver()
+        solution = solver.solution_string()
+        editor = PuzzleEditor({"cages": cages})
+        cage = max(editor.cages, key=lambda cage: len(cage['cells']))
+        cells = cage['cells'][:len(cage['cells']) // 2]
+        cage_sum = sum(int(solution[CELLS.index(cell)]) for cell in cells)
+        editor.split_cage(cage['id'], cells, cage_sum)  # Quita una jaula de la base: la rehace una vez
+        new_id = editor.cages[-1]['id']
+        rebases = editor.stats["rebases"]
+        for _ in range(3):
+            for edit in (lambda: editor.merge_cages(cage['id'], new_id),
+                         lambda: editor.split_cage(cage['id'], cells, cage_sum, new_id)):
+                start_time = time.perf_counter()
+                assert edit()
+                edit_time += time.perf_counter() - start_time
+                start_time = time.perf_counter()
+                fresh = rebuilt(editor)
+                rebuild_time += time.perf_counter() - start_time
+                assert list(editor.solver.board.domains) == list(fresh.solver.board.domains)
+        assert editor.stats["rebases"] == rebases  # Las jaulas editadas quedan en capas
+    assert edit_time < rebuild_time
+
+
+def test_candidates_follow_givens(killer_puzzles):
+    editor = PuzzleEditor({"cages": killer_puzzles[0]})
+    before = editor.candidates()
+    digit = before["A1"][-1]
+    assert editor.set_cell("A1", digit)
+    assert editor.candidates()["A1"] == [digit]
+    editor.clear_cell("A1")
+    assert editor.candidates() == before
+    assert all(MASK_DIGITS[mask] for mask in editor.solver.board.domains)
@@ -0,0 +1,22 @@
+from collections import deque
+
+from generator import KillerGenerator, generate_puzzles
+from sudoku import KillerSudokuSolver
+
+
+def test_generated_puzzles_are_unique():
+    solver = KillerSudokuSolver()
+    for data in generate_puzzles(2, seed=19):
+        solver.load_puzzle({"cages": data['cages']})
+        assert solver.count_solutions(2) == 1
+        solver.load_puzzle({"cages": data['cages']})
+        assert solver.solver() and solver.solution_string() == data['solution']
+
+
+def test_make_unique_rechecks_after_splits():
+    generator = KillerGenerator(seed=5, merge_singles=False)
+    grid = generator.random_grid()
+    cages = [[cell for cell in range(81) if cell // 9 == row] for row in range(9)]  # Nueve jaulas de una fila
+    cages = generator.make_unique(grid, cages, deque())
+    assert generator.alternative(grid, cages, deque()) is None
+    assert sorted(cell for cage in cages for cell in cage) == list(range(81))
@@ -0,0 +1,17 @@
+from geometry import BOX_PEERS, CELL_UNITS, CELLS, LINE_PEERS, PEERS, UNITS
+
+
+def test_units_and_peers():
+    assert len(UNITS) == 27 and all(len(set(unit)) == 9 for unit in UNITS)
+    assert all(sorted(cell for unit in UNITS[i:i + 9] for cell in unit) == list(range(81)) for i in (0, 9, 18))
+    for index in range(81):
+        assert len(CELL_UNITS[index]) == 3 and all(index in UNITS[unit] for unit in CELL_UNITS[index])
+        assert len(PEERS[index]) == 20 and index not in PEERS[index]
+        assert set(PEERS[index]) == {cell for unit in CELL_UNITS[index] for cell in UNITS[unit]} - {index}
+        assert len(LINE_PEERS[index]) == 16 and len(BOX_PEERS[index]) == 8
+        assert all(index in PEERS[peer] for peer in PEERS[index])
+
+
+def test_v1_tables_use_cell_names(sudoku_v1):
+    assert sudoku_v1.PARES["A1"] == tuple(CELLS[peer] for peer in PEERS[0])
+    assert set(sudoku_v1.PARES["E5"]) == set(sudoku_v1.PARES_LINEA["E5"]) | set(sudoku_v1.PARES_BLOQUE["E5"])
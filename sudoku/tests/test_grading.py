@@ -0,0 +1,27 @@
+from geometry import CELLS
+from grading import Grader
+from sudoku import KillerSudokuSolver
+
+
+def given_cages(grid):
+    # Un tablero de jaulas de una celda: todas las celdas quedan resueltas antes de aplicar estrategias
+    return {"cages": [{"id": index, "cells": [cell], "sum": int(grid[index])} for index, cell in enumerate(CELLS)]}
+
+
+def test_grade_corpus(killer_puzzles):
+    grader = Grader()
+    for cages in killer_puzzles[:6]:
+        result = grader.grade({"cages": cages})
+        assert result["solutions"] == 1
+        assert result["difficulty"] in ("easy", "medium", "hard")
+
+
+def test_solved_board_is_verified(killer_puzzles):
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": killer_puzzles[0]})
+    assert solver.solver()
+    grid = solver.solution_string()
+    grader = Grader(cache_size=0)
+    assert grader.grade(given_cages(grid))["solutions"] == 1
+    swapped = grid[1] + grid[0] + grid[2:]  # Dos celdas vecinas intercambiadas: se repiten dígitos en sus unidades
+    assert grader.grade(given_cages(swapped))["solutions"] == 0
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+from conftest import SUDOKU_DIR, load_module
+
+
+@pytest.fixture(scope="module")
+def lote(sudoku_v1):
+    # `lote` importa `sudoku` por nombre: durante la carga ese nombre apunta al de v1
+    killer = sys.modules.get("sudoku")
+    sys.modules["sudoku"] = sudoku_v1
+    try:
+        return load_module("lote", os.path.join(SUDOKU_DIR, "v1", "lote.py"))
+    finally:
+        sys.modules["sudoku"] = killer
+
+
+def test_cargar_lineas_rejects_bad_lines(lote):
+    good = "." * 80 + "1"
+    assert lote.cargarLineas(["# tableros", "", f"{good} easy"]) == [good]
+    with pytest.raises(ValueError, match="Linea 3"):
+        lote.cargarLineas([good, "", good[:-1]])
+    with pytest.raises(ValueError, match="Linea 1"):
+        lote.cargarLineas(["x" + good[1:]])
+
+
+def test_resolver_lote_matches_scalar(lote, classic_puzzles):
+    estadisticas = {}
+    soluciones = lote.resolverLote(classic_puzzles, estadisticas=estadisticas)
+    assert soluciones == [lote.resolverEscalar(tablero) for tablero in classic_puzzles]
+    assert estadisticas["propagacion"] + estadisticas["escalar"] == len(classic_puzzles)
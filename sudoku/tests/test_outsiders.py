@@ -0,0 +1,22 @@
+from bitboard import MASK_DIGITS
+from sudoku import KillerSudokuSolver, named_adjacent_constraints
+
+
+def test_outsiders_keep_solution_digits(killer_puzzles):
+    solver = KillerSudokuSolver()
+    reduced = 0
+    for cages in killer_puzzles[:16]:
+        solver.load_puzzle({"cages": cages})
+        assert solver.solver()
+        solution = solver.solution_string()
+        solver.load_puzzle({"cages": cages})
+        reduced += solver.outsiders()
+        assert not solver.outsiders()  # Las reducciones guardadas ya están aplicadas
+        for cell, mask in enumerate(solver.board.domains):
+            assert int(solution[cell]) in MASK_DIGITS[mask]
+    assert reduced > 0
+
+
+def test_region_catalogue_is_shared():
+    assert named_adjacent_constraints() is named_adjacent_constraints()
+    assert sum(len(regions) for regions in named_adjacent_constraints().values()) > 27
@@ -0,0 +1,39 @@
+from conftest import is_killer_solution
+from parallel_search import solve_parallel, split_search
+from sudoku import KillerSudokuSolver
+
+HARD = 17  # Tablero del corpus que necesita búsqueda
+
+
+def test_split_search_covers_root(killer_puzzles):
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": killer_puzzles[HARD]})
+    solver.outsiders()
+    assert solver.propagate()
+    before = list(solver.board.domains)
+    frontier, solution = split_search(solver, 8)
+    assert solution is not None or len(frontier) >= 8
+    assert list(solver.board.domains) == before  # La expansión deja el tablero en la raíz
+
+
+def test_solve_parallel(killer_puzzles):
+    solver = KillerSudokuSolver()
+    for index in (0, HARD):
+        solver.load_puzzle({"cages": killer_puzzles[index]})
+        assert solve_parallel(solver, workers=2, branches=8)
+        assert is_killer_solution(killer_puzzles[index], solver.solution_string())
+
+
+def test_solve_parallel_stats_match_solver(killer_puzzles):
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": killer_puzzles[HARD]})
+    solver.timed_out = solver.cancelled = True  # Restos de una búsqueda anterior
+    assert solve_parallel(solver, workers=2, branches=8, pass_limit=10 ** 6)
+    assert solver.search_stats["status"] == "solved" and solver.search_stats["fixed"] == 81
+    assert 0 < solver.search_stats["passes"] < 10 ** 6
+    assert not solver.timed_out and not solver.cancelled and solver.limits is None
+    assert {"nodes", "backtracks", "time", "status", "fixed"} <= set(solver.search_stats)
+
+    solver.load_puzzle({"cages": killer_puzzles[HARD]})
+    assert not solve_parallel(solver, workers=2, branches=8, time_limit=0.0)
+    assert solver.search_stats["status"] == "timeout" and solver.search_stats["fixed"] < 81
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from compact import encode_killer
+from sudoku import KillerSudokuSolver, parse_puzzle
+
+
+def normalized(cages):
+    return sorted((sorted(cage['cells']), cage['sum']) for cage in cages)
+
+
+def test_formats_agree(tmp_path, killer_puzzles):
+    cages = killer_puzzles[3]
+    text = "\n".join(f"{cage['id']}:{','.join(cage['cells'])}:{cage['sum']}" for cage in cages)
+    one_line = text.replace("\n", ";")
+    json_path = tmp_path / "tablero.json"
+    json_path.write_text(json.dumps({"cages": cages}))
+    text_path = tmp_path / "input.txt"
+    text_path.write_text(text)
+    formats = [{"cages": cages}, cages, tuple(cages), encode_killer(cages), text, one_line,
+               json.dumps({"cages": cages}), json.dumps(cages), str(json_path), text_path]
+    expected = normalized(cages)
+    for puzzle in formats:
+        assert normalized(parse_puzzle(puzzle)) == expected
+
+
+def test_constructor_and_load_puzzle_agree(killer_puzzles):
+    cages = killer_puzzles[3]
+    built = KillerSudokuSolver({"cages": cages})
+    loaded = KillerSudokuSolver()
+    loaded.load_puzzle(encode_killer(cages))
+    assert list(built.board.domains) == list(loaded.board.domains)
+    assert built.solver() and loaded.solver()
+    assert built.solution_string() == loaded.solution_string()
+
+
+def test_unknown_format():
+    with pytest.raises(TypeError):
+        parse_puzzle(42)
@@ -0,0 +1,25 @@
+from solution_cache import is_valid_grid
+
+
+def test_alldif_and_finblock_reach_fixpoint(sudoku_v1, classic_puzzles):
+    for board in classic_puzzles[:10]:
+        tabla = sudoku_v1.Sudoku()
+        tabla.establecerDesdeCadena(board)
+        tabla.allDif()
+        assert tabla.allDif() == 0
+        # Ninguna celda resuelta comparte valor con una vecina de fila o columna
+        for key in tabla.strKeys:
+            if len(tabla.tab_dom[key]) == 1:
+                assert all(tabla.tab_dom[key].isdisjoint(tabla.tab_dom[llave]) for llave in sudoku_v1.PARES_LINEA[key])
+        tabla.finBlock()
+        assert tabla.finBlock() == 0
+
+
+def test_backtracking_solves_classic_corpus(sudoku_v1, classic_puzzles):
+    for board in classic_puzzles[:10]:
+        tabla = sudoku_v1.Sudoku()
+        tabla.establecerDesdeCadena(board)
+        assert tabla.solucionar()
+        solution = "".join(str(next(iter(tabla.tab_dom[key]))) for key in tabla.strKeys)
+        assert is_valid_grid(solution)
+        assert all(given in ".0" or given == digit for given, digit in zip(board, solution))
@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+import pytest
+
+from server import SolveServer
+
+HARD = 16  # Tablero del corpus que tarda más de un segundo en resolverse
+
+
+def run_with_server(coroutine, **options):
+    # Ejecuta `coroutine(server)` en un bucle nuevo y cierra el pool al terminar
+    async def main():
+        server = SolveServer(workers=2, **options)
+        try:
+            return await coroutine(server)
+        finally:
+            server.executor.shutdown(cancel_futures=True)
+    return asyncio.run(main())
+
+
+def test_identical_requests_are_coalesced(killer_puzzles):
+    cages = killer_puzzles[HARD]
+    shuffled = list(reversed(cages))  # Mismas jaulas en otro orden: misma clave
+
+    async def scenario(server):
+        results = await asyncio.gather(server.solve({"id": 1, "cages": cages}), server.solve({"id": 2, "cages": shuffled}))
+        return results, server.stats
+
+    (first, second), stats = run_with_server(scenario)
+    assert first["status"] == second["status"] == "solved"
+    assert first["solution"] == second["solution"]
+    assert second.get("coalesced") and not first.get("coalesced")
+    assert stats["coalesced"] == 1 and stats["solved"] == 2
+
+
+def test_deadline_and_invalid_requests(killer_puzzles):
+    async def scenario(server):
+        return await asyncio.gather(server.solve({"id": "slow", "cages": killer_puzzles[HARD], "deadline": 0.2}),
+                                    server.solve({"id": "fast", "cages": killer_puzzles[0]}),
+                                    server.solve({"id": "bad", "cages": killer_puzzles[0][1:]}))
+
+    slow, fast, bad = run_with_server(scenario)
+    assert slow["status"] == "timeout" and slow["time"] < 1.0
+    assert fast["status"] == "solved"
+    assert bad["status"] == "invalid"
+
+
+def test_unix_socket_protocol(tmp_path, killer_puzzles):
+    path = str(tmp_path / "killer.sock")
+
+    async def scenario(server):
+        serving = asyncio.ensure_future(server.serve(path=path))
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if serving.done() or (tmp_path / "killer.sock").exists():
+                break
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b"not json\n")
+        writer.write((json.dumps({"id": 7, "cages": killer_puzzles[1]}) + "\n").encode())
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(2)]
+        writer.close()
+        serving.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await serving
+        return responses
+
+    responses = run_with_server(scenario)
+    assert sorted(response["status"] for response in responses) == ["invalid", "solved"]
+    assert next(response for response in responses if response["status"] == "solved")["id"] == 7
+
+
+def test_coalesced_request_keeps_its_own_deadline(killer_puzzles):
+    cages = killer_puzzles[HARD]
+
+    async def scenario(server):
+        impatient = asyncio.ensure_future(server.solve({"id": "impatient", "cages": cages, "deadline": 0.3}))
+        await asyncio.sleep(0.05)  # El pool ya empezó con el plazo del primero
+        patient = await server.solve({"id": "patient", "cages": cages, "deadline": 10})
+        return await impatient, patient, server.stats
+
+    impatient, patient, stats = run_with_server(scenario)
+    assert impatient["status"] == "timeout"
+    assert patient["coalesced"] and patient["status"] == "solved" and patient["solution"]
+    assert stats["resubmitted"] == 1
+
+
+def test_stats_follow_result_status(killer_puzzles):
+    async def scenario(server):
+        async def worker_result(data, count_limit, entry):
+            # El proceso agotó el plazo con el que se envió antes de que venciera el pedido
+            return {"id": None, "status": "timeout", "solution": None, "nodes": 12, "partial": "." * 81}
+        server.run_solve = worker_result
+        timeout = await server.solve({"id": 1, "cages": killer_puzzles[0], "deadline": 5})
+        del server.run_solve
+        solved = await server.solve({"id": 2, "cages": killer_puzzles[1]})
+        return timeout, solved, server.stats
+
+    timeout, solved, stats = run_with_server(scenario)
+    assert timeout["status"] == "timeout" and solved["status"] == "solved"
+    assert stats["timeouts"] == 1 and stats["solved"] == 1 and stats["errors"] == 0
@@ -0,0 +1,90 @@
+import random
+
+from geometry import CELLS, CELL_INDEX
+from solution_cache import SolutionCache, canonical_classic, canonical_killer, is_valid_grid
+from sudoku import KillerSudokuSolver
+
+
+def random_symmetry(rng):
+    # Celda de origen de cada posición: bandas, filas, pilas y columnas permutadas y, a veces, trasposición
+    rows = [3 * band + row for band in rng.sample(range(3), 3) for row in rng.sample(range(3), 3)]
+    cols = [3 * stack + col for stack in rng.sample(range(3), 3) for col in rng.sample(range(3), 3)]
+    source = [rows[i // 9] * 9 + cols[i % 9] for i in range(81)]
+    if rng.random() < 0.5:
+        source = [source[(i % 9) * 9 + i // 9] for i in range(81)]
+    return source
+
+
+def transform_board(board, source, relabel=None):
+    return "".join((relabel or {}).get(board[index], board[index]) for index in source)
+
+
+def transform_cages(cages, source):
+    target = {index: position for position, index in enumerate(source)}
+    return [{"id": cage['id'], "cells": [CELLS[target[CELL_INDEX[cell]]] for cell in cage['cells']], "sum": cage['sum']}
+            for cage in cages]
+
+
+def unreachable(_):
+    raise AssertionError("se esperaba un acierto de la caché")
+
+
+def test_classic_variants_hit(sudoku_v1, classic_puzzles):
+    def solve(board):
+        tabla = sudoku_v1.Sudoku("dlx")
+        tabla.establecerDesdeCadena(board)
+        return "".join(str(next(iter(tabla.tab_dom[key]))) for key in tabla.strKeys) if tabla.solucionar() else None
+
+    rng = random.Random(22)
+    cache = SolutionCache()
+    for board in classic_puzzles[:8]:
+        solution = cache.solve_classic(board, solve)
+        assert is_valid_grid(solution)
+        for _ in range(5):
+            source = random_symmetry(rng)
+            relabel = dict(zip("123456789", rng.sample("123456789", 9)))
+            variant = transform_board(board, source, relabel)
+            assert canonical_classic(variant)[0] == canonical_classic(board)[0]
+            # La transformación inversa de la solución canónica da la solución de la variante
+            assert cache.solve_classic(variant, unreachable) == transform_board(solution, source, relabel)
+    assert cache.stats["misses"] == 8 and cache.stats["hits"] == 40
+
+
+def test_killer_variants_hit(killer_puzzles):
+    def solve(cages):
+        solver.load_puzzle(cages)
+        return solver.solution_string() if solver.solver() else None
+
+    solver = KillerSudokuSolver()
+    rng = random.Random(22)
+    cache = SolutionCache()
+    for cages in killer_puzzles[:6]:
+        solution = cache.solve_killer(cages, solve)
+        for _ in range(4):
+            source = random_symmetry(rng)
+            variant = transform_cages(cages, source)
+            rng.shuffle(variant)
+            assert canonical_killer(variant)[0] == canonical_killer(cages)[0]
+            assert cache.solve_killer(variant, unreachable) == transform_board(solution, source)
+    assert cache.stats["misses"] == 6 and cache.stats["hits"] == 24
+
+
+def test_wrong_stored_solution_is_not_returned(classic_puzzles):
+    board = classic_puzzles[0]
+    key = canonical_classic(board)[0]
+    cache = SolutionCache()
+    cache.put(key, "1" * 81)  # Una entrada corrupta no se devuelve: se vuelve a resolver
+    assert cache.solve_classic(board, lambda _: None) is None
+    assert cache.stats["misses"] == 1
+
+
+def test_disk_store(tmp_path, killer_puzzles):
+    path = str(tmp_path / "soluciones")
+    solver = KillerSudokuSolver()
+    solver.load_puzzle(killer_puzzles[0])
+    assert solver.solver()
+    with SolutionCache(path=path) as cache:
+        cache.solve_killer(killer_puzzles[0], lambda _: solver.solution_string())
+    with SolutionCache(path=path) as cache:
+        assert cache.solve_killer(killer_puzzles[0], unreachable) == solver.solution_string()
+        assert cache.stats["disk_hits"] == 1
@@ -0,0 +1,23 @@
+from conftest import is_killer_solution
+from sudoku import KillerSudokuSolver
+
+
+def test_search_solves_corpus(killer_puzzles):
+    solver = KillerSudokuSolver()
+    for cages in killer_puzzles[:16] + killer_puzzles[18:]:  # Sin los dos tableros más lentos
+        solver.load_puzzle({"cages": cages})
+        assert solver.solver()
+        assert is_killer_solution(cages, solver.solution_string())
+        assert solver.search_stats["status"] == "solved" and solver.search_stats["fixed"] == 81
+
+
+def test_unsolvable_puzzle(killer_puzzles):
+    cages = [dict(cage) for cage in killer_puzzles[0]]
+    pair = next(cage for cage in cages if len(cage['cells']) == 2)
+    other = next(cage for cage in cages if cage is not pair)
+    other['sum'] += pair['sum'] - 2
+    pair['sum'] = 2  # Dos dígitos distintos no suman 2 (el total sigue siendo 405)
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": cages})
+    assert not solver.solver()
+    assert solver.search_stats["status"] == "unsolved"
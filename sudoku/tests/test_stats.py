@@ -0,0 +1,40 @@
+from stats import StrategyStats
+from sudoku import KillerSudokuSolver
+
+
+def test_record_merge_and_reset():
+    stats = StrategyStats()
+    stats.record("hidden_singles", 0.5, 3, 1)
+    stats.record("hidden_singles", 0.25, 0, 0)
+    assert stats["hidden_singles"] == {"calls": 2, "time": 0.75, "eliminated": 3, "fixed": 1, "productive_calls": 1}
+    stats.merge(stats.as_dict())
+    assert stats["hidden_singles"]["calls"] == 4 and stats["hidden_singles"]["productive_calls"] == 2
+    other = StrategyStats()
+    other.merge(stats)
+    assert other.as_dict() == stats.as_dict()
+    stats.reset()
+    assert all(values["calls"] == 0 and values["time"] == 0 for values in stats.as_dict().values())
+
+
+def test_solver_fills_counters(killer_puzzles):
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": killer_puzzles[0]})
+    assert solver.solver()
+    counters = solver.strategy_stats.as_dict()
+    assert counters["outsiders"]["calls"] >= 1 and counters["obvious_singles"]["calls"] >= 1
+    assert sum(values["eliminated"] for values in counters.values()) > 0
+    for values in counters.values():
+        assert values["productive_calls"] <= values["calls"]
+        assert values["fixed"] <= values["eliminated"]
+    solver.load_puzzle({"cages": killer_puzzles[0]})
+    assert solver.solver()
+    # Cada resolución empieza con los contadores en cero: la misma búsqueda da las mismas cuentas
+    again = solver.strategy_stats.as_dict()
+    assert {name: values["calls"] for name, values in again.items()} == {name: values["calls"] for name, values in counters.items()}
+
+
+def test_disabled_stats(killer_puzzles):
+    solver = KillerSudokuSolver()
+    solver.strategy_stats = None
+    solver.load_puzzle({"cages": killer_puzzles[0]})
+    assert solver.solver()
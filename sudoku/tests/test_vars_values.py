@@ -0,0 +1,32 @@
+from bitboard import MASK_DIGITS
+from geometry import CELLS
+from sudoku import KillerSudokuSolver
+
+
+def test_view_matches_board(killer_puzzles):
+    cages = killer_puzzles[0]
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": cages})
+    solver.outsiders()
+    view = solver.vars_values
+    assert len(view) == 81 and list(view) == list(CELLS)
+    for cage in cages:
+        for cell in cage['cells']:
+            cage_id, cage_sum, domain = view[cell]
+            assert (cage_id, cage_sum) == (cage['id'], cage['sum'])
+            assert sorted(domain) == list(MASK_DIGITS[solver.board.get(CELLS.index(cell))])
+
+
+def test_legacy_writes_reach_the_board(killer_puzzles):
+    solver = KillerSudokuSolver()
+    solver.load_puzzle({"cages": killer_puzzles[0]})
+    view = solver.vars_values
+    view["A1"][2].intersection_update({1, 2, 3})
+    view["A1"][2].discard(3)
+    assert sorted(view["A1"][2]) == [1, 2] and solver.board.count(0) == 2
+    view["A2"] = [view["A2"][0], view["A2"][1], {7}]
+    assert solver.board.value(1) == 7 and view["A2"] == [view["A2"][0], view["A2"][1], {7}]
+    mark = solver.board.mark()
+    view["A3"][2] = {5}
+    solver.board.undo(mark)
+    assert len(view["A3"][2]) == 9
@@ -0,0 +1,155 @@
+import sys
+import time
+
+# Dancing Links (Algoritmo X de Knuth) para problemas de cobertura exacta.
+#
+# La matriz dispersa se guarda en listas paralelas indexadas por nodo: izq, der, arriba, abajo,
+# columna y fila. El nodo 0 es la raiz y los nodos 1..columnas son las cabeceras de las columnas.
+# Cubrir una columna la saca de la lista de cabeceras y saca de sus columnas a las filas que la
+# contienen; descubrirla deshace exactamente esos enlaces en orden inverso.
+
+
+class DancingLinks:
+    def __init__(self, columnas : int) -> None:
+        self.columnas : int = columnas
+        total = columnas + 1
+        self.izq : list[int] = [i - 1 for i in range(total)]
+        self.izq[0] = columnas
+        self.der : list[int] = [i + 1 for i in range(total)]
+        self.der[columnas] = 0
+        self.arriba : list[int] = list(range(total))
+        self.abajo : list[int] = list(range(total))
+        self.columna : list[int] = list(range(total))
+        self.fila : list[int] = [-1] * total
+        self.tamano : list[int] = [0] * total  # Cantidad de nodos de cada columna
+        self.cantidad : int = 0
+        self.solucion : list[int] = []
+        self.primera : list[int] | None = None
+        # Presupuesto de buscar: (instante limite, nodos maximos); agotado pasa a True al superarlo
+        self.limites : tuple[float | None, int | None] | None = None
+        self.nodos : int = 0  # Filas probadas por _buscar en columnas con mas de una fila
+        self.agotado : bool = False
+
+
+    def agregarFila(self, id : int, columnas : list[int]) -> None:
+        # Agrega una fila con un nodo en cada columna indicada (numeradas desde 0)
+        primero = len(self.izq)
+        for posicion, col in enumerate(columnas):
+            nodo = primero + posicion
+            cabecera = col + 1
+            self.izq.append(nodo - 1 if posicion > 0 else primero + len(columnas) - 1)
+            self.der.append(nodo + 1 if posicion < len(columnas) - 1 else primero)
+            self.arriba.append(self.arriba[cabecera])
+            self.abajo.append(cabecera)
+            self.abajo[self.arriba[cabecera]] = nodo
+            self.arriba[cabecera] = nodo
+            self.columna.append(cabecera)
+            self.fila.append(id)
+            self.tamano[cabecera] += 1
+
+
+    def cubrir(self, cabecera : int) -> None:
+        izq, der, arriba, abajo, columna, tamano = self.izq, self.der, self.arriba, self.abajo, self.columna, self.tamano
+        der[izq[cabecera]] = der[cabecera]
+        izq[der[cabecera]] = izq[cabecera]
+        i = abajo[cabecera]
+        while i != cabecera:
+            j = der[i]
+            while j != i:
+                abajo[arriba[j]] = abajo[j]
+                arriba[abajo[j]] = arriba[j]
+                tamano[columna[j]] -= 1
+                j = der[j]
+            i = abajo[i]
+
+
+    def descubrir(self, cabecera : int) -> None:
+        izq, der, arriba, abajo, columna, tamano = self.izq, self.der, self.arriba, self.abajo, self.columna, self.tamano
+        i = arriba[cabecera]
+        while i != cabecera:
+            j = izq[i]
+            while j != i:
+                tamano[columna[j]] += 1
+                abajo[arriba[j]] = j
+                arriba[abajo[j]] = j
+                j = izq[j]
+            i = arriba[i]
+        der[izq[cabecera]] = cabecera
+        izq[der[cabecera]] = cabecera
+
+
+    def buscar(self, limite : int = 1, limites : tuple[float | None, int | None] | None = None) -> int:
+        # Cuenta las coberturas exactas hasta llegar a `limite` (0 = sin limite).
+        # La primera cobertura encontrada queda en `primera` como lista de ids de fila.
+        # Con `limites` (instante limite de time.perf_counter, nodos maximos) la busqueda se abandona al
+        # agotarse alguno y agotado queda en True; la cantidad contada hasta ahi no es la total.
+        self.cantidad = 0
+        self.solucion = []
+        self.primera = None
+        self.limites = limites
+        self.nodos = 0
+        self.agotado = False
+        limiteRecursion = sys.getrecursionlimit()
+        if limiteRecursion < self.columnas + 100:
+            sys.setrecursionlimit(self.columnas + 100)
+        try:
+            self._buscar(limite)
+        finally:
+            sys.setrecursionlimit(limiteRecursion)
+        return self.cantidad
+
+
+    def _buscar(self, limite : int) -> bool:
+        der = self.der
+        if der[0] == 0:
+            self.cantidad += 1
+            if self.primera is None:
+                self.primera = list(self.solucion)
+            return limite > 0 and self.cantidad >= limite
+
+        # Heuristica S de Knuth: la columna con menos filas
+        tamano = self.tamano
+        cabecera = der[0]
+        mejor = tamano[cabecera]
+        c = der[cabecera]
+        while c != 0 and mejor > 1:
+            if tamano[c] < mejor:
+                cabecera, mejor = c, tamano[c]
+            c = der[c]
+        if mejor == 0:
+            return False
+
+        self.cubrir(cabecera)
+        r = self.abajo[cabecera]
+        terminado = False
+        while r != cabecera and not terminado:
+            if mejor > 1:  # Solo cuentan como nodos las elecciones entre varias filas
+                if self.limites is not None and self.agotar():
+                    terminado = True
+                    break
+                self.nodos += 1
+            self.solucion.append(self.fila[r])
+            j = der[r]
+            while j != r:
+                self.cubrir(self.columna[j])
+                j = der[j]
+            terminado = self._buscar(limite)
+            j = self.izq[r]
+            while j != r:
+                self.descubrir(self.columna[j])
+                j = self.izq[j]
+            self.solucion.pop()
+            r = self.abajo[r]
+        self.descubrir(cabecera)
+        return terminado
+
+
+    def agotar(self) -> bool:
+        # Indica si se agoto el presupuesto de buscar. El limite de nodos se revisa en cada fila
+        # probada y el de tiempo cada 16, como Sudoku.agotado.
+        if not self.agotado:
+            instante, nodos = self.limites
+            if (nodos is not None and self.nodos >= nodos) or (
+                    instante is not None and not self.nodos & 15 and time.perf_counter() > instante):
+                self.agotado = True
+        return self.agotado
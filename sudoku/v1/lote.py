@@ -0,0 +1,178 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Modulos compartidos con killer (solution_cache)
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin el, resolverLote resuelve tablero por tablero con Sudoku
+    np = None
+
+from sudoku import Sudoku
+from solution_cache import SolutionCache
+
+# Resolucion por lotes de tableros clasicos con numpy.
+#
+# Los N tableros se guardan en un arreglo (N, 9, 9) de uint16 con una mascara de 9 bits por celda
+# (bit v - 1 encendido si el valor v es posible), en el orden de las cadenas de 81 caracteres
+# (A1, B1, ..., I9: la fila del arreglo es el numero y la columna la letra). propagarLote aplica a
+# todos los tableros a la vez las mismas reglas que Sudoku.resolver:
+# - allDif: el valor de cada celda resuelta se quita de su fila, su columna y su bloque,
+# - finBlock / hidden singles: un valor que solo cabe en una celda de una fila, columna o bloque
+#   queda como unico valor de esa celda.
+# Solo los tableros que la propagacion no resuelve pasan al motor escalar (Sudoku.solucionar).
+
+COMPLETO : int = 0x1FF  # Mascara con los nueve valores
+
+if np is not None:
+    BITS = np.array([bin(mascara).count("1") for mascara in range(COMPLETO + 1)], dtype=np.uint8)  # Valores de cada mascara
+    VALOR = np.array([mascara.bit_length() if bin(mascara).count("1") == 1 else 0
+                      for mascara in range(COMPLETO + 1)], dtype=np.uint8)  # Valor de una mascara con un solo bit
+
+
+def cargarLineas(lineas) -> list[str]:
+    # Toma el primer campo de cada linea de 81 caracteres; omite las lineas vacias y los comentarios ('#').
+    # Un tablero que no tenga exactamente 81 caracteres entre '0'-'9' y '.' se informa con su numero de linea.
+    tableros = []
+    for numero, linea in enumerate(lineas, start=1):
+        linea = linea.strip()
+        if linea and not linea.startswith("#"):
+            tablero = linea.split()[0]
+            if len(tablero) != 81 or tablero.strip("0123456789."):
+                raise ValueError(f"Linea {numero}: se esperaban 81 caracteres entre 0-9 y '.', se recibio {tablero!r}")
+            tableros.append(tablero)
+    return tableros
+
+
+def tablerosAMascaras(tableros : list[str]) -> "np.ndarray":
+    # Convierte N cadenas de 81 caracteres en el arreglo (N, 9, 9) de mascaras
+    datos = np.frombuffer("".join(tableros).encode("ascii"), dtype=np.uint8).reshape(len(tableros), 9, 9)
+    digitos = datos.astype(np.int16) - ord("0")
+    dados = (digitos >= 1) & (digitos <= 9)
+    return np.where(dados, np.left_shift(1, np.clip(digitos - 1, 0, 8)), COMPLETO).astype(np.uint16)
+
+
+def _aBloques(mascaras : "np.ndarray") -> "np.ndarray":
+    # (N, 9, 9) por filas -> (N, 9, 9) por bloques: eje 1 = bloque, eje 2 = celda dentro del bloque.
+    # La misma transformacion deshace el cambio.
+    n = mascaras.shape[0]
+    return mascaras.reshape(n, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(n, 9, 9)
+
+
+def _quitarResueltos(unidades : "np.ndarray") -> "np.ndarray":
+    # allDif sobre unidades (N, 9, 9): quita de cada celda sin resolver los valores resueltos de su unidad
+    resueltas = (BITS[unidades] == 1)
+    valores = np.bitwise_or.reduce(np.where(resueltas, unidades, 0), axis=2)
+    return np.where(resueltas, unidades, unidades & ~valores[:, :, None])
+
+
+def _unicosEnUnidad(unidades : "np.ndarray") -> "np.ndarray":
+    # Hidden singles sobre unidades (N, 9, 9): los valores que aparecen en una sola celda de la unidad
+    una = np.zeros(unidades.shape[:2], dtype=np.uint16)
+    varias = np.zeros(unidades.shape[:2], dtype=np.uint16)
+    for k in range(9):
+        celda = unidades[:, :, k]
+        varias |= una & celda
+        una |= celda
+    unicos = unidades & (una & ~varias)[:, :, None]
+    return np.where(BITS[unicos] == 1, unicos, unidades)
+
+
+def _unidadesCompletas(mascaras : "np.ndarray") -> "np.ndarray":
+    # Indica por tablero si cada fila, columna y bloque tiene los nueve valores (sin repetidos)
+    def completas(unidades):
+        return (np.bitwise_or.reduce(unidades, axis=2) == COMPLETO).all(axis=1)
+    return completas(mascaras) & completas(mascaras.transpose(0, 2, 1)) & completas(_aBloques(mascaras))
+
+
+def propagarLote(mascaras : "np.ndarray", maxRondas : int = 100) -> "np.ndarray":
+    # Aplica allDif y hidden singles (filas, columnas y bloques) a todos los tableros hasta que no
+    # cambien. En cada ronda solo se procesan los tableros que cambiaron en la anterior.
+    mascaras = mascaras.copy()
+    activos = np.arange(mascaras.shape[0])
+    for _ in range(maxRondas):
+        if activos.size == 0:
+            break
+        m = mascaras[activos]
+        previo = m
+        m = _quitarResueltos(m)
+        m = _quitarResueltos(m.transpose(0, 2, 1)).transpose(0, 2, 1)
+        m = _aBloques(_quitarResueltos(_aBloques(m)))
+        m = _unicosEnUnidad(m)
+        m = _unicosEnUnidad(m.transpose(0, 2, 1)).transpose(0, 2, 1)
+        m = _aBloques(_unicosEnUnidad(_aBloques(m)))
+        mascaras[activos] = m
+        cambiaron = (m != previo).any(axis=(1, 2)) & (m != 0).all(axis=(1, 2))  # Los tableros con una celda vacia no siguen
+        activos = activos[cambiaron]
+    return mascaras
+
+
+def mascaraACadena(mascara : "np.ndarray") -> str:
+    # Tablero (9, 9) -> cadena de 81 caracteres ('.' en las celdas sin un unico valor)
+    valores = VALOR[mascara].reshape(81)
+    return np.where(valores > 0, valores + ord("0"), ord(".")).astype(np.uint8).tobytes().decode("ascii")
+
+
+def resolverEscalar(tablero : str, motor : str = "backtracking", dominios=None) -> str | None:
+    # Resuelve un tablero con Sudoku. Si se dan los dominios ya propagados (mascaras en el orden de
+    # strKeys), se parte de ellos. Devuelve la solucion como cadena de 81 caracteres o None.
+    tabla = Sudoku(motor)
+    tabla.establecerDesdeCadena(tablero)
+    if dominios is not None:
+        for key, mascara in zip(tabla.strKeys, dominios):
+            tabla.tab_dom[key] = {v for v in range(1, 10) if mascara >> (v - 1) & 1}
+    if not tabla.solucionar():
+        return None
+    return "".join(str(next(iter(tabla.tab_dom[key]))) for key in tabla.strKeys)
+
+
+def resolverLote(tableros : list[str], motor : str = "backtracking", estadisticas : dict | None = None,
+                 cache : SolutionCache | None = None) -> list[str | None]:
+    # Resuelve N tableros: propagacion vectorizada para todos y el motor escalar solo para los que
+    # no quedan resueltos. Devuelve la solucion de cada tablero (None si no tiene).
+    # Si se pasa `estadisticas`, se guardan ahi cuantos resolvio la propagacion y cuantos el motor escalar.
+    # Si se pasa `cache`, los tableros que irian al motor escalar se buscan antes en ella (un tablero
+    # repetido o equivalente por simetria a uno ya resuelto no vuelve a resolverse).
+    if estadisticas is None:
+        estadisticas = {}
+
+    def escalar(tablero, dominios=None):
+        if cache is None:
+            return resolverEscalar(tablero, motor, dominios)
+        return cache.solve_classic(tablero, lambda t: resolverEscalar(t, motor, dominios))
+
+    if np is None or not tableros:
+        estadisticas.update(propagacion=0, escalar=len(tableros))
+        return [escalar(tablero) for tablero in tableros]
+
+    mascaras = propagarLote(tablerosAMascaras(tableros))
+    bits = BITS[mascaras]
+    unicos = (bits == 1).all(axis=(1, 2))
+    completos = _unidadesCompletas(mascaras)
+    resueltos = unicos & completos
+    vacios = (bits == 0).any(axis=(1, 2)) | (unicos & ~completos)  # La propagacion encontro una contradiccion
+
+    soluciones = []
+    for i, tablero in enumerate(tableros):
+        if resueltos[i]:
+            soluciones.append(mascaraACadena(mascaras[i]))
+        elif vacios[i]:
+            soluciones.append(None)
+        else:
+            soluciones.append(escalar(tablero, mascaras[i].reshape(81).tolist()))
+    estadisticas.update(propagacion=int(resueltos.sum()), escalar=int((~resueltos & ~vacios).sum()))
+    return soluciones
+
+
+if __name__ == "__main__":
+    # Uso: python lote.py tableros.txt  (una cadena de 81 caracteres por linea)
+    with open(sys.argv[1] if len(sys.argv) > 1 else "../benchmark/corpus/classic.txt", "r") as f:
+        try:
+            tableros = cargarLineas(f)
+        except ValueError as e:
+            sys.exit(f"{f.name}: {e}")
+    estadisticas = {}
+    for solucion in resolverLote(tableros, estadisticas=estadisticas):
+        print(solucion if solucion is not None else "Sin solucion")
+    print(f"{len(tableros)} tableros: {estadisticas['propagacion']} resueltos por propagacion, "
+          f"{estadisticas['escalar']} con el motor escalar", file=sys.stderr)
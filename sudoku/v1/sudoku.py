@@ -1,13 +1,38 @@
 import itertools as it
+import os
+import sys
 import time
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Modulos compartidos con killer (geometry)
+
+from dlx import DancingLinks
+from geometry import CELLS, LINE_PEERS, BOX_PEERS, PEERS
+
+MOTORES : tuple[str, ...] = ("backtracking", "dlx")  # Motores de solucion disponibles en Sudoku.solucionar
+
+# Vecinas de cada celda por nombre, calculadas una sola vez a partir de geometry: en su fila y
+# columna (las que revisa allDif), en su bloque (finBlock) y todas juntas (ruleBrock)
+PARES_LINEA : dict[str, tuple[str, ...]] = {CELLS[i]: tuple(CELLS[p] for p in LINE_PEERS[i]) for i in range(81)}
+PARES_BLOQUE : dict[str, tuple[str, ...]] = {CELLS[i]: tuple(CELLS[p] for p in BOX_PEERS[i]) for i in range(81)}
+PARES : dict[str, tuple[str, ...]] = {CELLS[i]: tuple(CELLS[p] for p in PEERS[i]) for i in range(81)}
     
 class Sudoku:
-    def __init__(self) -> None:
+    def __init__(self, motor : str = "backtracking") -> None:
+        if motor not in MOTORES:
+            raise ValueError(f"Motor desconocido: {motor}. Opciones: {', '.join(MOTORES)}")
         columnas : str = "ABCDEFGHI"
         keys : list[tuple[int, str]] = list(it.product(range(1,10), columnas))
         
+        self.motor : str = motor
         self.strKeys : list[str] = [f"{key[1]}{key[0]}" for key in keys]
         self.tab_dom : dict[str, set[int]] = {key: set(range(1, 10)) for key in self.strKeys}
+        # Presupuesto de solucionar: (instante limite, nodos maximos) de backtracking y rondas maximas de resolver
+        self.limites : tuple[float | None, int | None] | None = None
+        self.pasadasLimite : int | None = None
+        self.nodos : int = 0  # Valores probados por backtracking
+        self.pasadas : int = 0  # Rondas de allDif + finBlock de resolver
+        self.estado : str = "sin resolver"  # "resuelto", "sin solucion" o "timeout" al terminar solucionar
     
     
     def __str__(self) -> str:
@@ -56,82 +81,88 @@ class Sudoku:
                     self.tab_dom[key]={int(valor)}
         if logs:
             print("Proceso terminado")
-    
-    
-    def allDif(self, logs : bool = False, contador : int = 0):
-        actualizacion = False
-        for i in range(9):
-            for j in range(9):
-                key = self.strKeys[i * 9 + j]
-                if len(self.tab_dom[key]) != 1:
-                    continue
+
+
+    def establecerDesdeCadena(self, cadena : str, logs : bool = False) -> None:
+        # Carga un tablero escrito en una sola linea de 81 caracteres, en el orden de strKeys
+        # (A1, B1, ..., I9). Los caracteres que no son digitos del 1 al 9 ('.', '0') son celdas vacias.
+        cadena = cadena.strip()
+        if len(cadena) != 81:
+            raise ValueError(f"Se esperaban 81 caracteres y se recibieron {len(cadena)}")
+        for key, valor in zip(self.strKeys, cadena):
+            if valor in "123456789":
                 if logs:
-                    print(f"Valor unico {self.tab_dom[key]} en {key}")
-                letra, numero = key
-                for _letra in "ABCDEFGHI":
-                    if _letra == letra:
-                        continue
-                    llave = f"{_letra}{numero}"
-                    if len(self.tab_dom[llave].intersection(self.tab_dom[key])) == 0 :
-                        continue
-                    actualizacion = True
-                    if logs:
-                        print(f"Retirando {self.tab_dom[key]} de {llave}")
-                    self.tab_dom[llave].difference_update(self.tab_dom[key])
-                for _numero in range(1,10):
-                    if _numero == int(numero):
-                        continue
-                    llave: str = f"{letra}{_numero}"
-                    if len(self.tab_dom[llave].intersection(self.tab_dom[key])) == 0 :
-                        continue
-                    actualizacion = True
-                    if logs:
-                        print(f"Retirando {self.tab_dom[key]} de {llave}")
-                    self.tab_dom[llave].difference_update(self.tab_dom[key])
-        if actualizacion:
+                    print(f"Estableciendo valor en {key}")
+                self.tab_dom[key] = {int(valor)}
+
+
+    def allDif(self, logs : bool = False) -> int:
+        # Elimina el valor de cada celda resuelta de las demas celdas de su fila y su columna, hasta
+        # que no haya cambios. Solo se revisan las vecinas de las celdas que quedaron con un unico
+        # valor: cada una entra una vez a la cola. Devuelve la cantidad de dominios modificados.
+        cambios = 0
+        pendientes = deque(key for key in self.strKeys if len(self.tab_dom[key]) == 1)
+        encolados = set(pendientes)
+        while pendientes:
+            key = pendientes.popleft()
+            valor = self.tab_dom[key]
+            if len(valor) != 1:
+                continue  # Otra celda con el mismo valor la dejo vacia
             if logs:
-                print("Hubo actualizaciones, repitiendo proceso. (allDif)")
-                time.sleep(0.5) 
-            return self.allDif(logs, contador + 1)
-        else:
-            return contador
-    
-    
-    def finBlock(self, logs : bool = False, contador : int = 0):
-        actualizacion = False
-        for i in range(9):
-            for j in range(9):
-                key = self.strKeys[i * 9 + j]
-                dominio = self.tab_dom[key].copy()
-                if len(dominio) == 1:
+                print(f"Valor unico {valor} en {key}")
+            for llave in PARES_LINEA[key]:
+                dominio = self.tab_dom[llave]
+                if dominio.isdisjoint(valor):
                     continue
                 if logs:
-                    print(f"Revisando {key} con dominio {dominio}")
-                for x in range(i // 3 * 3, i // 3 * 3 + 3):
-                    for y in range(j // 3 * 3, j // 3 * 3 + 3):
-                        llave = self.strKeys[x * 9 + y]
-                        if key == llave:
-                            continue
-                        if dominio - self.tab_dom[llave] == dominio:
-                            continue
-                        dominio -= self.tab_dom[llave]
-                if len(dominio) > 0 and dominio != self.tab_dom[key]:
-                    if logs:
-                        print("Descartando...")
-                    actualizacion = True
-                    self.tab_dom[key] = dominio
-        if actualizacion:
+                    print(f"Retirando {valor} de {llave}")
+                dominio.difference_update(valor)
+                cambios += 1
+                if len(dominio) == 1 and llave not in encolados:
+                    encolados.add(llave)
+                    pendientes.append(llave)
+        if logs:
+            print(f"Se modificaron {cambios} dominios. (allDif)")
+        return cambios
+    
+    
+    def finBlock(self, logs : bool = False) -> int:
+        # Si un valor del dominio de una celda no aparece en ninguna otra celda de su bloque, la celda
+        # se queda solo con ese valor. Al principio se revisan todas las celdas; despues, solo las del
+        # bloque de una celda cuyo dominio cambio. Devuelve la cantidad de dominios modificados.
+        cambios = 0
+        pendientes = deque(self.strKeys)
+        encolados = set(self.strKeys)
+        while pendientes:
+            key = pendientes.popleft()
+            encolados.discard(key)
+            dominio = self.tab_dom[key]
+            if len(dominio) <= 1:
+                continue
             if logs:
-                print("Hubo actualizaciones, repitiendo proceso. (finBlock)")
-                time.sleep(0.5)
-            return self.finBlock(logs, contador + 1)
-        else:
-            return contador
+                print(f"Revisando {key} con dominio {dominio}")
+            dominio = dominio.difference(*(self.tab_dom[llave] for llave in PARES_BLOQUE[key]))
+            if len(dominio) > 0 and dominio != self.tab_dom[key]:
+                if logs:
+                    print("Descartando...")
+                cambios += 1
+                self.tab_dom[key] = dominio
+                for llave in PARES_BLOQUE[key]:
+                    if llave not in encolados:
+                        encolados.add(llave)
+                        pendientes.append(llave)
+        if logs:
+            print(f"Se modificaron {cambios} dominios. (finBlock)")
+        return cambios
     
 
     def resolver(self, logs : bool = False):
         contador = 1
         while contador > 0:
+            if self.pasadasLimite is not None and self.pasadas >= self.pasadasLimite:
+                self.estado = "timeout"
+                break
+            self.pasadas += 1
             contador = self.allDif(logs)
             contador += self.finBlock(logs)
             if logs:
@@ -139,37 +170,14 @@ class Sudoku:
                     print("\tSe siguen encontrando valores. (resolver)")
                 else:
                     print("\tSe dejaron de encontar valores. (resolver)")
-                time.sleep(1)
     
     def ruleBrock(self, id : str, logs : bool = False) -> bool:
+        # Indica si el valor de `id` se repite en alguna celda de su bloque, fila o columna
         if logs:
             print(f"Revisando en cuadricula a {id}")
-        values = "ABCDEFGHI"
-        letra, numero = id
-        i = int(numero) - 1
-        j = values.find(letra)
-        for x in range(i // 3 * 3, i // 3 * 3 + 3):
-            for y in range(j // 3 * 3, j // 3 * 3 + 3):
-                llave = self.strKeys[x * 9 + y]
-                if llave == id:
-                    continue
-                if self.tab_dom[llave] == self.tab_dom[id]:
-                    if logs:
-                        print(f"Incorrecto, rompio con {llave}")
-                    return True
-        for _letra in "ABCDEFGHI":
-            if _letra == letra:
-                continue
-            llave = f"{_letra}{numero}"
-            if self.tab_dom[llave] == self.tab_dom[id]:
-                if logs:
-                    print(f"Incorrecto, rompio con {llave}")
-                return True
-        for _numero in range(1,10):
-            if _numero == int(numero):
-                continue
-            llave: str = f"{letra}{_numero}"
-            if self.tab_dom[llave] == self.tab_dom[id]:
+        dominio = self.tab_dom[id]
+        for llave in PARES[id]:
+            if self.tab_dom[llave] == dominio:
                 if logs:
                     print(f"Incorrecto, rompio con {llave}")
                 return True
@@ -178,6 +186,20 @@ class Sudoku:
         return False
     
     
+    def agotado(self) -> bool:
+        # Indica si backtracking debe abandonar la busqueda por el presupuesto de solucionar. El limite
+        # de nodos se revisa en cada valor probado y el de tiempo cada 16.
+        if self.limites is None:
+            return False
+        if self.estado == "timeout":
+            return True
+        instante, nodos = self.limites
+        if (nodos is not None and self.nodos >= nodos) or (
+                instante is not None and not self.nodos & 15 and time.perf_counter() > instante):
+            self.estado = "timeout"
+            return True
+        return False
+
     def backtracking(self, logs : bool = False, base : int = 0):
         for i in range(base, 81):
             llave = self.strKeys[i]
@@ -186,6 +208,9 @@ class Sudoku:
             if logs:
                 print(f"Incia prueba con {llave}")
             for valor in range(1, 10):
+                if self.agotado():
+                    return False  # Al volver, cada nivel restaura su celda: quedan los dominios de resolver
+                self.nodos += 1
                 dominio = self.tab_dom[llave]
                 self.tab_dom[llave] = {valor}
                 if self.ruleBrock(llave, logs):
@@ -194,7 +219,6 @@ class Sudoku:
                 if not self.backtracking(logs, i + 1):
                     if logs:
                         print(f"Funcionaba pero rompia futuras soluciones la {llave}")
-                        time.sleep(0.1)
                     self.tab_dom[llave] = dominio
                     continue
                 else:
@@ -208,11 +232,88 @@ class Sudoku:
 
         return True
 
-tabla = Sudoku()
-tabla.establecerValoresIniciales("board.txt")
 
-tabla.resolver(True)
-tabla.backtracking()
+    def solucionar(self, logs : bool = False, tiempoLimite : float | None = None, nodosLimite : int | None = None,
+                   pasadasLimite : int | None = None) -> bool:
+        # Resuelve el tablero con el motor elegido al crear la instancia: primero reduce los dominios con
+        # resolver y luego busca con backtracking o con Dancing Links. Se puede limitar el tiempo (segundos),
+        # los nodos (valores probados por backtracking o filas elegidas entre varias por DLX) y las rondas
+        # de resolver; si se agota alguno, estado queda en "timeout" y tab_dom con los dominios reducidos
+        # por resolver (ver celdasFijas).
+        self.estado = "sin resolver"
+        self.nodos = 0
+        self.pasadas = 0
+        self.pasadasLimite = pasadasLimite
+        if tiempoLimite is not None or nodosLimite is not None:
+            self.limites = (time.perf_counter() + tiempoLimite if tiempoLimite is not None else None, nodosLimite)
+        try:
+            self.resolver(logs)
+            if self.estado == "timeout":
+                resuelto = False
+            elif self.motor == "dlx":
+                resuelto = self.resolverDLX(logs)
+            else:
+                resuelto = self.backtracking(logs)
+        finally:
+            self.limites = None
+            self.pasadasLimite = None
+        if self.estado != "timeout":
+            self.estado = "resuelto" if resuelto else "sin solucion"
+        return resuelto
+
+
+    def celdasFijas(self) -> int:
+        # Cantidad de celdas con un unico valor posible
+        return sum(1 for dominio in self.tab_dom.values() if len(dominio) == 1)
+
+
+    def matrizCoberturaExacta(self) -> DancingLinks:
+        # Modela el tablero como cobertura exacta: 324 columnas (celda, fila-valor, columna-valor y
+        # bloque-valor) y una fila por cada valor posible de cada celda segun tab_dom. La fila de la
+        # celda i con el valor v tiene id i * 9 + (v - 1).
+        matriz = DancingLinks(324)
+        for i, key in enumerate(self.strKeys):
+            fila, columna = divmod(i, 9)
+            bloque = fila // 3 * 3 + columna // 3
+            for valor in sorted(self.tab_dom[key]):
+                v = valor - 1
+                matriz.agregarFila(i * 9 + v, [i, 81 + fila * 9 + v, 162 + columna * 9 + v, 243 + bloque * 9 + v])
+        return matriz
+
+
+    def resolverDLX(self, logs : bool = False) -> bool:
+        # Resuelve con Dancing Links y deja la solucion en tab_dom (un valor por celda).
+        # Si no hay solucion o se agota el presupuesto de solucionar (limites), tab_dom no se modifica.
+        matriz = self.matrizCoberturaExacta()
+        encontradas = matriz.buscar(1, self.limites)
+        self.nodos = matriz.nodos
+        if matriz.agotado:
+            self.estado = "timeout"
+            return False
+        if encontradas == 0:
+            if logs:
+                print("El tablero no tiene solucion (DLX)")
+            return False
+        for id in matriz.primera:
+            i, v = divmod(id, 9)
+            self.tab_dom[self.strKeys[i]] = {v + 1}
+        if logs:
+            print("\n\tSudoku llenado con exito!!! (DLX)")
+        return True
+
+
+    def contarSoluciones(self, limite : int = 2) -> int:
+        # Cuenta las soluciones del tablero hasta `limite` (0 = todas) sin modificar tab_dom.
+        # Con limite 2 basta para saber si la solucion es unica (resultado 1).
+        return self.matrizCoberturaExacta().buscar(limite)
+
+
+if __name__ == "__main__":
+    tabla = Sudoku()
+    tabla.establecerValoresIniciales("board.txt")
+
+    tabla.resolver(True)
+    tabla.backtracking()
 
-print(tabla)
-print(tabla.tab_dom)
+    print(tabla)
+    print(tabla.tab_dom)